@@ -0,0 +1,137 @@
+"""
+Decompression throughput on one file from a JAM archive
+
+Compares the old recursive decompressor (kept here as the reference) with
+BinaryFileHelper.expand and with walking the tokens through the streaming
+LRCompressedReader used by the parsers.
+
+Usage: python -m benchmarks.bench_decompress [JAM] [FILE] [--repeat N]
+"""
+
+from collections.abc import Callable
+from io import BytesIO
+import argparse
+import time
+
+from lr1.JAM import JAM
+from lr1.IO.LRBinaryReader import LRBinaryReader
+from lr1.IO.LRBinaryWriter import LRBinaryWriter
+from lr1.IO.LRCompressedReader import LRCompressedReader
+from lr1.Utils.BinaryFileHelper import BinaryFileHelper
+from lr1.Utils.StructTemplate import VALUE_SIZES
+from lr1.Utils.Token import Token
+
+
+def recursive_decompress(
+    block_id: int,
+    reader: LRBinaryReader,
+    writer: LRBinaryWriter,
+    structs: dict[int, list[int]],
+) -> None:
+    """The original decompressor, one recursive call per token"""
+
+    match block_id:
+        case (
+            Token.LeftCurly | Token.RightCurly | Token.LeftBracket | Token.RightBracket
+        ):
+            writer.write_token(block_id)
+
+        case Token.Byte | Token.SByte:
+            writer.write_token(block_id)
+            writer.write_bytes(reader.read_bytes(1))
+
+        case Token.Short | Token.UShort:
+            writer.write_token(block_id)
+            writer.write_bytes(reader.read_bytes(2))
+
+        case Token.Int32 | Token.Float:
+            writer.write_token(block_id)
+            writer.write_bytes(reader.read_bytes(4))
+
+        case Token.String:
+            writer.write_token(block_id)
+            writer.write_string(reader.read_string())
+
+        case Token.Array:
+            array_len: int = reader.read_int(Token.Short)
+            array_type: int = reader.read_int(Token.Byte)
+            for _ in range(array_len):
+                recursive_decompress(array_type, reader, writer, structs)
+
+        case Token.Struct:
+            struct_id: int = reader.read_int(Token.Byte)
+            struct_len: int = reader.read_int(Token.Byte)
+            structs[struct_id] = [
+                reader.read_int(Token.Byte) for _ in range(struct_len)
+            ]
+
+        case _:
+            if block_id in structs:
+                for token in structs[block_id]:
+                    recursive_decompress(token, reader, writer, structs)
+            else:
+                writer.write_bytes(bytes([block_id]))
+
+
+def decompress_recursive(data: bytes) -> bytes:
+    reader: LRBinaryReader = LRBinaryReader(data)
+    stream: BytesIO = BytesIO()
+    writer: LRBinaryWriter = LRBinaryWriter(stream)
+    structs: dict[int, list[int]] = {}
+    while reader.position < len(reader):
+        recursive_decompress(reader.read_int(Token.Byte), reader, writer, structs)
+    return stream.getvalue()
+
+
+def walk_tokens(data: bytes) -> int:
+    """Reads every token and skips its value, returning the token count"""
+
+    reader: LRCompressedReader = LRCompressedReader(data)
+    count: int = 0
+    while not reader.at_end():
+        token: int = reader.read_token()
+        count += 1
+        if token == Token.String:
+            reader.read_string()
+        else:
+            reader.read_bytes(VALUE_SIZES.get(token, 0))
+    return count
+
+
+def measure(
+    name: str, func: Callable[[bytes], object], data: bytes, tokens: int, repeat: int
+) -> float:
+    best: float = float('inf')
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - start)
+    print(f'{name:<12} {best * 1000:9.2f} ms  {tokens / best:14,.0f} tokens/s')
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('jam', nargs='?', default='tests/LEGO.JAM')
+    parser.add_argument('file', nargs='?', default='/GAMEDATA/RACEC0R1/TRACK.GDB')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    data: bytes = JAM(args.jam).extract_file(args.file).data.read()
+    helper: BinaryFileHelper = BinaryFileHelper()
+
+    if decompress_recursive(data) != helper.expand(data):
+        raise AssertionError('expand() does not match the recursive decompressor')
+
+    tokens: int = walk_tokens(data)
+    print(f'{args.file}: {len(data):,} bytes compressed, {tokens:,} tokens')
+
+    repeat: int = args.repeat
+    before: float = measure('recursive', decompress_recursive, data, tokens, repeat)
+    after: float = measure('expand', helper.expand, data, tokens, repeat)
+    measure('streaming', walk_tokens, data, tokens, repeat)
+    print(f'expand speedup: {before / after:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
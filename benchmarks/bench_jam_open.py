@@ -0,0 +1,47 @@
+"""
+Time to open a JAM archive and index its directory tables
+
+Opening only unpacks the directory tables into the flat entry table, so it
+is compared with looking up every file of the archive by path once.
+
+Usage: python -m benchmarks.bench_jam_open [JAM] [--repeat N]
+"""
+
+from collections.abc import Callable
+import argparse
+import time
+
+from lr1.JAM import JAM
+
+
+def measure(name: str, func: Callable[[], object], repeat: int) -> float:
+    best: float = float('inf')
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    print(f'{name:<12} {best * 1000:9.2f} ms')
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('jam', nargs='?', default='tests/LEGO.JAM')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    jam: JAM = JAM(args.jam, memory_map=True)
+    paths: list[str] = [str(item.path) for item in jam.files]
+    print(f'{args.jam}: {len(jam.names):,} entries, {len(paths):,} files')
+
+    repeat: int = args.repeat
+    opened: float = measure('open', lambda: JAM(args.jam, memory_map=True), repeat)
+    measure('open lazy', lambda: JAM(args.jam, memory_map=True, lazy=True), repeat)
+    lookups: float = measure(
+        'lookups', lambda: [jam.extract_file(path) for path in paths], repeat
+    )
+    print(f'open / lookups: {opened / lookups:.2f}')
+
+
+if __name__ == '__main__':
+    main()
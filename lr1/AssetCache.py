@@ -0,0 +1,106 @@
+from typing import TypeVar
+import pathlib
+import tomllib
+
+from .BMP import BMP
+from .BVB import BVB
+from .GDB import GDB
+from .MDB import MDB
+from .TDB import TDB
+from .JAM import JamItem
+from .JAMHashIndex import content_digest
+from .IO.LRFile import LRFile, LRMemoryFile
+from .IO.LROverlay import LROverlayFile
+from .IO.LRAssetFile import LRAssetFile
+
+# Stored assets are only used by the version of the library that stored them
+with open(pathlib.Path(__file__).with_name('blender_manifest.toml'), 'rb') as manifest:
+    LIBRARY_VERSION: str = tomllib.load(manifest)['version']
+
+# Where assets of loose files are stored, in the directory of the file
+ASSET_DIRECTORY: str = '.lr1assets'
+ASSET_SUFFIX: str = '.lrasset'
+
+A = TypeVar('A', GDB, BVB, MDB, TDB, BMP)
+
+
+def asset_directory(file: LRFile) -> pathlib.Path:
+    """Where the assets of a file are stored, next to the file or its archive"""
+
+    while isinstance(file, (LRMemoryFile, LROverlayFile)):
+        file = file.source
+
+    if isinstance(file, JamItem):
+        return file.jam.path.with_name(file.jam.path.name + '.assets')
+    return pathlib.Path(file.path).parent / ASSET_DIRECTORY
+
+
+class AssetCache:
+    """
+    Parsed files stored on disk, so later runs map them instead of parsing
+
+    Assets are stored by the content hash of the file and the library
+    version, so changed files and newer versions of the library are parsed
+    again, and identical files share one asset.  Loading a stored asset maps
+    its arrays straight from the file, which leaves little more than reading
+    and hashing the source.  GDBs are always loaded in columnar mode, and
+    the textures of MDBs are loaded through the cache as well.
+
+    Attributes:
+        directory (pathlib.Path | None): Where every asset is stored, None to store them next to their source
+        hits (int): Files loaded from a stored asset
+        misses (int): Files that had to be parsed
+    """
+
+    directory: pathlib.Path | None
+    hits: int
+    misses: int
+
+    def __init__(self, directory: str | pathlib.Path | None = None) -> None:
+        self.directory = None if directory is None else pathlib.Path(directory)
+        self.hits = 0
+        self.misses = 0
+
+    def asset_path(self, file: LRFile, kind: str, key: str) -> pathlib.Path:
+        """Where the asset of a file is stored"""
+
+        directory: pathlib.Path = (
+            asset_directory(file) if self.directory is None else self.directory
+        )
+        return directory / f'{key}.{kind}{ASSET_SUFFIX}'
+
+    def load(self, parser: type[A], file: LRFile) -> A:
+        """Returns the parsed file, from its stored asset if there is one"""
+
+        kind: str = parser.__name__
+        key: str = f'{content_digest(file.read_bytes()).hex()}-{LIBRARY_VERSION}'
+        path: pathlib.Path = self.asset_path(file, kind, key)
+
+        asset: LRAssetFile | None = LRAssetFile.read(None, path, kind, key)
+        if asset is not None:
+            self.hits += 1
+            if parser is MDB:
+                return MDB.from_asset(None, asset, file, self.load_bmp)
+            return parser.from_asset(None, asset, file)
+
+        self.misses += 1
+        result: A = self.parse(parser, file)
+
+        asset = LRAssetFile(kind, key)
+        result.to_asset(asset)
+        asset.write(path)
+        return result
+
+    def parse(self, parser: type[A], file: LRFile) -> A:
+        """Parses a file the way its asset is stored"""
+
+        if parser is GDB:
+            return GDB(file, columnar=True)
+        if parser is MDB:
+            return MDB(file, load_bmp=self.load_bmp)
+        return parser(file)
+
+    def load_bmp(self, file: LRFile) -> BMP:
+        """Loads a texture through the cache"""
+
+        return self.load(BMP, file)
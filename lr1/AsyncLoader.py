@@ -0,0 +1,112 @@
+from typing import TypeVar
+from collections.abc import Callable, Iterable
+from concurrent.futures import Executor
+import asyncio
+
+from .BMP import BMP
+from .GDB import GDB
+from .MDB import MDB
+from .TDB import TDB
+from .IO.LRFile import LRFile, LRMemoryFile
+
+# Files loaded at the same time by default
+DEFAULT_CONCURRENCY: int = 8
+
+T = TypeVar('T')
+
+
+class AsyncLoader:
+    """
+    Loads files without blocking the event loop
+
+    The file data is read on the loop's default executor, then parsed on the
+    given executor from a private copy in memory, so the same file can be
+    loaded by several tasks at once.  The executor must run in this process,
+    a ThreadPoolExecutor for example, since parsed files refer to their
+    source.  A loader limits how many files are loaded at the same time, so
+    one loader can be shared by every request of a server running on one
+    event loop.
+
+    Attributes:
+        executor (Executor | None): Where files are parsed, None for the loop's default executor
+        concurrency (int): Files loaded at the same time at most
+    """
+
+    executor: Executor | None
+    concurrency: int
+    _semaphore: asyncio.Semaphore
+
+    def __init__(
+        self, executor: Executor | None = None, concurrency: int = DEFAULT_CONCURRENCY
+    ) -> None:
+        self.executor = executor
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def read(self, file: LRFile) -> LRMemoryFile:
+        """Reads the file data into memory"""
+
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        return LRMemoryFile(file, await loop.run_in_executor(None, file.read_bytes))
+
+    async def load(self, parser: Callable[[LRFile], T], file: LRFile) -> T:
+        """Returns parser(file), read and parsed off the event loop"""
+
+        async with self._semaphore:
+            memory_file: LRMemoryFile = await self.read(file)
+            loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, parser, memory_file)
+
+    async def load_many(
+        self, parser: Callable[[LRFile], T], files: Iterable[LRFile]
+    ) -> list[T]:
+        """Loads files together, returning the results in the same order"""
+
+        return list(await asyncio.gather(*(self.load(parser, file) for file in files)))
+
+    async def load_gdb(self, file: LRFile) -> GDB:
+        return await self.load(GDB, file)
+
+    async def load_mdb(self, file: LRFile) -> MDB:
+        return await self.load(MDB, file)
+
+    async def load_tdb(self, file: LRFile) -> TDB:
+        return await self.load(TDB, file)
+
+    async def load_bmp(self, file: LRFile) -> BMP:
+        return await self.load(BMP, file)
+
+
+async def load(
+    parser: Callable[[LRFile], T], file: LRFile, executor: Executor | None = None
+) -> T:
+    """Returns parser(file), read and parsed off the event loop"""
+
+    return await AsyncLoader(executor).load(parser, file)
+
+
+async def load_many(
+    parser: Callable[[LRFile], T],
+    files: Iterable[LRFile],
+    executor: Executor | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> list[T]:
+    """Loads files together, at most concurrency at the same time"""
+
+    return await AsyncLoader(executor, concurrency).load_many(parser, files)
+
+
+async def load_gdb(file: LRFile, executor: Executor | None = None) -> GDB:
+    return await load(GDB, file, executor)
+
+
+async def load_mdb(file: LRFile, executor: Executor | None = None) -> MDB:
+    return await load(MDB, file, executor)
+
+
+async def load_tdb(file: LRFile, executor: Executor | None = None) -> TDB:
+    return await load(TDB, file, executor)
+
+
+async def load_bmp(file: LRFile, executor: Executor | None = None) -> BMP:
+    return await load(BMP, file, executor)
@@ -1,9 +1,12 @@
 from typing import IO
 from io import BytesIO
 from enum import IntEnum
+from array import array
 import struct
+import warnings
 
 from .IO.LRFile import LRFile
+from .IO.LRAssetFile import LRAssetFile
 from .Utils.BMP_BitmapColor import BitmapColor
 
 
@@ -13,16 +16,51 @@ class IMAGE_ENCODING(IntEnum):
     RGB = 0x98
 
 
+# Tables for bytes.translate, splitting each byte of a 4 bit image in two
+HIGH_NIBBLES: bytes = bytes(value >> 4 for value in range(256))
+LOW_NIBBLES: bytes = bytes(value & 0x0F for value in range(256))
+
+# Each byte value as a float 0.0 - 1.0, see BitmapColor.as_float
+FLOAT_VALUES: tuple[float, ...] = tuple(value / 255 for value in range(256))
+
+
+def bgr_to_rgba(data: bytes) -> bytearray:
+    """Converts BGR bytes to opaque RGBA bytes"""
+
+    count: int = len(data) // 3
+    rgba: bytearray = bytearray(b'\xff') * (count * 4)
+    rgba[0::4] = data[2 : count * 3 : 3]
+    rgba[1::4] = data[1 : count * 3 : 3]
+    rgba[2::4] = data[0 : count * 3 : 3]
+    return rgba
+
+
+def rgba_to_colors(data: bytes | bytearray) -> list[BitmapColor]:
+    """Converts RGBA bytes to colors"""
+
+    return [
+        BitmapColor(r=r, g=g, b=b, a=a)
+        for r, g, b, a in zip(data[0::4], data[1::4], data[2::4], data[3::4])
+    ]
+
+
 class BMP:
     """
     A BMP image/texture
 
+    Pixels are kept as one palette index byte each, next to the RGBA bytes of
+    the palette, and the RGBA pixels are only expanded when they are used.
+    Images without a palette keep the RGBA bytes of every pixel instead.
+
     Attributes:
         width (int):
         height (int):
         encoding (IMAGE_ENCODING): Whether the image was encoded with a four or eight bit palette or no palette
-        image (list[BitmapColor]): Pixels of the image as a list
-        palette (list[BitmapColor]): List of colors used in the palette
+        colors (bytearray): RGBA bytes of the palette, or of every pixel if there is no palette
+        indices (bytearray | None): Palette index of each pixel, None if there is no palette
+        palette_size (int): Colors in the palette, followed in colors by the color for bad indices
+        image (list[BitmapColor]): Pixels of the image as a list, made on demand
+        palette (list[BitmapColor]): List of colors used in the palette, made on demand
 
     """
 
@@ -32,89 +70,152 @@ class BMP:
     encoding: int
     funny_font: bool  # Some font BMPs don't follow this format perfectly, so we track them when we find them
 
-    image: list[BitmapColor]
-    palette: list[BitmapColor]
+    colors: bytearray
+    indices: bytearray | None
+    palette_size: int
 
     def __init__(self, file: LRFile | None = None) -> None:
         if file is None:
             # Create an empty texture
             self.width = 1
             self.height = 1
-            self.image = [BitmapColor(r=0, g=0, b=0, a=0)]
+            self.colors = bytearray(4)
+            self.indices = None
+            self.palette_size = 0
             return
 
-        file.reset()
+        # A stream of its own, so the same file can be read on several threads
+        with file.open() as data:
+            encoding = data.read(1)[0]
+            self.encoding = IMAGE_ENCODING(encoding)
 
-        encoding = file.data.read(1)[0]
-        self.encoding = IMAGE_ENCODING(encoding)
+            self.funny_font = False
 
-        self.funny_font = False
+            palette_size: int = data.read(1)[0] + 1  # Palette size is off by one
 
-        palette_size: int = file.data.read(1)[0] + 1  # Palette size is off by one
+            self.width = struct.unpack('<h', data.read(2))[0]
+            self.height = struct.unpack('<h', data.read(2))[0]
 
-        self.width = struct.unpack('<h', file.data.read(2))[0]
-        self.height = struct.unpack('<h', file.data.read(2))[0]
+            self.palette_size = 0
+            if self.encoding != IMAGE_ENCODING.RGB:
+                self.palette_size = palette_size
+                self.colors = bgr_to_rgba(data.read(palette_size * 3))
 
-        self.palette = []
+            buffer_length: int = 0
 
-        if self.encoding != IMAGE_ENCODING.RGB:
-            for _ in range(palette_size):
-                self.palette.append(BitmapColor(file.data))
+            match self.encoding:
+                case IMAGE_ENCODING.PALETTE_4_BIT:
+                    buffer_length = (self.width * self.height + 1) // 2
 
-        buffer_length: int = 0
+                case IMAGE_ENCODING.PALETTE_8_BIT:
+                    buffer_length = self.width * self.height
 
-        match self.encoding:
-            case IMAGE_ENCODING.PALETTE_4_BIT:
-                buffer_length = (self.width * self.height + 1) // 2
+                case IMAGE_ENCODING.RGB:
+                    buffer_length = self.width * self.height * 3
 
-            case IMAGE_ENCODING.PALETTE_8_BIT:
-                buffer_length = self.width * self.height
-
-            case IMAGE_ENCODING.RGB:
-                buffer_length = self.width * self.height * 3
+                case _:
+                    raise ValueError(f'Invalid image encoding: {self.encoding}')
 
-            case _:
-                raise ValueError(f'Invalid image encoding: {self.encoding}')
+            image_buffer: BytesIO = BytesIO()
 
-        image_buffer: BytesIO = BytesIO()
+            while image_buffer.tell() < buffer_length:
+                block: bytes = self.read_block(data)
+                image_buffer.write(block)
 
-        while image_buffer.tell() < buffer_length:
-            block: bytes = self.read_block(file.data)
-            image_buffer.write(block)
-
-        self.image = []
+        pixels: bytes = image_buffer.getvalue()
+        count: int = self.width * self.height
 
         match self.encoding:
             case IMAGE_ENCODING.RGB:
-                for i in range(self.width * self.height):
-                    image_buffer.seek(i * 3)
-                    self.image.append(BitmapColor(image_buffer))
+                self.indices = None
+                self.colors = bgr_to_rgba(pixels[: count * 3])
 
             case IMAGE_ENCODING.PALETTE_4_BIT:
-                for i in range(self.width * self.height):
-                    image_buffer.seek(i // 2)
-                    index: int = image_buffer.read(1)[0]
-                    index >>= 4 * (1 - (i % 2))
-                    index &= 0x0F
-                    if index not in range(len(self.palette)):
-                        self.funny_font = True
-                        print(f'Bad index: {index} at pixel: {i}')
-                        index %= len(self.palette)
-                        self.image.append(BitmapColor(r=255, g=0, b=0))
-                    else:
-                        self.image.append(self.palette[index])
+                # The high nibble of each byte is the first pixel
+                indices: bytearray = bytearray(len(pixels) * 2)
+                indices[0::2] = pixels.translate(HIGH_NIBBLES)
+                indices[1::2] = pixels.translate(LOW_NIBBLES)
+                self.indices = indices[:count]
+
+                if self.indices and max(self.indices) >= self.palette_size:
+                    self.mark_bad_indices()
 
             case IMAGE_ENCODING.PALETTE_8_BIT:
-                for i in range(self.width * self.height):
-                    image_buffer.seek(i)
-                    index = image_buffer.read(1)[0]
-                    self.image.append(self.palette[index])
+                self.indices = bytearray(pixels[:count])
+                if self.indices and max(self.indices) >= self.palette_size:
+                    raise IndexError(
+                        f'Palette index: {max(self.indices)} out of range'
+                    )
 
         # Fix the broken font files
         if self.funny_font:
             self.width += 1
-        while len(self.image) < self.width * self.height:
-            self.image.append(self.image[0])
+        self.pad_pixels()
+
+    def mark_bad_indices(self) -> None:
+        """Draws the pixels with an index past the palette in red"""
+
+        self.funny_font = True
+        assert self.indices is not None
+
+        # Deleting the good indices leaves the bad ones
+        bad: int = len(self.indices.translate(None, bytes(range(self.palette_size))))
+        warnings.warn(
+            f'{bad} pixels with a palette index past {self.palette_size - 1}',
+            stacklevel=3,
+        )
+
+        # The red color follows the palette, and every bad index points to it
+        del self.colors[self.palette_size * 4 :]
+        self.colors += bytes((255, 0, 0, 255))
+        self.indices = self.indices.translate(
+            bytes(min(index, self.palette_size) for index in range(256))
+        )
+
+    def pad_pixels(self) -> None:
+        """Repeats the first pixel until there is one for each position"""
+
+        missing: int = self.width * self.height - self.pixel_count()
+        if missing <= 0:
+            return
+
+        if self.indices is None:
+            self.colors += self.colors[:4] * missing
+        else:
+            self.indices += self.indices[:1] * missing
+
+    def pixel_count(self) -> int:
+        """The number of pixels stored"""
+
+        if self.indices is None:
+            return len(self.colors) // 4
+        return len(self.indices)
+
+    def rgba(self) -> bytes:
+        """The RGBA bytes of every pixel, expanded from the palette"""
+
+        if self.indices is None:
+            return bytes(self.colors)
+
+        # Look up each channel of every pixel at once, then interleave them
+        colors: bytes = bytes(self.colors).ljust(256 * 4, b'\x00')
+        pixels: bytearray = bytearray(len(self.indices) * 4)
+        for channel in range(4):
+            pixels[channel::4] = self.indices.translate(colors[channel : 256 * 4 : 4])
+        return bytes(pixels)
+
+    @property
+    def palette(self) -> list[BitmapColor]:
+        return rgba_to_colors(self.colors[: self.palette_size * 4])
+
+    @property
+    def image(self) -> list[BitmapColor]:
+        if self.indices is None:
+            return rgba_to_colors(self.colors)
+
+        # Pixels of the same index share one color, like the palette
+        colors: list[BitmapColor] = rgba_to_colors(self.colors)
+        return [colors[index] for index in self.indices]
 
     def read_block(self, file: IO[bytes]) -> bytes:
         block_length_decompressed: int = struct.unpack('<h', file.read(2))[0]
@@ -187,19 +288,57 @@ class BMP:
     def flat_pixels(self) -> list[float]:
         """Converts the image to a list of floats for Blender"""
 
-        flattened: list[float] = []
-
-        for pixel in self.image:
-            flattened.extend(pixel.as_float())
-
-        return flattened
+        return list(map(FLOAT_VALUES.__getitem__, self.rgba()))
 
     def get_pixel(self, x: int, y: int) -> BitmapColor:
         """Returns the pixel at the XY coordinates"""
 
         if x < 0 or y < 0 or x >= self.width or y >= self.height:
             raise IndexError(f'Pixel {x}, {y} out of range')
-        return self.image[y * self.width + x]
+
+        i: int = y * self.width + x
+        if self.indices is not None:
+            i = self.indices[i]
+        return rgba_to_colors(self.colors[i * 4 : i * 4 + 4])[0]
+
+    def make_transparent(self, color: tuple[float, float, float, float]) -> None:
+        """Clears the alpha of the palette colors that match a color"""
+
+        for i in range(self.palette_size):
+            values: bytearray = self.colors[i * 4 : i * 4 + 4]
+            if tuple(FLOAT_VALUES[value] for value in values) == color:
+                self.colors[i * 4 + 3] = 0
+
+    def to_asset(self, asset: LRAssetFile) -> None:
+        """Stores the colors and palette indices, see AssetCache"""
+
+        asset.info = {
+            'width': self.width,
+            'height': self.height,
+            'encoding': self.encoding,
+            'funny_font': self.funny_font,
+            'palette_size': self.palette_size,
+        }
+        asset.arrays = {'colors': array('B', self.colors)}
+        if self.indices is not None:
+            asset.arrays['indices'] = array('B', self.indices)
+
+    def from_asset(self: 'BMP | None', asset: LRAssetFile, file: LRFile) -> 'BMP':
+        """A BMP with the colors and indices of a stored asset, see AssetCache"""
+
+        val: BMP = BMP.__new__(BMP)
+        val.width = asset.info['width']
+        val.height = asset.info['height']
+        val.encoding = IMAGE_ENCODING(asset.info['encoding'])
+        val.funny_font = asset.info['funny_font']
+        val.palette_size = asset.info['palette_size']
+
+        # Copies, since the palette can be changed and the mapping can't
+        val.colors = bytearray(asset.arrays['colors'])
+        val.indices = (
+            bytearray(asset.arrays['indices']) if 'indices' in asset.arrays else None
+        )
+        return val
 
     def checker_fallback(self: 'BMP | None' = None, square_size: int = 4) -> 'BMP':
         """Returns a fallback texture with a checkerboard pattern"""
@@ -207,17 +346,13 @@ class BMP:
         bmp = BMP()
         bmp.width = 8
         bmp.height = 8
-        bmp.palette = [
-            BitmapColor(r=248, g=0, b=248),  # Magenta
-            BitmapColor(r=0, g=0, b=0),  # Black
-        ]
-        bmp.image = []
-
-        for i in range(bmp.width * bmp.height):
-            x = i % bmp.width // square_size
-            y = i // bmp.width // square_size
-            if (x + y) % 2 == 0:
-                bmp.image.append(bmp.palette[0])
-            else:
-                bmp.image.append(bmp.palette[1])
+        bmp.palette_size = 2
+        bmp.colors = bytearray(
+            (248, 0, 248, 255)  # Magenta
+            + (0, 0, 0, 255)  # Black
+        )
+        bmp.indices = bytearray(
+            (i % bmp.width // square_size + i // bmp.width // square_size) % 2
+            for i in range(bmp.width * bmp.height)
+        )
         return bmp
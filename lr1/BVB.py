@@ -1,12 +1,14 @@
 from enum import IntEnum
+from array import array
 
 from .Utils.Token import Token
-from .Utils.LRVector3 import LRVector3
+from .Utils.LRVector3Array import LRVector3Array
 from .Utils.BVB_Polygon import BVB_Polygon
 from .Utils.BVB_PolygonRange import BVB_PolygonRange
 from .IO.LRBinaryReader import LRBinaryReader
 from .Utils.BinaryFileHelper import BinaryFileHelper
 from .IO.LRFile import LRFile
+from .IO.LRAssetFile import LRAssetFile
 
 
 class ID(IntEnum):
@@ -20,41 +22,57 @@ class BVB:
     """
     Collision boundaries for the track
 
+    Passing a set of block IDs parses only those blocks and skips the rest
+    without decoding them, which is much cheaper when only some are needed.
+    With tape, the file is decompressed into a token tape before parsing,
+    see BinaryFileHelper.decompress.
+
     Attributes:
         materials (list[str]): List of material names used in the BVB
-        vertices (list[LRVector3]): List of vertices in the BVB
+        vertices (LRVector3Array): Vertices in the BVB, stored as one flat array
         polygons (list[BVB_Polygon]): List of polygons defined by vertices and materials
     """
 
     materials: list[str]
-    vertices: list[LRVector3]
+    vertices: LRVector3Array
     polygons: list[BVB_Polygon]
     polygon_ranges: list[BVB_PolygonRange]
 
-    def __init__(self, file: LRFile) -> None:
+    def __init__(
+        self, file: LRFile, blocks: set[int] | None = None, tape: bool = False
+    ) -> None:
         helper: BinaryFileHelper = BinaryFileHelper()
-        reader: LRBinaryReader = helper.decompress(file.data)
+        with file.open() as stream:
+            reader: LRBinaryReader = helper.decompress(stream, tape)
 
         self.materials = []
-        self.vertices = []
+        self.vertices = LRVector3Array()
         self.polygons = []
         self.polygon_ranges = []
 
-        while reader.position < len(reader):
+        while not reader.at_end():
             block_id: int = reader.read_int(Token.Byte)
 
+            if blocks is not None and block_id not in blocks:
+                reader.skip_block()
+                continue
+
             match block_id:
                 case ID.MATERIALS:
                     self.materials = reader.read_str_array_block()
 
                 case ID.POLYGONS:
-                    self.polygons = reader.read_array_block(BVB_Polygon.read)
+                    self.polygons = reader.read_record_array_block(
+                        BVB_Polygon.FIELDS, BVB_Polygon.from_record
+                    )
 
                 case ID.VERTICES:
                     self.vertices = reader.read_vector_3f_array_block()
 
                 case ID.POLYGON_RANGES:
-                    self.polygon_ranges = reader.read_array_block(BVB_PolygonRange.read)
+                    self.polygon_ranges = reader.read_record_array_block(
+                        BVB_PolygonRange.FIELDS, BVB_PolygonRange.from_record
+                    )
 
                 case _:
                     raise ValueError(
@@ -71,3 +89,57 @@ class BVB:
                 polygon_range.node_right = self.polygon_ranges[
                     polygon_range.index_right
                 ]
+
+    def to_asset(self, asset: LRAssetFile) -> None:
+        """Stores the BVB as flat arrays of records, see AssetCache"""
+
+        asset.info = {'materials': self.materials}
+        asset.arrays = {
+            'vertices': self.vertices.coords,
+            'polygons': array(
+                'i',
+                (
+                    value
+                    for polygon in self.polygons
+                    for value in (*polygon.vertices, polygon.material)
+                ),
+            ),
+            'polygon_ranges': array(
+                'i',
+                (
+                    value
+                    for polygon_range in self.polygon_ranges
+                    for value in (
+                        polygon_range.index_left,
+                        polygon_range.index_right,
+                        polygon_range.x,
+                        polygon_range.y,
+                        polygon_range.z,
+                        polygon_range.first_poly,
+                        polygon_range.num_polys,
+                    )
+                ),
+            ),
+        }
+
+    def from_asset(self: 'BVB | None', asset: LRAssetFile, file: LRFile) -> 'BVB':
+        """A BVB with the arrays of a stored asset, see AssetCache"""
+
+        val: BVB = BVB.__new__(BVB)
+        val.materials = asset.info['materials']
+        val.vertices = LRVector3Array(asset.arrays['vertices'])
+
+        # Group the flat values back into records
+        polygons: list[int] = asset.arrays['polygons'].tolist()
+        val.polygons = [
+            BVB_Polygon.from_record(None, record)
+            for record in zip(*[iter(polygons)] * len(BVB_Polygon.FIELDS))
+        ]
+        polygon_ranges: list[int] = asset.arrays['polygon_ranges'].tolist()
+        val.polygon_ranges = [
+            BVB_PolygonRange.from_record(None, record)
+            for record in zip(*[iter(polygon_ranges)] * len(BVB_PolygonRange.FIELDS))
+        ]
+
+        val.build_tree()
+        return val
@@ -14,6 +14,7 @@ from .TDB import TDB
 from .RRB import RRB
 
 from .IO.LRFile import LRFile, LRFileItem
+from .IO.LROverlay import LROverlay
 from .Utils.MDB_Material import MDB_Material
 from .Utils.TDB_Texture import TDB_Texture
 from .Utils.LRVector3 import LRVector3
@@ -21,9 +22,11 @@ from .Utils.LRVector3 import LRVector3
 
 class BlenderImporter:
     file: LRFile
-    jam: JAM | None
+    jam: JAM | LROverlay | None
 
-    def __init__(self, file: str | LRFile, jam: str | JAM | None = None) -> None:
+    def __init__(
+        self, file: str | LRFile, jam: str | JAM | LROverlay | None = None
+    ) -> None:
         if type(jam) is str:
             self.jam = JAM(jam)
         else:
@@ -101,17 +104,25 @@ class BlenderImporter:
         textures_dict: dict[str, TDB_Texture] = dict()
         materials_dict: dict[str, MDB_Material] = dict()
 
+        # Look up the TDB and MDB files of the same directory by extension,
+        # merged from every source when the file came from an overlay
+        if self.file.overlay is not None:
+            directory = self.file.path.parent
+            tdb_files = self.file.overlay.files_with_extension(directory, '.TDB')
+            mdb_files = self.file.overlay.files_with_extension(directory, '.MDB')
+        else:
+            tdb_files = self.file.parent.files_with_extension('.TDB')
+            mdb_files = self.file.parent.files_with_extension('.MDB')
+
         # Read every TDB file in the same directory
-        for file in self.file.parent.directory_contents:
-            if file.path.suffix == '.TDB':
-                tdb = TDB(file)
-                textures_dict.update(tdb.textures)
+        for file in tdb_files:
+            tdb = TDB(file)
+            textures_dict.update(tdb.textures)
 
         # Read every MDB file in the same directory
-        for file in self.file.parent.directory_contents:
-            if file.path.suffix == '.MDB':
-                mdb = MDB(file)
-                materials_dict.update(mdb.materials)
+        for file in mdb_files:
+            mdb = MDB(file)
+            materials_dict.update(mdb.materials)
 
         # Set texture transparency
         for key, material in materials_dict.items():
@@ -120,10 +131,7 @@ class BlenderImporter:
                 if material.texture_name in textures_dict:
                     texture = textures_dict[material.texture_name]
                     if texture.trans_color:
-                        color = texture.color.to_tuple()
-                        for bmp_color in material.texture.palette:
-                            if bmp_color.as_float() == color:
-                                bmp_color.a = 0.0  # Set alpha to 0 for transparency
+                        material.texture.make_transparent(texture.color.to_tuple())
 
         # Generate the images
         for material in materials_dict.values():
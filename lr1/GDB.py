@@ -1,15 +1,21 @@
+from collections.abc import Sequence
 from enum import IntEnum
+from operator import itemgetter
+from typing import overload
+from array import array
 
 from .Utils.BinaryFileHelper import BinaryFileHelper
 from .IO.LRBinaryReader import LRBinaryReader
+from .IO.LRColumnCursor import LRColumnCursor
 from .Utils.Token import Token
 from .IO.LRFile import LRFile
+from .IO.LRAssetFile import LRAssetFile
 
-from .Utils.GDB_Vertex_Normal import GDB_Vertex_Normal
-from .Utils.GDB_Vertex_Color import GDB_Vertex_Color
-from .Utils.GDB_Vertex import GDB_Vertex
+from .Utils.GDB_VertexArray import GDB_VertexArray, LAYOUTS
 from .Utils.GDB_Polygon import GDB_Polygon
+from .Utils.GDB_PolygonArray import GDB_PolygonArray
 from .Utils.GDB_Meta import (
+    PROPERTY,
     GDB_Meta,
     GDB_Meta_Material,
     GDB_Meta_Faces,
@@ -17,6 +23,7 @@ from .Utils.GDB_Meta import (
     GDB_Meta_Bone,
 )
 from .Utils.GDB_Object import GDB_Object
+from .Utils.GDB_ObjectPlan import GDB_ObjectPlan
 
 
 class ID(IntEnum):
@@ -28,42 +35,104 @@ class ID(IntEnum):
     SCALE = 0x33
 
 
+# Classes of the INDICES_META entries, by type
+META_TYPES: dict[int, type[GDB_Meta]] = {
+    PROPERTY.MATERIAL_ID: GDB_Meta_Material,
+    PROPERTY.INDICES_META: GDB_Meta_Faces,
+    PROPERTY.VERTEX_META: GDB_Meta_Vertices,
+    PROPERTY.BONE_ID: GDB_Meta_Bone,
+}
+
+# Blocks needed to build the objects
+OBJECT_BLOCKS: frozenset[int] = frozenset(
+    {
+        ID.MATERIALS,
+        ID.VERTEX_NORMALED,
+        ID.VERTEX_COLORED,
+        ID.INDICES,
+        ID.INDICES_META,
+    }
+)
+
+
 class GDB:
     """
     A GDB file, containing materials, vertices, polygons, and objects.
 
+    In columnar mode the polygons are kept as one flat index array, vertex
+    colors take one byte each, and objects hold flat arrays instead of a
+    vertex and a polygon object per item.  The vertices of an object are a
+    view of the GDB's columns when its ranges follow each other, its
+    polygons are its own since their indices count from its first vertex.
+
+    In lazy mode only the materials, the scale, and the INDICES_META table are
+    parsed up front.  The vertex and index blocks are skipped, and decoded
+    only as far as the objects accessed so far need.  Vertices and polygons
+    are kept as flat arrays, as in columnar mode.
+
+    Passing a set of block IDs parses only those blocks and skips the rest
+    without decoding them.  Objects are only built when INDICES_META is one
+    of them, which brings in the materials, vertex, and index blocks as well.
+    With tape, the file is decompressed into a token tape before parsing,
+    see BinaryFileHelper.decompress.
+
     Attributes:
         materials (list[str]): List of material names, references to an MDB file
-        vertices (list[GDB_Vertex_Color]): List of vertices with color and UV data
-        polygons (list[GDB_Polygon]): List of polygons (triangles)
-        objects: (list[GDB_Object]): A submodel, with vertices, polygons, and a material
+        vertices (GDB_VertexArray): Vertices with color or normal and UV data, stored as flat arrays
+        polygons (list[GDB_Polygon] | GDB_PolygonArray): List of polygons (triangles)
+        objects: (Sequence[GDB_Object]): A submodel, with vertices, polygons, and a material
+        columnar (bool): Whether polygons and objects are stored as flat arrays
+        lazy (bool): Whether vertices, polygons, and objects are decoded when first used
 
     """
 
     materials: list[str]
-    vertices: list[GDB_Vertex]
     vertex_format: str
-    polygons: list[GDB_Polygon]
-    objects: list[GDB_Object]
     meta: list[GDB_Meta]
     scale: float
-
-    def __init__(self, file: LRFile) -> None:
+    columnar: bool
+    lazy: bool
+    _vertices: GDB_VertexArray
+    _polygons: list[GDB_Polygon] | GDB_PolygonArray
+    _objects: 'list[GDB_Object] | GDB_ObjectList'
+    _vertex_cursor: LRColumnCursor | None
+    _polygon_cursor: LRColumnCursor | None
+
+    def __init__(
+        self,
+        file: LRFile,
+        columnar: bool = False,
+        lazy: bool = False,
+        blocks: set[int] | None = None,
+        tape: bool = False,
+    ) -> None:
         helper: BinaryFileHelper = BinaryFileHelper()
-        reader: LRBinaryReader = helper.decompress(file.data)
+        with file.open() as stream:
+            reader: LRBinaryReader = helper.decompress(stream, tape)
 
         self.materials = []
-        self.vertices = []
+        self._vertices = GDB_VertexArray()
         self.vertex_format = ''
-        self.polygons = []
+        self._polygons = []
         self.meta = []
-        self.objects = []
+        self._objects = []
         self.scale = 1.0
+        self.columnar = columnar
+        self.lazy = lazy
+        self._vertex_cursor = None
+        self._polygon_cursor = None
 
         self.file = file
 
-        while reader.position < len(reader):
+        # Objects need the materials, vertices, and indices the meta refers to
+        if blocks is not None and ID.INDICES_META in blocks:
+            blocks = blocks | OBJECT_BLOCKS
+
+        while not reader.at_end():
             block_id: int = reader.read_int(Token.Byte)
+            if blocks is not None and block_id not in blocks:
+                reader.skip_block()
+                continue
 
             match block_id:
                 case ID.MATERIALS:
@@ -72,16 +141,38 @@ class GDB:
                 case ID.SCALE:
                     self.scale = reader.read_float(True)
 
+                case ID.VERTEX_NORMALED | ID.VERTEX_COLORED if lazy:
+                    self.vertex_format = (
+                        'normal' if block_id == ID.VERTEX_NORMALED else 'color'
+                    )
+                    self._vertex_cursor = LRColumnCursor.read_block(
+                        None, reader, LAYOUTS[self.vertex_format]
+                    )
+                    self._vertices = GDB_VertexArray(
+                        self.vertex_format, *self._vertex_cursor.columns
+                    )
+
                 case ID.VERTEX_NORMALED:
                     self.vertex_format = 'normal'
-                    self.vertices = reader.read_array_block(GDB_Vertex_Normal.read)
+                    self._vertices = GDB_VertexArray.read_block(None, reader, 'normal')
 
                 case ID.VERTEX_COLORED:
                     self.vertex_format = 'color'
-                    self.vertices = reader.read_array_block(GDB_Vertex_Color.read)
+                    self._vertices = GDB_VertexArray.read_block(None, reader, 'color')
+
+                case ID.INDICES if lazy:
+                    self._polygon_cursor = LRColumnCursor.read_block(
+                        None, reader, (GDB_Polygon.FIELDS,)
+                    )
+                    self._polygons = GDB_PolygonArray(self._polygon_cursor.columns[0])
+
+                case ID.INDICES if columnar:
+                    self._polygons = GDB_PolygonArray.read_block(None, reader)
 
                 case ID.INDICES:
-                    self.polygons = reader.read_array_block(GDB_Polygon.read)
+                    self._polygons = reader.read_record_array_block(
+                        GDB_Polygon.FIELDS, GDB_Polygon.from_record
+                    )
 
                 case ID.INDICES_META:
                     self.meta = reader.read_array_block(GDB_Meta.read)
@@ -91,15 +182,56 @@ class GDB:
                         f'Unexpected block: {hex(block_id)}, Position: {hex(reader.position)}'
                     )
 
+        if lazy:
+            self._objects = GDB_ObjectList(self, self.plan_objects())
+            return
+
+        if columnar:
+            self._vertices.compact()
+
         self.generate_objects()
 
         return
 
+    @property
+    def vertices(self) -> GDB_VertexArray:
+        if self._vertex_cursor is not None:
+            self._vertex_cursor.decode_range(0, self._vertex_cursor.count)
+        return self._vertices
+
+    @property
+    def polygons(self) -> list[GDB_Polygon] | GDB_PolygonArray:
+        if self._polygon_cursor is not None:
+            self._polygon_cursor.decode_range(0, self._polygon_cursor.count)
+        return self._polygons
+
+    @property
+    def objects(self) -> 'list[GDB_Object] | GDB_ObjectList':
+        return self._objects
+
+    def new_object(self, material_id: int = 0) -> GDB_Object:
+        if not self.columnar:
+            return GDB_Object(vertex_format=self.vertex_format, material_id=material_id)
+
+        return GDB_Object(
+            self._vertices.empty_like(),
+            GDB_PolygonArray(),
+            vertex_format=self.vertex_format,
+            material_id=material_id,
+        )
+
     def add_vertices_to_object(
         self, object: GDB_Object, vertex_selector: list[int]
     ) -> None:
-        for vertex_index in range(vertex_selector[2]):
-            object.vertices.append(self.vertices[vertex_selector[1] + vertex_index])
+        if isinstance(object.vertices, GDB_VertexArray):
+            object.vertices.extend_range(
+                self._vertices, vertex_selector[1], vertex_selector[2]
+            )
+            return
+
+        object.vertices.extend(
+            self._vertices[vertex_selector[1] : vertex_selector[1] + vertex_selector[2]]
+        )
 
     def get_absolute_face_vertices(
         self,
@@ -144,6 +276,58 @@ class GDB:
 
         return True
 
+    def get_absolute_face_indices(
+        self,
+        relative_indices: list[int],
+        vertex_selector: list[int],
+        previous_vertex_selector: list[int],
+        vertex_selector_obj_offset: int,
+        previous_vertex_selector_obj_offset: int,
+    ) -> tuple[int, ...]:
+        """
+        Remaps the vertex indices of a whole face range at once
+
+        Gives the same indices as get_absolute_face_vertices does one face at
+        a time.  Indices inside the vertex selector's window point into the
+        vertices it added, and every other index looks back into the ones the
+        previous selector added.  Both rules go into one lookup table, so the
+        whole range is remapped in a single pass.
+        """
+
+        if not relative_indices:
+            return ()
+
+        start: int = vertex_selector[0]
+        end: int = start + vertex_selector[2]
+        previous_start: int = previous_vertex_selector[0]
+        previous_shift: int = previous_vertex_selector_obj_offset - previous_start
+        highest: int = max(relative_indices)
+
+        # An index past both windows has nowhere to look back to
+        assert not (
+            highest >= end and highest - previous_start >= previous_vertex_selector[2]
+        )
+
+        # Broken indices could make the table huge
+        if min(relative_indices) < 0 or highest > 4 * len(relative_indices) + 0xFFFF:
+            return tuple(
+                vertex_selector_obj_offset + index - start
+                if start <= index < end
+                else previous_shift + index
+                for index in relative_indices
+            )
+
+        table: list[int] = list(range(previous_shift, previous_shift + highest + 1))
+        window_end: int = min(end, highest + 1)
+        if start < window_end:
+            table[start:window_end] = range(
+                vertex_selector_obj_offset,
+                vertex_selector_obj_offset + window_end - start,
+            )
+
+        # Every range has at least one face, so this always returns a tuple
+        return itemgetter(*relative_indices)(table)
+
     def add_faces_to_object(
         self,
         object: GDB_Object,
@@ -157,38 +341,61 @@ class GDB:
             vertex_selector_obj_offset - previous_vertex_selector[2]
         )
 
-        for face_index in range(current_face_selector[1]):
-            face: GDB_Polygon = self.polygons[current_face_selector[0] + face_index]
-            absolute_vertices: list[int] = [0, 0, 0]
+        first: int = current_face_selector[0]
+        last: int = first + current_face_selector[1]
+        if isinstance(self._polygons, GDB_PolygonArray):
+            relative_indices: list[int] = self._polygons.indices[
+                first * 3 : last * 3
+            ].tolist()
+        else:
+            relative_indices = [
+                index
+                for face in self._polygons[first:last]
+                for index in (face.v0, face.v1, face.v2)
+            ]
+
+        absolute_indices: tuple[int, ...] = self.get_absolute_face_indices(
+            relative_indices,
+            vertex_selector,
+            previous_vertex_selector,
+            vertex_selector_obj_offset,
+            previous_vertex_selector_obj_offset,
+        )
 
-            self.get_absolute_face_vertices(
-                face,
-                absolute_vertices,
-                vertex_selector,
-                previous_vertex_selector,
-                vertex_selector_obj_offset,
-                previous_vertex_selector_obj_offset,
-            )
+        # Add the triangles
+        if isinstance(object.polygons, GDB_PolygonArray):
+            object.polygons.extend(absolute_indices, current_group)
+            return
 
-            # Add a triangle
-            object.polygons.append(
-                GDB_Polygon(
-                    absolute_vertices[0],
-                    absolute_vertices[1],
-                    absolute_vertices[2],
-                    [absolute_vertices[0], absolute_vertices[1], absolute_vertices[2]],
-                    current_group,
-                )
-            )
+        faces = iter(absolute_indices)
+        object.polygons.extend(
+            GDB_Polygon(v0, v1, v2, [v0, v1, v2], current_group)
+            for v0, v1, v2 in zip(faces, faces, faces)
+        )
+
+    def plan_objects(self) -> list[GDB_ObjectPlan]:
+        """Walks the INDICES_META table into the steps that build each object"""
 
-    def generate_objects(self) -> None:
         # TODO: Make real data types for these
         current_vertex_selector: list[int] = [0, 0, 0]
         previous_vertex_selector: list[int] = [0, 0, 0]
         current_face_selector: list[int] = [0, 0]
 
+        # The blocks may not be decoded yet, but their lengths are known
+        vertex_count: int = (
+            self._vertex_cursor.count
+            if self._vertex_cursor is not None
+            else len(self._vertices)
+        )
+        polygon_count: int = (
+            self._polygon_cursor.count
+            if self._polygon_cursor is not None
+            else len(self._polygons)
+        )
+
+        plans: list[GDB_ObjectPlan] = []
         has_object: bool = False
-        current_object: GDB_Object = GDB_Object(vertex_format=self.vertex_format)
+        current_object: GDB_ObjectPlan = GDB_ObjectPlan()
         current_group: int = -1
 
         for meta in self.meta:
@@ -198,12 +405,10 @@ class GDB:
                     current_vertex_selector = [0, 0, 0]
                     previous_vertex_selector = [0, 0, 0]
                     current_face_selector = [0, 0]
-                    self.objects.append(current_object)
+                    plans.append(current_object)
 
                 if meta.material_id >= 0 and meta.material_id <= len(self.materials):
-                    current_object = GDB_Object(
-                        vertex_format=self.vertex_format, material_id=meta.material_id
-                    )
+                    current_object = GDB_ObjectPlan(meta.material_id)
                     has_object = True
                 else:
                     raise IndexError(f'material_id: {meta.material_id} out of range')
@@ -215,7 +420,7 @@ class GDB:
                 if (
                     meta.offset >= 0
                     and meta.length >= 0
-                    and meta.offset + meta.length <= len(self.vertices)
+                    and meta.offset + meta.length <= vertex_count
                 ):
                     previous_vertex_selector = current_vertex_selector
                     current_vertex_selector = [
@@ -226,25 +431,222 @@ class GDB:
                 else:
                     raise IndexError('Vertices out of range')
 
-                self.add_vertices_to_object(current_object, current_vertex_selector)
+                current_object.steps.append(
+                    (current_vertex_selector, previous_vertex_selector, None, 0)
+                )
+                current_object.vertex_ranges.append(
+                    (meta.offset, meta.offset + meta.length)
+                )
 
             elif type(meta) is GDB_Meta_Faces:
                 if (
                     meta.offset >= 0
                     and meta.length >= 0
-                    and meta.offset + meta.length <= len(self.polygons)
+                    and meta.offset + meta.length <= polygon_count
                 ):
                     current_face_selector = [meta.offset, meta.length]
                 else:
                     raise IndexError('Faces out of range')
 
-                self.add_faces_to_object(
-                    current_object,
-                    current_vertex_selector,
-                    previous_vertex_selector,
-                    current_face_selector,
-                    current_group,
+                current_object.steps.append(
+                    (
+                        current_vertex_selector,
+                        previous_vertex_selector,
+                        current_face_selector,
+                        current_group,
+                    )
+                )
+                current_object.face_ranges.append(
+                    (meta.offset, meta.offset + meta.length)
                 )
 
         if has_object:
-            self.objects.append(current_object)
+            plans.append(current_object)
+
+        return plans
+
+    def build_object(self, plan: GDB_ObjectPlan) -> GDB_Object:
+        """Builds an object, decoding only the vertices and polygons it needs"""
+
+        if self._vertex_cursor is not None:
+            for start, end in plan.vertex_ranges:
+                self._vertex_cursor.decode_range(start, end)
+        if self._polygon_cursor is not None:
+            for start, end in plan.face_ranges:
+                self._polygon_cursor.decode_range(start, end)
+
+        # Objects whose vertex ranges follow each other share the GDB's columns,
+        # their polygons are copied since the indices are rebased to the object
+        ranges: list[tuple[int, int]] = plan.vertex_ranges
+        shared: bool = (
+            self.columnar
+            and len(ranges) > 0
+            and all(start == end for (_, end), (start, _) in zip(ranges, ranges[1:]))
+        )
+
+        object: GDB_Object = self.new_object(plan.material_id)
+        for selector, previous_selector, face_selector, bone in plan.steps:
+            if face_selector is None and shared:
+                object.vertices = self._vertices.view(
+                    ranges[0][0], selector[1] + selector[2] - ranges[0][0]
+                )
+            elif face_selector is None:
+                self.add_vertices_to_object(object, selector)
+            else:
+                self.add_faces_to_object(
+                    object, selector, previous_selector, face_selector, bone
+                )
+
+        return object
+
+    def generate_objects(self) -> None:
+        self._objects = [self.build_object(plan) for plan in self.plan_objects()]
+
+    def to_asset(self, asset: LRAssetFile) -> None:
+        """Stores the columns of a columnar GDB and its objects, see AssetCache"""
+
+        asset.info = {
+            'materials': self.materials,
+            'scale': self.scale,
+            'vertex_format': self.vertex_format,
+            'meta': [[meta.meta_type, vars(meta)] for meta in self.meta],
+            'objects': [object.material_id for object in self.objects],
+        }
+
+        vertices: GDB_VertexArray = self.vertices
+        polygons: list[GDB_Polygon] | GDB_PolygonArray = self.polygons
+        if not isinstance(polygons, GDB_PolygonArray):
+            raise ValueError('Only columnar GDBs can be stored')
+
+        # The objects, one after another
+        object_vertices: GDB_VertexArray = vertices.empty_like()
+        object_polygons: GDB_PolygonArray = GDB_PolygonArray()
+        vertex_ends: array = array('i')
+        face_ends: array = array('i')
+        for object in self.objects:
+            if not isinstance(object.vertices, GDB_VertexArray) or not isinstance(
+                object.polygons, GDB_PolygonArray
+            ):
+                raise ValueError('Only columnar GDBs can be stored')
+
+            object_vertices.extend_range(object.vertices, 0, len(object.vertices))
+            object_polygons.indices.extend(object.polygons.indices)
+            object_polygons.bones.extend(object.polygons.bones)
+            vertex_ends.append(len(object_vertices))
+            face_ends.append(len(object_polygons))
+
+        asset.arrays = {
+            'positions': vertices.positions,
+            'tex_coords': vertices.tex_coords,
+            'extra': vertices.colors
+            if self.vertex_format == 'color'
+            else vertices.normals,
+            'indices': polygons.indices,
+            'object_positions': object_vertices.positions,
+            'object_tex_coords': object_vertices.tex_coords,
+            'object_extra': object_vertices.colors
+            if self.vertex_format == 'color'
+            else object_vertices.normals,
+            'object_indices': object_polygons.indices,
+            'object_bones': object_polygons.bones,
+            'vertex_ends': vertex_ends,
+            'face_ends': face_ends,
+        }
+
+    def from_asset(self: 'GDB | None', asset: LRAssetFile, file: LRFile) -> 'GDB':
+        """A columnar GDB with the arrays of a stored asset, see AssetCache"""
+
+        val: GDB = GDB.__new__(GDB)
+        val.file = file
+        val.materials = asset.info['materials']
+        val.scale = asset.info['scale']
+        val.vertex_format = asset.info['vertex_format']
+        val.columnar = True
+        val.lazy = False
+        val._vertex_cursor = None
+        val._polygon_cursor = None
+
+        val.meta = []
+        for meta_type, values in asset.info['meta']:
+            meta: GDB_Meta = META_TYPES[meta_type]()
+            vars(meta).update(values)
+            val.meta.append(meta)
+
+        arrays = asset.arrays
+        val._vertices = GDB_VertexArray(
+            val.vertex_format,
+            arrays['positions'],
+            arrays['tex_coords'],
+            arrays['extra'],
+        )
+        val._polygons = GDB_PolygonArray(arrays['indices'])
+
+        # Each object is a slice of the stored columns
+        extra: int = 4 if val.vertex_format == 'color' else 3
+        vertex_start: int = 0
+        face_start: int = 0
+        val._objects = []
+        for material_id, vertex_end, face_end in zip(
+            asset.info['objects'], arrays['vertex_ends'], arrays['face_ends']
+        ):
+            val._objects.append(
+                GDB_Object(
+                    GDB_VertexArray(
+                        val.vertex_format,
+                        arrays['object_positions'][vertex_start * 3 : vertex_end * 3],
+                        arrays['object_tex_coords'][vertex_start * 2 : vertex_end * 2],
+                        arrays['object_extra'][
+                            vertex_start * extra : vertex_end * extra
+                        ],
+                    ),
+                    GDB_PolygonArray(
+                        arrays['object_indices'][face_start * 3 : face_end * 3],
+                        arrays['object_bones'][face_start:face_end],
+                    ),
+                    vertex_format=val.vertex_format,
+                    material_id=material_id,
+                )
+            )
+            vertex_start, face_start = vertex_end, face_end
+
+        return val
+
+
+class GDB_ObjectList(Sequence[GDB_Object]):
+    """
+    The objects of a lazy GDB, built the first time each one is accessed
+
+    Attributes:
+        gdb (GDB): The GDB the objects belong to
+        plans (list[GDB_ObjectPlan]): How to build each object
+    """
+
+    gdb: GDB
+    plans: list[GDB_ObjectPlan]
+    _objects: dict[int, GDB_Object]
+
+    def __init__(self, gdb: GDB, plans: list[GDB_ObjectPlan]) -> None:
+        self.gdb = gdb
+        self.plans = plans
+        self._objects = {}
+
+    def __len__(self) -> int:
+        return len(self.plans)
+
+    @overload
+    def __getitem__(self, index: int) -> GDB_Object: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[GDB_Object]: ...
+
+    def __getitem__(self, index: int | slice) -> GDB_Object | list[GDB_Object]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self.plans))[index]]
+
+        index = range(len(self.plans))[index]
+        object: GDB_Object | None = self._objects.get(index)
+        if object is None:
+            object = self._objects.setdefault(
+                index, self.gdb.build_object(self.plans[index])
+            )
+        return object
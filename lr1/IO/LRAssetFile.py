@@ -0,0 +1,157 @@
+from typing import Any
+from array import array
+import json
+import mmap
+import os
+import pathlib
+import struct
+import sys
+
+# Start of every asset file: magic and the size of the JSON header
+ASSET_MAGIC: bytes = b'LRASSET\x00'
+ASSET_HEADER: struct.Struct = struct.Struct('<8sI')
+
+# Version of the layout below, changed whenever it changes
+ASSET_FORMAT_VERSION: int = 2
+
+# Arrays start on multiples of this, so the mapped views are aligned
+ASSET_ALIGNMENT: int = 8
+
+# A stored array is either still in memory or a view of the mapped file
+AssetArray = array | memoryview
+
+
+def typecode(values: AssetArray) -> str:
+    """The array typecode of an array or a view of one"""
+
+    return values.typecode if isinstance(values, array) else values.format
+
+
+def writable(values: AssetArray) -> array:
+    """The values as an array that can grow, copying a view of a stored asset"""
+
+    if isinstance(values, array):
+        return values
+
+    copy: array = array(values.format)
+    copy.frombytes(values)
+    return copy
+
+
+class LRAssetFile:
+    """
+    A parsed file, stored as JSON values and raw arrays
+
+    The file starts with a JSON header holding the small values, followed by
+    the arrays, each aligned to ASSET_ALIGNMENT.  Reading maps the file into
+    memory and returns the arrays as read-only views of the mapping, so
+    nothing is copied or unpacked until the arrays are used.
+
+    Attributes:
+        kind (str): What was parsed, like 'GDB'
+        key (str): Identifies the source data and the library version
+        info (dict[str, Any]): Values that can be stored as JSON
+        arrays (dict[str, AssetArray]): Columns of values by name
+    """
+
+    kind: str
+    key: str
+    info: dict[str, Any]
+    arrays: dict[str, AssetArray]
+
+    def __init__(self, kind: str, key: str) -> None:
+        self.kind = kind
+        self.key = key
+        self.info = {}
+        self.arrays = {}
+
+    def header(self, layout: list[list[Any]]) -> bytes:
+        """The JSON header, listing where each array is stored"""
+
+        return json.dumps(
+            {
+                'format': ASSET_FORMAT_VERSION,
+                'byteorder': sys.byteorder,
+                'kind': self.kind,
+                'key': self.key,
+                'info': self.info,
+                'arrays': layout,
+            },
+            separators=(',', ':'),
+        ).encode()
+
+    def write(self, path: pathlib.Path) -> None:
+        """Stores the asset, replacing any older file in one step"""
+
+        # The offsets are in the header, so place the arrays after its final size
+        layout: list[list[Any]] = [
+            [name, typecode(values), 0, 0] for name, values in self.arrays.items()
+        ]
+        size: int = len(self.header(layout))
+        while True:
+            position: int = ASSET_HEADER.size + size
+            for entry, values in zip(layout, self.arrays.values()):
+                position += -position % ASSET_ALIGNMENT
+                entry[2] = position
+                entry[3] = len(values)
+                position += values.itemsize * len(values)
+
+            header: bytes = self.header(layout)
+            if len(header) == size:
+                break
+            size = len(header)
+
+        temporary: pathlib.Path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temporary, 'wb') as file:
+                file.write(ASSET_HEADER.pack(ASSET_MAGIC, len(header)))
+                file.write(header)
+                for entry, values in zip(layout, self.arrays.values()):
+                    file.write(bytes(entry[2] - file.tell()))
+                    file.write(memoryview(values).cast('B'))
+            os.replace(temporary, path)
+        except OSError:
+            # The asset can always be parsed again
+            temporary.unlink(missing_ok=True)
+
+    def read(
+        self: 'LRAssetFile | None', path: pathlib.Path, kind: str, key: str
+    ) -> 'LRAssetFile | None':
+        """Maps a stored asset, or returns None if it is missing or out of date"""
+
+        try:
+            with open(path, 'rb') as file:
+                data: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            magic, size = ASSET_HEADER.unpack_from(data)
+            header: dict[str, Any] = json.loads(
+                data[ASSET_HEADER.size : ASSET_HEADER.size + size]
+            )
+        except (struct.error, ValueError):
+            return None
+
+        if (
+            magic != ASSET_MAGIC
+            or header.get('format') != ASSET_FORMAT_VERSION
+            or header.get('byteorder') != sys.byteorder
+            or header.get('kind') != kind
+            or header.get('key') != key
+        ):
+            return None
+
+        asset: LRAssetFile = LRAssetFile(kind, key)
+        asset.info = header['info']
+
+        # The views keep the mapping open for as long as they are used
+        view: memoryview = memoryview(data)
+        for name, code, offset, count in header['arrays']:
+            end: int = offset + array(code).itemsize * count
+            if end > len(data):
+                return None
+            asset.arrays[name] = view[offset:end].cast(code)
+
+        return asset
@@ -1,10 +1,15 @@
 from typing import IO
 from typing import Any
 from collections.abc import Callable
+from array import array
+import copy
+import mmap
 import struct
 
+from .LRBufferStream import LRBufferStream
+from .LRRecordRun import LRRecordRun
 from ..Utils.Token import Token
-from ..Utils.LRVector3 import LRVector3
+from ..Utils.LRVector3Array import LRVector3Array
 
 # Convert tokens to format characters
 FORMAT = {
@@ -16,65 +21,216 @@ FORMAT = {
     Token.UShort: 'H',
 }
 
+# Precompiled little endian unpackers for each token
+STRUCTS: dict[int, struct.Struct] = {
+    token: struct.Struct(f'<{fmt}') for token, fmt in FORMAT.items()
+}
+
+# Tokens that may prefix an integer read by read_typed_int
+TYPED_INT_TOKENS: tuple[Token, ...] = (
+    Token.SByte,
+    Token.Byte,
+    Token.Int32,
+    Token.UShort,
+    Token.Short,
+)
+
+# Unpacker for every byte value that is a typed int token, None for the rest
+TYPED_INTS: list[struct.Struct | None] = [
+    STRUCTS[token] if token in TYPED_INT_TOKENS else None for token in range(256)
+]
+
+# Record field kinds that need one specific token
+KIND_TOKENS: dict[str, Token] = {
+    'f': Token.Float,
+    'l': Token.Int32,
+    'b': Token.SByte,
+    'B': Token.Byte,
+    'h': Token.Short,
+    'H': Token.UShort,
+}
+
+# Tokens accepted by each kind of field in a record layout
+FIELD_TOKENS: dict[str, frozenset[int]] = {
+    'i': frozenset(TYPED_INT_TOKENS),
+    **{kind: frozenset({token}) for kind, token in KIND_TOKENS.items()},
+}
+
+# Array typecodes of the columns for each kind of field
+COLUMN_TYPECODES: dict[str, str] = {
+    kind: 'f' if kind == 'f' else 'i' for kind in FIELD_TOKENS
+}
+
+# Tokens that can continue a block, anything else starts the next block
+BLOCK_TOKENS: frozenset[int] = frozenset(
+    {Token.String, Token.LeftCurly, Token.LeftBracket, *FORMAT}
+)
+
+# How far ahead to look for a string terminator in buffers without find()
+STRING_SCAN_CHUNK: int = 64
+
+Buffer = bytes | bytearray | memoryview | mmap.mmap
+
+RecordDecoder = Callable[['LRBinaryReader'], tuple[Any, ...]]
+
+# Decoders generated by compile_record, by record layout
+RECORD_DECODERS: dict[str, RecordDecoder] = {}
+
+
+def compile_record(fields: str) -> RecordDecoder:
+    """
+    Returns a function that reads one record with the given layout
+
+    Each character of fields is one value and its token: 'f' Float, 'i' any
+    typed int, 'l' Int32, 'b' SByte, 'B' Byte, 'h' Short, 'H' UShort.  The
+    function is generated once per layout and cached.
+    """
+
+    decoder: RecordDecoder | None = RECORD_DECODERS.get(fields)
+    if decoder is not None:
+        return decoder
+
+    lines: list[str] = [
+        'def decode(reader):',
+        '    read_token = reader.read_token',
+        '    data = reader.data',
+    ]
+    for i, kind in enumerate(fields):
+        lines.append('    token = read_token()')
+
+        if kind == 'i':
+            lines += [
+                '    unpacker = TYPED_INTS[token]',
+                '    if unpacker is None:',
+                '        raise ValueError(f"Invalid typed int token: {hex(token)}")',
+                '    position = reader._position',
+                f'    v{i} = unpacker.unpack_from(data, position)[0]',
+                '    reader._position = position + unpacker.size',
+            ]
+
+        elif kind in KIND_TOKENS:
+            token: int = int(KIND_TOKENS[kind])
+            lines += [
+                f'    if token != {token}:',
+                '        raise ValueError(',
+                f'            f"Invalid data. Expected {hex(token)}. Got {{hex(token)}}."',
+                '        )',
+                '    position = reader._position',
+                f'    v{i} = S{token}.unpack_from(data, position)[0]',
+                f'    reader._position = position + {STRUCTS[token].size}',
+            ]
+
+        else:
+            raise ValueError(f'Unknown field kind: {kind!r} in {fields!r}')
+
+    lines.append(f'    return ({"".join(f"v{i}, " for i in range(len(fields)))})')
+
+    namespace: dict[str, Any] = {'TYPED_INTS': TYPED_INTS}
+    namespace.update(
+        {f'S{int(token)}': unpacker for token, unpacker in STRUCTS.items()}
+    )
+    exec('\n'.join(lines), namespace)
+
+    decoder = namespace['decode']
+    RECORD_DECODERS[fields] = decoder
+    return decoder
+
 
 class LRBinaryReader:
     """
     File reader with functions to read specialized binary data
 
+    The reader works directly on an in-memory buffer with an integer cursor,
+    so it never seeks or copies while parsing.
+
     Attributes:
-        reader (BytesIO): The data to read from
-        position (int): The current read position in the file
+        data (Buffer): The data to read from
+        position (int): The current read position in the data
     """
 
-    reader: IO[bytes]
+    data: Buffer
+    _position: int
     _length: int
 
-    def __init__(self, file: IO[bytes]):
-        self.reader = file
+    # Whether read_record_run can find runs, readers without them skip in bulk
+    RECORD_RUNS: bool = True
+
+    def __init__(self, file: IO[bytes] | Buffer):
+        if isinstance(file, (bytes, bytearray, mmap.mmap)):
+            self.data = file
+        elif isinstance(file, memoryview):
+            self.data = file.cast('B') if file.format != 'B' else file
+        elif isinstance(file, LRBufferStream):
+            # Share the stream's memory instead of copying it
+            self.data = file.remaining()
+        else:
+            # Read the rest of the stream into memory once
+            self.data = file.read()
 
-        # Calculate the length of the file by seeking to the end
-        current_pos = self.reader.tell()
-        self.reader.seek(0, 2)
-        self._length = self.reader.tell()
-        self.reader.seek(current_pos, 0)
+        self._position = 0
+        self._length = len(self.data)
+
+        # memoryview has no find(), so strings are scanned in chunks instead
+        self._find: Callable[..., int] | None = getattr(self.data, 'find', None)
 
     def __len__(self) -> int:
         return self._length
 
     @property
     def position(self) -> int:
-        return self.reader.tell()
+        return self._position
+
+    def fork(self) -> 'LRBinaryReader':
+        """A reader of its own over the same data, at the same position"""
+
+        return copy.copy(self)
+
+    def at_end(self) -> bool:
+        """Checks whether there is nothing left to read"""
+
+        return self._position >= self._length
+
+    def read_token(self) -> int:
+        """Reads the next token byte"""
+
+        token: int = self.data[self._position]
+        self._position += 1
+        return token
+
+    def peek_token(self) -> int:
+        """Returns the next token byte without consuming it"""
+
+        return self.data[self._position]
 
     def expect(self, expected: int | list[int]) -> int:
         """Reads a byte that we hopefully know in advance"""
 
-        actual: int = self.read_int(Token.Byte)
+        actual: int = self.read_token()
 
-        if type(expected) is list[int]:
+        if isinstance(expected, list):
             if actual not in expected:
                 raise ValueError(
                     f'Invalid Token.  Expected {str(expected)}.  Got {str(actual)}'
                 )
 
-        elif type(expected) is int:
-            if actual != expected:
-                raise ValueError(
-                    f'Invalid data. Expected {hex(expected)}. Got {hex(actual)}.'
-                )
+        elif actual != expected:
+            raise ValueError(
+                f'Invalid data. Expected {hex(expected)}. Got {hex(actual)}.'
+            )
 
         return actual
 
     def next(self, expected: Token) -> bool:
         """Checks the next byte without changing the read position"""
 
-        actual: int = self.read_int(Token.Byte)
-        self.reader.seek(-1, 1)  # Go back one byte
-        return actual == expected
+        return self.peek_token() == expected
 
     def read_bytes(self, count: int) -> bytes:
         """Reads an array of bytes"""
 
-        return self.reader.read(count)
+        value: bytes = bytes(self.data[self._position : self._position + count])
+        self._position += len(value)
+        return value
 
     def read_int(self, format: Token, header: bool = False) -> int:
         """Reads an integer-like value"""
@@ -83,10 +239,10 @@ class LRBinaryReader:
         if header:
             self.expect(format)
 
-        fmt: str = f'<{FORMAT[format]}'
-        size = struct.calcsize(fmt)
-        bytes_read = self.reader.read(size)
-        return int(struct.unpack(fmt, bytes_read)[0])
+        unpacker: struct.Struct = STRUCTS[format]
+        value: int = unpacker.unpack_from(self.data, self._position)[0]
+        self._position += unpacker.size
+        return value
 
     def read_float(self, header: bool = False) -> float:
         """Reads a float value from the file"""
@@ -95,23 +251,23 @@ class LRBinaryReader:
         if header:
             self.expect(Token.Float)
 
-        bytes_read = self.reader.read(4)
-        f: float = struct.unpack('<f', bytes_read)[0]
+        f: float = STRUCTS[Token.Float].unpack_from(self.data, self._position)[0]
+        self._position += 4
         return f
 
     def read_typed_int(self) -> int:
         """Reads the header byte to determine the format, then reads the value"""
 
-        valid_types: list[int] = [
-            Token.SByte,
-            Token.Byte,
-            Token.Int32,
-            Token.UShort,
-            Token.Short,
-        ]
-        type: int = self.expect(valid_types)
+        type: int = self.read_token()
+        unpacker: struct.Struct | None = TYPED_INTS[type]
+        if unpacker is None:
+            raise ValueError(
+                f'Invalid Token.  Expected {list(TYPED_INT_TOKENS)}.  Got {type}'
+            )
 
-        return self.read_int(Token(type))
+        value: int = unpacker.unpack_from(self.data, self._position)[0]
+        self._position += unpacker.size
+        return value
 
     def read_string(self, header: bool = False) -> str:
         """Reads a C style string, character bytes terminated by a null byte"""
@@ -120,17 +276,206 @@ class LRBinaryReader:
         if header:
             self.expect(Token.String)
 
-        string: str = ''
-        byte: int
+        end: int = self.find_null(self._position)
+        string: str = str(self.data[self._position : end], 'latin-1')
+        self._position = end + 1
+
+        return string
+
+    def find_null(self, start: int) -> int:
+        """Returns the index of the next null byte at or after start"""
+
+        if self._find is not None:
+            end: int = self._find(b'\x00', start)
+            if end >= 0:
+                return end
+
+        else:
+            chunk_start: int = start
+            while chunk_start < self._length:
+                chunk: bytes = bytes(
+                    self.data[chunk_start : chunk_start + STRING_SCAN_CHUNK]
+                )
+                offset: int = chunk.find(b'\x00')
+                if offset >= 0:
+                    return chunk_start + offset
+                chunk_start += STRING_SCAN_CHUNK
+
+        raise ValueError(f'Unterminated string at position: {hex(start)}')
+
+    def skip_value(self, token: int) -> None:
+        """Moves past the value that follows a token, if it has one"""
+
+        if token == Token.String:
+            self._position = self.find_null(self._position) + 1
+        elif token in STRUCTS:
+            self._position += STRUCTS[token].size
+
+    def skip_run(self) -> bool:
+        """Moves past a run of values that needs no tokens to measure, if one is next"""
+
+        return False
 
-        # Read characters until null byte
+    def skip_block(self) -> None:
+        """
+        Moves past the contents of a block, measured from the tokens alone
+
+        A block holds values and nested [...] and {...} groups, up to the
+        first byte outside any group that is not a token: the ID of the next
+        block.  Values are stepped over without being unpacked.
+        """
+
+        depth: int = 0
         while True:
-            byte = self.read_int(Token.Byte)
-            if byte == 0x00:
-                break
-            string += chr(byte)
+            if self.skip_run():
+                continue
+            if depth == 0 and (
+                self.at_end() or self.peek_token() not in BLOCK_TOKENS
+            ):
+                return
+
+            token: int = self.read_token()
+            if token == Token.LeftCurly or token == Token.LeftBracket:
+                depth += 1
+            elif token == Token.RightCurly or token == Token.RightBracket:
+                depth -= 1
+            else:
+                self.skip_value(token)
+
+    def read_record(self, fields: str) -> tuple[Any, ...]:
+        """Reads one record with the layout described in compile_record"""
+
+        return compile_record(fields)(self)
+
+    def read_records(self, fields: str, count: int) -> list[tuple[Any, ...]]:
+        """Reads count records, decoding runs with the same layout in bulk"""
+
+        records: list[tuple[Any, ...]] = []
+        decode: RecordDecoder = compile_record(fields)
+
+        while len(records) < count:
+            run: LRRecordRun | None = self.read_record_run(
+                fields, count - len(records)
+            )
+            if run is None:
+                records.append(decode(self))
+            else:
+                records.extend(run.rows())
+
+        return records
+
+    def skip_records(self, fields: str, count: int) -> None:
+        """Moves past count records, without unpacking runs of them"""
+
+        decode: RecordDecoder = compile_record(fields)
+        while count > 0:
+            run: LRRecordRun | None = self.read_record_run(fields, count)
+            if run is None:
+                decode(self)
+                count -= 1
+            else:
+                count -= run.count
+
+    def read_record_run(self, fields: str, count: int) -> LRRecordRun | None:
+        """Reads up to count records that share one layout, if the next one fits"""
+
+        data: Buffer = self.data
+        start: int = self._position
+
+        # Find the layout of the first record
+        position: int = start
+        offsets: list[int] = []
+        tokens: list[int] = []
+        for kind in fields:
+            if position >= self._length or data[position] not in FIELD_TOKENS[kind]:
+                return None
+            tokens.append(data[position])
+            offsets.append(position + 1 - start)
+            position += 1 + STRUCTS[data[position]].size
+
+        if position > self._length:
+            return None
+
+        stride: int = position - start
+        count = min(count, (self._length - start) // stride)
+
+        # Count how many records in a row have the same tokens in the same places
+        for offset, token in zip(offsets, tokens):
+            column: bytes = bytes(
+                data[start + offset - 1 : start + count * stride : stride]
+            )
+            count -= len(column.lstrip(bytes([token])))
+
+        self._position = start + count * stride
+        return LRRecordRun(
+            bytes(data[start : self._position]), stride, offsets, tokens, count
+        )
+
+    def read_columns(self, layout: tuple[str, ...], count: int) -> list[array]:
+        """
+        Reads count records into one flat array per group of fields
+
+        Each group in the layout is a string of field kinds, like 'fff' for a
+        position.  Runs of records with the same layout are decoded in bulk.
+        """
+
+        fields: str = ''.join(layout)
+        columns: list[array] = [array(COLUMN_TYPECODES[group[0]]) for group in layout]
+        decode: RecordDecoder = compile_record(fields)
+
+        remaining: int = count
+        while remaining > 0:
+            run: LRRecordRun | None = self.read_record_run(fields, remaining)
+
+            first: int = 0
+            if run is None:
+                record: tuple[Any, ...] = decode(self)
+                for column, group in zip(columns, layout):
+                    column.extend(record[first : first + len(group)])
+                    first += len(group)
+                remaining -= 1
+
+            else:
+                for column, group in zip(columns, layout):
+                    column.extend(run.group(first, len(group), column.typecode))
+                    first += len(group)
+                remaining -= run.count
+
+        return columns
+
+    def read_columns_block(self, layout: tuple[str, ...]) -> list[array]:
+        """Reads the array setup and length, then the records as columns"""
 
-        return string
+        # Read the array length
+        self.expect(Token.LeftBracket)
+        array_len: int = self.read_int(Token.Int32, True)
+        self.expect(Token.RightBracket)
+
+        # Read the array
+        self.expect(Token.LeftCurly)
+        columns: list[array] = self.read_columns(layout, array_len)
+        self.expect(Token.RightCurly)
+
+        return columns
+
+    def read_record_array_block(
+        self, fields: str, build_func: Callable[[Any, tuple[Any, ...]], Any]
+    ) -> list[Any]:
+        """Reads the array setup and length, then builds each item from a record"""
+
+        # Read the array length
+        self.expect(Token.LeftBracket)
+        array_len: int = self.read_int(Token.Int32, True)
+        self.expect(Token.RightBracket)
+
+        # Read the array
+        self.expect(Token.LeftCurly)
+        output: list[Any] = [
+            build_func(None, record) for record in self.read_records(fields, array_len)
+        ]
+        self.expect(Token.RightCurly)
+
+        return output
 
     def read_array_block(
         self, read_func: Callable[[Any, 'LRBinaryReader'], Any]
@@ -188,7 +533,7 @@ class LRBinaryReader:
 
         return self.read_array_block(lambda _, br: br.read_string(True))
 
-    def read_vector_3f_array_block(self) -> list[LRVector3]:
+    def read_vector_3f_array_block(self) -> LRVector3Array:
         """Reads an array of Vector3"""
 
-        return self.read_array_block(LRVector3.read)
+        return LRVector3Array(self.read_columns_block(('fff',))[0])
@@ -0,0 +1,85 @@
+import io
+
+
+class LRBufferStream(io.RawIOBase):
+    """
+    Read-only stream over a memoryview, without copying the data
+
+    Reads only copy the bytes they return, so a stream over a slice of a
+    memory mapped file only touches the pages that are actually read.
+
+    Attributes:
+        view (memoryview): The bytes of the stream
+    """
+
+    view: memoryview
+    _position: int
+
+    def __init__(self, view: memoryview) -> None:
+        super().__init__()
+        self.view = view.cast('B') if view.format != 'B' else view
+        self._position = 0
+
+    def __len__(self) -> int:
+        return len(self.view)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position: int = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = len(self.view) + offset
+        else:
+            raise ValueError(f'Invalid whence: {whence}')
+
+        if position < 0:
+            raise ValueError(f'Negative seek position: {position}')
+
+        self._position = position
+        return position
+
+    def read(self, size: int | None = -1) -> bytes:
+        start: int = self._position
+        end: int = len(self.view)
+        if size is not None and size >= 0:
+            end = min(end, start + size)
+
+        if start >= end:
+            return b''
+
+        self._position = end
+        return self.view[start:end].tobytes()
+
+    def readall(self) -> bytes:
+        return self.read()
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:
+        target: memoryview = memoryview(buffer).cast('B')
+        start: int = self._position
+        end: int = min(len(self.view), start + len(target))
+        if start >= end:
+            return 0
+
+        target[: end - start] = self.view[start:end]
+        self._position = end
+        return end - start
+
+    def close(self) -> None:
+        # Let go of the memory so a mapped file can be closed
+        self.view.release()
+        super().close()
+
+    def remaining(self) -> memoryview:
+        """Returns the bytes after the read position without copying them"""
+
+        return self.view[self._position :]
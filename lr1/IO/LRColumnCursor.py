@@ -0,0 +1,158 @@
+from array import array
+import threading
+
+from .LRBinaryReader import LRBinaryReader, RecordDecoder, COLUMN_TYPECODES
+from .LRBinaryReader import compile_record
+from .LRRecordRun import LRRecordRun
+from ..Utils.Token import Token
+
+
+class LRColumnCursor:
+    """
+    The records of an array block, decoded into columns only as they are needed
+
+    Reading the block only moves the parser past it, noting where each range
+    of records is: runs of records with one layout keep their bytes, so any
+    part of them can be sliced out, and the records between them keep a
+    reader of their own at the first one.  The columns are allocated at full
+    length up front and each range of records is filled in on its own, so
+    the records in front of it are never decoded.
+
+    Attributes:
+        layout (tuple[str, ...]): Field groups of each record, as for read_columns
+        count (int): Number of records in the block
+        decoded (int): Number of records decoded so far
+        columns (list[array]): The records, one flat array per field group, zero where not decoded yet
+        segments (list[tuple[int, int, LRRecordRun | LRBinaryReader]]): First and end record of each range, and the run or reader that holds it
+    """
+
+    layout: tuple[str, ...]
+    count: int
+    decoded: int
+    columns: list[array]
+    segments: list[tuple[int, int, LRRecordRun | LRBinaryReader]]
+    _done: bytearray
+    _lock: threading.Lock
+
+    def __init__(self, layout: tuple[str, ...], count: int) -> None:
+        self.layout = layout
+        self.count = count
+        self.decoded = 0
+        self.columns = []
+        for group in layout:
+            column: array = array(COLUMN_TYPECODES[group[0]])
+            self.columns.append(
+                array(column.typecode, bytes(column.itemsize * count * len(group)))
+            )
+        self.segments = []
+        self._done = bytearray(count)
+        self._lock = threading.Lock()
+
+    def read_block(
+        self: 'LRColumnCursor | None', reader: LRBinaryReader, layout: tuple[str, ...]
+    ) -> 'LRColumnCursor':
+        """Moves past an array block, noting where each range of records is"""
+
+        # Read the array length
+        reader.expect(Token.LeftBracket)
+        array_len: int = reader.read_int(Token.Int32, True)
+        reader.expect(Token.RightBracket)
+
+        reader.expect(Token.LeftCurly)
+        cursor: LRColumnCursor = LRColumnCursor(layout, array_len)
+        fields: str = ''.join(layout)
+
+        if not reader.RECORD_RUNS:
+            # Without runs the whole block is one range, skipped in one go
+            cursor.segments.append((0, array_len, reader.fork()))
+            reader.skip_records(fields, array_len)
+
+        else:
+            decode: RecordDecoder = compile_record(fields)
+            first: int = 0
+            stretch: LRBinaryReader | None = None
+            stretch_first: int = 0
+            while first < array_len:
+                run: LRRecordRun | None = reader.read_record_run(
+                    fields, array_len - first
+                )
+
+                # Records outside any run share one reader until the next run
+                if run is None:
+                    if stretch is None:
+                        stretch = reader.fork()
+                        stretch_first = first
+                    decode(reader)
+                    first += 1
+                    continue
+
+                if stretch is not None:
+                    cursor.segments.append((stretch_first, first, stretch))
+                    stretch = None
+                cursor.segments.append((first, first + run.count, run))
+                first += run.count
+
+            if stretch is not None:
+                cursor.segments.append((stretch_first, first, stretch))
+
+        reader.expect(Token.RightCurly)
+
+        return cursor
+
+    def decode_range(self, start: int, end: int) -> list[array]:
+        """Makes sure records start to end are decoded and returns the columns"""
+
+        start = max(start, 0)
+        end = min(end, self.count)
+        with self._lock:
+            if start >= end or self._done.find(0, start, end) == -1:
+                return self.columns
+
+            for first, last, source in self.segments:
+                if first >= end:
+                    break
+                if last <= start:
+                    continue
+
+                # Only the records of the range that are still missing
+                begin: int = self._done.find(0, max(first, start), min(last, end))
+                if begin == -1:
+                    continue
+                stop: int = self._done.rfind(0, begin, min(last, end)) + 1
+
+                parts: list[array]
+                if isinstance(source, LRRecordRun):
+                    offset: int = (begin - first) * source.stride
+                    size: int = (stop - begin) * source.stride
+                    run: LRRecordRun = LRRecordRun(
+                        source.buffer[offset : offset + size],
+                        source.stride,
+                        source.offsets,
+                        source.tokens,
+                        stop - begin,
+                    )
+                    parts = []
+                    field: int = 0
+                    for column, group in zip(self.columns, self.layout):
+                        parts.append(run.group(field, len(group), column.typecode))
+                        field += len(group)
+                else:
+                    reader: LRBinaryReader = source.fork()
+                    reader.skip_records(''.join(self.layout), begin - first)
+                    parts = reader.read_columns(self.layout, stop - begin)
+
+                for column, group, part in zip(self.columns, self.layout, parts):
+                    column[begin * len(group) : stop * len(group)] = part
+                self.decoded += self._done.count(0, begin, stop)
+                self._done[begin:stop] = b'\x01' * (stop - begin)
+
+            # Let go of the file data once everything is decoded
+            if self.decoded == self.count:
+                self.segments = []
+
+        return self.columns
+
+    def is_decoded(self, start: int, end: int) -> bool:
+        """Checks whether records start to end are all decoded"""
+
+        return self._done.find(0, max(start, 0), min(end, self.count)) == -1
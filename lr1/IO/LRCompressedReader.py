@@ -0,0 +1,239 @@
+from typing import IO
+from collections.abc import Iterator
+from itertools import chain, repeat
+import copy
+
+from .LRBinaryReader import LRBinaryReader, Buffer, STRUCTS, FIELD_TOKENS
+from .LRRecordRun import LRRecordRun
+from ..Utils.Token import Token
+from ..Utils.StructTemplate import StructTable, StructTemplate, VALUE_SIZES
+
+# Tokens that are followed by a value in the data
+PAYLOAD_TOKENS: frozenset[int] = frozenset(
+    {
+        Token.String,
+        Token.Float,
+        Token.Int32,
+        Token.SByte,
+        Token.Byte,
+        Token.Short,
+        Token.UShort,
+    }
+)
+
+# Returned by the token functions when there is no more data
+END: int = -1
+
+
+class LRCompressedReader(LRBinaryReader):
+    """
+    Reader for the Array/Struct compressed token stream
+
+    Struct templates and arrays are expanded on the fly, so the parsers see
+    the same tokens and values as in the decompressed file without the
+    stream ever being rebuilt in memory.  Values are always read straight
+    from the compressed data, only the tokens in front of them are implied.
+
+    Attributes:
+        structs (StructTable): The struct definitions declared so far
+    """
+
+    structs: StructTable
+    _stack: list[Iterator[int]]
+    _peeked: int | None
+    _payload_at: int
+
+    def __init__(self, file: IO[bytes] | Buffer):
+        super().__init__(file)
+
+        self.structs = StructTable()
+        self._stack = []
+        self._peeked = None
+        self._payload_at = END
+
+    def fork(self) -> 'LRCompressedReader':
+        reader: LRCompressedReader = copy.copy(self)
+        reader.structs = self.structs.copy()
+
+        # Iterators can't be shared, so each reader gets what is left of them
+        pending: list[list[int]] = [list(tokens) for tokens in self._stack]
+        self._stack = [iter(tokens) for tokens in pending]
+        reader._stack = [iter(tokens) for tokens in pending]
+        return reader
+
+    def _resolve(self) -> int:
+        """Finds the next token, expanding arrays and structs along the way"""
+
+        data: Buffer = self.data
+        stack: list[Iterator[int]] = self._stack
+        structs: StructTable = self.structs
+        definitions: dict[int, tuple[int, ...]] = structs.definitions
+
+        while True:
+            if stack:
+                token: int | None = next(stack[-1], None)
+                if token is None:
+                    stack.pop()
+                    continue
+
+            elif self._position < self._length:
+                token = data[self._position]
+                self._position += 1
+
+            else:
+                return END
+
+            if token == Token.Array:
+                array_len: int = STRUCTS[Token.Short].unpack_from(
+                    data, self._position
+                )[0]
+                array_type: int = data[self._position + 2]
+                self._position += 3
+
+                # Expand the whole array of structs as one run of tokens
+                if array_type in definitions:
+                    stack.append(
+                        chain.from_iterable(
+                            repeat(structs[array_type].tokens, array_len)
+                        )
+                    )
+                else:
+                    stack.append(repeat(array_type, array_len))
+
+            elif token == Token.Struct:
+                self._read_struct()
+
+            elif token in definitions:
+                stack.append(iter(structs[token].tokens))
+
+            else:
+                return token
+
+    def _read_struct(self) -> None:
+        """Reads a struct definition following a Struct token"""
+
+        struct_id: int = self.data[self._position]
+        struct_len: int = self.data[self._position + 1]
+        struct_def: tuple[int, ...] = tuple(
+            self.data[self._position + 2 : self._position + 2 + struct_len]
+        )
+        self._position += 2 + struct_len
+        self.structs.define(struct_id, struct_def)
+
+    def read_token(self) -> int:
+        token: int | None = self._peeked
+        if token is None:
+            token = self._resolve()
+        else:
+            self._peeked = None
+
+        if token == END:
+            raise IndexError(f'No tokens left, position: {hex(self._position)}')
+
+        # Remember where the value belonging to this token starts
+        self._payload_at = self._position if token in PAYLOAD_TOKENS else END
+
+        return token
+
+    def peek_token(self) -> int:
+        if self._peeked is None:
+            self._peeked = self._resolve()
+        return self._peeked
+
+    def at_end(self) -> bool:
+        return self.peek_token() == END
+
+    def read_int(self, format: Token, header: bool = False) -> int:
+        # Without a header, a byte read between values is a token, not data
+        if not header and self._position != self._payload_at:
+            if format != Token.Byte:
+                raise ValueError(
+                    f'Expected a value, found a token. Position: {hex(self._position)}'
+                )
+            return self.read_token()
+
+        return super().read_int(format, header)
+
+    def skip_run(self) -> bool:
+        # Arrays of fixed width structs are just their values, so jump over them
+        if self._peeked is not None or self._stack:
+            return False
+
+        data: Buffer = self.data
+        position: int = self._position
+
+        # Struct definitions still have to be read, for the arrays that use them
+        if position < self._length and data[position] == Token.Struct:
+            self._position += 1
+            self._read_struct()
+            return True
+
+        if position + 4 > self._length or data[position] != Token.Array:
+            return False
+
+        array_len: int = STRUCTS[Token.Short].unpack_from(data, position + 1)[0]
+        array_type: int = data[position + 3]
+        width: int | None = VALUE_SIZES.get(array_type)
+        if array_type in self.structs.definitions:
+            template: StructTemplate = self.structs[array_type]
+            width = template.width if template.balanced else None
+        if width is None:
+            return False
+
+        self._position = position + 4 + max(array_len, 0) * width
+        return True
+
+    def read_record_run(self, fields: str, count: int) -> LRRecordRun | None:
+        # Implied tokens are pending, so the records have to be read one by one
+        if self._peeked is not None or self._stack:
+            return None
+
+        data: Buffer = self.data
+        while self._position < self._length and data[self._position] == Token.Struct:
+            self._position += 1
+            self._read_struct()
+
+        position: int = self._position
+        if position >= self._length or data[position] != Token.Array:
+            return super().read_record_run(fields, count)
+
+        # An array of fixed width structs stores just the values of each record
+        array_len: int = STRUCTS[Token.Short].unpack_from(data, position + 1)[0]
+        array_type: int = data[position + 3]
+        if array_len <= 0 or array_type not in self.structs.definitions:
+            return None
+
+        template: StructTemplate = self.structs[array_type]
+        if (
+            template.width is None
+            or len(template.tokens) != len(fields)
+            or not all(
+                token in FIELD_TOKENS[kind]
+                for token, kind in zip(template.tokens, fields)
+            )
+        ):
+            return None
+
+        offsets: list[int] = []
+        offset: int = 0
+        for token in template.tokens:
+            offsets.append(offset)
+            offset += VALUE_SIZES[token]
+
+        count = min(count, array_len)
+        start: int = position + 4
+        self._position = start + count * template.width
+
+        # Leave the rest of the array for later reads
+        if array_len > count:
+            self._stack.append(
+                chain.from_iterable(repeat(template.tokens, array_len - count))
+            )
+
+        return LRRecordRun(
+            bytes(data[start : self._position]),
+            template.width,
+            offsets,
+            list(template.tokens),
+            count,
+        )
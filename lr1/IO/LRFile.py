@@ -1,27 +1,57 @@
-from typing import IO
+from typing import IO, TYPE_CHECKING, overload
+from collections.abc import Sequence
+import os
 import types
 
 from abc import ABC, abstractmethod
 import pathlib
 from io import FileIO
 
+from .LRBufferStream import LRBufferStream
+from .LRResourceCache import resource_cache
+
+if TYPE_CHECKING:
+    from .LROverlay import LROverlay
+
+
+def file_extension(name: str) -> str:
+    """The upper case extension of a file name, following pathlib's suffix rules"""
+
+    dot: int = name.rfind('.')
+    return name[dot:].upper() if 0 < dot < len(name) - 1 else ''
+
+
+def normalize_extension(extension: str) -> str:
+    """Turns 'mdb', '.mdb', or '.MDB' into '.MDB'"""
+
+    extension = extension.upper()
+    if extension and not extension.startswith('.'):
+        extension = '.' + extension
+    return extension
+
 
 class LRFile(ABC):
     """
     Base class for LR files.
 
+    The data stream is shared by everyone using the file.  Parsers read
+    through open() instead, which gives each reader its own position, so
+    any number of threads can parse files at the same time.
+
     Attributes:
         path (pathlib.Path): The file path
-        data (IO[bytes]): The binary content of the file
+        data (IO[bytes]): The binary content of the file, as one shared stream
         is_directory (bool): Whether this is a directory instead of a file
-        directory_contents (list[LRFile]): List of contained files, if a directory
+        directory_contents (Sequence[LRFile]): The contained files, if a directory
         parent (LRFile): The parent directory
+        overlay (LROverlay | None): The overlay the file was found through, if any
     """
 
+    overlay: 'LROverlay | None' = None
     path: pathlib.Path
     _data: IO[bytes] | None
     is_directory: bool
-    _directory_contents: list['LRFile'] | None
+    _directory_contents: Sequence['LRFile'] | None
     _parent: 'LRFile | None'
 
     @property
@@ -35,7 +65,17 @@ class LRFile(ABC):
         self.data.seek(0)
 
     @abstractmethod
-    def scan_directory(self) -> list['LRFile']:
+    def open(self) -> IO[bytes]:
+        """Return a new stream over the file data, with its own position"""
+        pass
+
+    def read_bytes(self) -> bytes:
+        """Return the whole file data"""
+        with self.open() as stream:
+            return stream.read()
+
+    @abstractmethod
+    def scan_directory(self) -> Sequence['LRFile']:
         """Scan the directory and return a list of contained files"""
         pass
 
@@ -44,14 +84,31 @@ class LRFile(ABC):
         """Get a file by name from the directory"""
         pass
 
+    def resolve(self, path: pathlib.PurePath) -> 'LRFile':
+        """Get a file this one depends on, through the overlay it came from if any"""
+
+        if self.overlay is not None:
+            return self.overlay.get_file(path)
+        return self.get_file(path)
+
     @property
-    def directory_contents(self) -> list['LRFile']:
+    def directory_contents(self) -> Sequence['LRFile']:
         if not self.is_directory:
             raise NotADirectoryError(f'{self.path} is not a directory')
         elif self._directory_contents is None:
             self._directory_contents = self.scan_directory()
         return self._directory_contents
 
+    def files_with_extension(self, extension: str) -> Sequence['LRFile']:
+        """The files in this directory with an extension like '.MDB', in any case"""
+
+        extension = normalize_extension(extension)
+        return [
+            file
+            for file in self.directory_contents
+            if file_extension(file.path.name) == extension
+        ]
+
     def __enter__(self) -> 'LRFile':
         return self
 
@@ -59,42 +116,59 @@ class LRFile(ABC):
         self, exc_type: type, exc_value: Exception, traceback: types.TracebackType
     ) -> None:
         """Close the file if it is open"""
-        if self._data is not None:
-            self._data.close()
-            self._data = None
+        self.release()
+
+    def release(self) -> None:
+        """Close the file data, it is opened again when next used"""
+        data, self._data = self._data, None
+        if data is not None:
+            data.close()
+            resource_cache.closed(self)
 
 
 class LRFileItem(LRFile):
     """
     A file or directory on the filesystem.
-    """
 
-    files_dict: dict[pathlib.Path, 'LRFileItem'] = {}
+    Open handles and looked up files are limited by the shared resource_cache.
+    """
 
     def __init__(
-        self, path: str | pathlib.Path, parent: 'LRFileItem | None' = None
+        self,
+        path: str | pathlib.Path,
+        parent: 'LRFileItem | None' = None,
+        entry: 'os.DirEntry[str] | None' = None,
     ) -> None:
-        # Make a real path object
-        if isinstance(path, str):
-            self.path = pathlib.Path(path).resolve()
+        if entry is not None:
+            # A directory listing already knows the file exists and its type
+            self.path = pathlib.Path(entry.path)
+            self.is_directory = entry.is_dir()
+
         else:
-            self.path = path.resolve()
+            # Make a real path object
+            if isinstance(path, str):
+                self.path = pathlib.Path(path).resolve()
+            else:
+                self.path = path.resolve()
 
-        # Check if the file exists
-        if not self.path.exists():
-            raise FileNotFoundError(f'File not found: {self.path}')
+            # Check if the file exists
+            if not self.path.exists():
+                raise FileNotFoundError(f'File not found: {self.path}')
 
-        # Check if the path is a directory
-        self.is_directory = self.path.is_dir()
+            # Check if the path is a directory
+            self.is_directory = self.path.is_dir()
 
         self._data = None
-        self._parent = None
+        self._parent = parent
         self._directory_contents = None
 
     @property
     def data(self) -> IO[bytes]:
         if self._data is None:
             self._data = FileIO(self.path, 'rb')
+            resource_cache.opened(self, 1, 0)
+        else:
+            resource_cache.used(self)
 
         return self._data
 
@@ -108,22 +182,151 @@ class LRFileItem(LRFile):
                 self._parent = self
         return self._parent
 
-    def scan_directory(self) -> list['LRFile']:
+    def scan_directory(self) -> 'LRDirectoryListing':
         """Scan the directory and update the contents"""
         if not self.is_directory:
             raise NotADirectoryError(f'{self.path} is not a directory')
-        return [LRFileItem(item, self) for item in self.path.iterdir()]
+        return LRDirectoryListing(self)
+
+    def open(self) -> IO[bytes]:
+        return FileIO(self.path, 'rb')
+
+    def read_bytes(self) -> bytes:
+        return self.path.read_bytes()
+
+    def files_with_extension(self, extension: str) -> Sequence['LRFile']:
+        listing = self.directory_contents
+        if isinstance(listing, LRDirectoryListing):
+            return listing.with_extension(extension)
+        return super().files_with_extension(extension)
 
     def get_file(self, path: pathlib.Path) -> 'LRFile':
         # Resolve the path
         path = path.resolve()
 
         # Check if the file is already loaded
-        if path in LRFileItem.files_dict:
-            return LRFileItem.files_dict[path]
+        file: LRFile | None = resource_cache.get_file(path)
+        if file is not None:
+            return file
 
         # Open the file
         new_file: 'LRFileItem' = LRFileItem(path)
-        LRFileItem.files_dict[path] = new_file
+        resource_cache.add_file(path, new_file)
 
         return new_file
+
+
+class LRMemoryFile(LRFile):
+    """
+    A file whose data was already read into memory
+
+    Each one has its own stream, so it can be parsed on any thread while
+    other copies of the same file are parsed elsewhere.  Everything except
+    the data comes from the original file.
+
+    Attributes:
+        source (LRFile): The file the data was read from
+        content (bytes): The file data
+    """
+
+    source: LRFile
+    content: bytes
+
+    def __init__(self, source: LRFile, content: bytes) -> None:
+        self.source = source
+        self.content = content
+        self.overlay = source.overlay
+        self.path = source.path
+        self.is_directory = False
+
+        self._data = None
+        self._parent = None
+        self._directory_contents = None
+
+    @property
+    def data(self) -> IO[bytes]:
+        # Memory that is already read does not count towards the resource cache
+        if self._data is None:
+            self._data = LRBufferStream(memoryview(self.content))
+        return self._data
+
+    @property
+    def parent(self) -> LRFile:
+        return self.source.parent
+
+    def open(self) -> IO[bytes]:
+        return LRBufferStream(memoryview(self.content))
+
+    def read_bytes(self) -> bytes:
+        return self.content
+
+    def scan_directory(self) -> Sequence[LRFile]:
+        raise NotADirectoryError(f'{self.path} is not a directory')
+
+    def get_file(self, path: pathlib.Path) -> LRFile:
+        return self.source.get_file(path)
+
+    def release(self) -> None:
+        data, self._data = self._data, None
+        if data is not None:
+            data.close()
+
+
+class LRDirectoryListing(Sequence[LRFile]):
+    """
+    The contents of a directory on disk, read with a single os.scandir pass
+
+    Only the names and the types cached by scandir are kept.  An LRFileItem
+    is made for an entry the first time it is accessed.
+
+    Attributes:
+        directory (LRFileItem): The listed directory
+        entries (list[os.DirEntry[str]]): The scandir entries
+        extensions (dict[str, list[int]]): Positions of the entries by upper case extension
+    """
+
+    directory: LRFileItem
+    entries: 'list[os.DirEntry[str]]'
+    extensions: dict[str, list[int]]
+    _items: dict[int, LRFileItem]
+
+    def __init__(self, directory: LRFileItem) -> None:
+        self.directory = directory
+        with os.scandir(directory.path) as scan:
+            self.entries = list(scan)
+        self._items = {}
+
+        self.extensions = {}
+        for i, entry in enumerate(self.entries):
+            self.extensions.setdefault(file_extension(entry.name), []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @overload
+    def __getitem__(self, index: int) -> LRFileItem: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[LRFileItem]: ...
+
+    def __getitem__(self, index: int | slice) -> LRFileItem | list[LRFileItem]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self.entries))[index]]
+
+        index = range(len(self.entries))[index]
+        item: LRFileItem | None = self._items.get(index)
+        if item is None:
+            entry: os.DirEntry[str] = self.entries[index]
+            item = self._items.setdefault(
+                index, LRFileItem(entry.path, self.directory, entry)
+            )
+        return item
+
+    def with_extension(self, extension: str) -> list[LRFileItem]:
+        """The files with an extension such as '.MDB', ignoring case"""
+
+        return [
+            self[i]
+            for i in self.extensions.get(normalize_extension(extension), [])
+            if not self.entries[i].is_dir()
+        ]
@@ -0,0 +1,267 @@
+from typing import IO
+from collections.abc import Iterable, Sequence
+import os
+import pathlib
+import threading
+
+from .LRFile import LRFile, LRFileItem, file_extension, normalize_extension
+from ..JAM import JAM, ROOT
+
+# Where a merged entry comes from: the source number and the JAM entry index
+# or the file on disk
+OverlayEntry = tuple[int, int | pathlib.Path]
+
+
+class LROverlayFile(LRFile):
+    """
+    A file found through an overlay, with its path in the overlay
+
+    The data comes from the file in the source, which is shared with
+    everyone using that source directly.  The path, parent, and dependencies
+    come from the overlay, so the source file itself is never changed.
+
+    Attributes:
+        source (LRFile): The file in the archive or directory that has it
+    """
+
+    source: LRFile
+
+    def __init__(self, overlay: 'LROverlay', key: str, source: LRFile) -> None:
+        self.overlay = overlay
+        self.path = pathlib.PurePosixPath(key)  # type: ignore[assignment]
+        self.source = source
+        self.is_directory = source.is_directory
+
+        self._data = None
+        self._parent = None
+        self._directory_contents = None
+
+    @property
+    def data(self) -> IO[bytes]:
+        return self.source.data
+
+    def reset(self) -> None:
+        self.source.reset()
+
+    def open(self) -> IO[bytes]:
+        return self.source.open()
+
+    def read_bytes(self) -> bytes:
+        return self.source.read_bytes()
+
+    @property
+    def parent(self) -> LRFile:
+        # The root of the overlay is its own parent, like the root of a disk
+        if self.path == self.path.parent:
+            return self
+
+        assert self.overlay is not None
+        return self.overlay.get_file(self.path.parent)
+
+    def scan_directory(self) -> Sequence[LRFile]:
+        assert self.overlay is not None
+        return self.overlay.list_directory(self.path)
+
+    def get_file(self, path: pathlib.Path) -> LRFile:
+        assert self.overlay is not None
+        return self.overlay.get_file(path)
+
+    def files_with_extension(self, extension: str) -> Sequence[LRFile]:
+        assert self.overlay is not None
+        return self.overlay.files_with_extension(self.path, extension)
+
+    def release(self) -> None:
+        self.source.release()
+
+
+class LROverlay:
+    """
+    Files from several JAMs and directories, merged into one tree
+
+    Sources are mounted in priority order, so a file in a later source hides
+    the file with the same path in the earlier ones.  Paths are matched
+    without regard to case, like the game does.  All sources are merged into
+    one hash index the first time a file is looked up, so every lookup is a
+    single dict access no matter how many sources are mounted.
+
+    Files found through the overlay are LROverlayFiles, with their path in
+    the overlay, and parsers resolve the files they depend on (like MDB
+    textures) through LRFile.resolve, so dependencies come from the overlay
+    too.  The index is only changed while
+    holding a lock, so one overlay can be shared by many threads.
+
+    Attributes:
+        sources (list[JAM | pathlib.Path]): The mounted archives and directories, lowest priority first
+        index (dict[str, OverlayEntry] | None): Where each file comes from, by normalized path
+        children (dict[str, dict[str, str]]): Normalized paths by name for each directory
+    """
+
+    sources: list[JAM | pathlib.Path]
+    index: dict[str, OverlayEntry] | None
+    children: dict[str, dict[str, str]]
+    _files: dict[str, LRFile]
+    _lock: threading.RLock
+
+    def __init__(self, sources: Iterable[JAM | str | pathlib.Path] = ()) -> None:
+        self.sources = []
+        self.index = None
+        self.children = {}
+        self._files = {}
+        self._lock = threading.RLock()
+
+        for source in sources:
+            self.mount(source)
+
+    def mount(self, source: JAM | str | pathlib.Path) -> None:
+        """Adds an archive or directory above the ones mounted so far"""
+
+        if isinstance(source, str):
+            source = pathlib.Path(source)
+        if isinstance(source, pathlib.Path) and source.suffix.upper() == '.JAM':
+            source = JAM(str(source), memory_map=True)
+
+        with self._lock:
+            self.sources.append(source)
+
+            # Once the index exists, keep it up to date instead of building it again
+            if self.index is not None:
+                self.add_source(len(self.sources) - 1)
+
+    def key(self, path: str | pathlib.PurePath) -> str:
+        """Normalizes a path for the index"""
+
+        names: list[str] = [
+            name.upper()
+            for name in str(path).replace('\\', '/').split('/')
+            if name not in ('', '.')
+        ]
+        return '/' + '/'.join(names)
+
+    def build_index(self) -> dict[str, OverlayEntry]:
+        """Merges every source into the index"""
+
+        # Other threads wait here until every source is in the index
+        with self._lock:
+            if self.index is None:
+                self.index = {'/': (-1, ROOT)}
+                self.children = {'/': {}}
+                for number in range(len(self.sources)):
+                    self.add_source(number)
+
+            return self.index
+
+    def add_entry(self, key: str, entry: OverlayEntry, directory: bool) -> None:
+        """Adds or replaces an entry and links it to its parent directory"""
+
+        index: dict[str, OverlayEntry] = self.build_index()
+        if key not in index:
+            parent, _, name = key.rpartition('/')
+            self.children.setdefault(parent or '/', {})[name] = key
+        index[key] = entry
+        self._files.pop(key, None)
+
+        if directory:
+            self.children.setdefault(key, {})
+
+    def add_source(self, number: int) -> None:
+        """Adds the files of one source to the index"""
+
+        source: JAM | pathlib.Path = self.sources[number]
+
+        if isinstance(source, JAM):
+            source.walk()
+            for index, name in enumerate(source.names):
+                if index != ROOT:
+                    self.add_entry(
+                        self.key(name),
+                        (number, index),
+                        source.children[index] is not None,
+                    )
+            return
+
+        for path, directories, files in os.walk(source):
+            directories.sort()
+            relative: str = pathlib.Path(path).relative_to(source).as_posix()
+            for name in directories:
+                self.add_entry(
+                    self.key(f'{relative}/{name}'),
+                    (number, pathlib.Path(path, name)),
+                    True,
+                )
+            for name in sorted(files):
+                self.add_entry(
+                    self.key(f'{relative}/{name}'),
+                    (number, pathlib.Path(path, name)),
+                    False,
+                )
+
+    def __contains__(self, path: str | pathlib.PurePath) -> bool:
+        return self.key(path) in self.build_index()
+
+    def get_file(self, path: str | pathlib.PurePath) -> LRFile:
+        """Finds a file or directory in the highest priority source that has it"""
+
+        key: str = self.key(path)
+        file: LRFile | None = self._files.get(key)
+        if file is not None:
+            return file
+
+        entry: OverlayEntry | None = self.build_index().get(key)
+        if entry is None or (entry[0] < 0 and not self.sources):
+            raise FileNotFoundError(f'File: {path} not in any mounted source')
+
+        number, location = entry
+        if number < 0:
+            # The root of the overlay stands on the root of the top source
+            number = len(self.sources) - 1
+            top: JAM | pathlib.Path = self.sources[number]
+            location = ROOT if isinstance(top, JAM) else top
+        source: JAM | pathlib.Path = self.sources[number]
+        file = LROverlayFile(
+            self,
+            key,
+            source.item(location)
+            if isinstance(source, JAM) and isinstance(location, int)
+            else LRFileItem(location),
+        )
+
+        return self._files.setdefault(key, file)
+
+    def extract_file(self, file_path: str) -> LRFile:
+        """Same as get_file, so an overlay can stand in for a JAM"""
+
+        return self.get_file(file_path)
+
+    def list_directory(self, path: str | pathlib.PurePath) -> list[LRFile]:
+        """Returns the merged contents of a directory from every source"""
+
+        self.build_index()
+        children: dict[str, str] | None = self.children.get(self.key(path))
+        if children is None:
+            raise NotADirectoryError(f'{path} is not a directory in any source')
+        return [self.get_file(key) for key in children.values()]
+
+    def files_with_extension(
+        self, path: str | pathlib.PurePath, extension: str
+    ) -> list[LRFile]:
+        """Returns the merged files of a directory with an extension like '.MDB'"""
+
+        self.build_index()
+        children: dict[str, str] | None = self.children.get(self.key(path))
+        if children is None:
+            raise NotADirectoryError(f'{path} is not a directory in any source')
+
+        # Names are already upper case, and directories have their own children
+        extension = normalize_extension(extension)
+        return [
+            self.get_file(key)
+            for name, key in children.items()
+            if file_extension(name) == extension and key not in self.children
+        ]
+
+    def close(self) -> None:
+        """Close the mounted archives"""
+
+        for source in self.sources:
+            if isinstance(source, JAM):
+                source.close()
@@ -0,0 +1,133 @@
+from typing import Any
+from array import array
+import struct
+import sys
+
+from ..Utils.Token import Token
+
+# Array typecodes matching the value after each token
+TYPECODES: dict[int, str] = {
+    Token.Float: 'f',
+    Token.Int32: 'i',
+    Token.SByte: 'b',
+    Token.Byte: 'B',
+    Token.Short: 'h',
+    Token.UShort: 'H',
+}
+
+# Unpackers for whole records, by layout
+ROW_STRUCTS: dict[tuple[int, tuple[int, ...], tuple[int, ...]], struct.Struct] = {}
+
+
+class LRRecordRun:
+    """
+    Consecutive records that share one binary layout
+
+    The values of every record sit at the same offsets, so a field can be
+    pulled out of all records at once with strided slices instead of being
+    read record by record.
+
+    Attributes:
+        buffer (bytes): The records, one after another
+        stride (int): Size of one record in bytes
+        offsets (list[int]): Where each value starts within a record
+        tokens (list[int]): The token that describes each value
+        count (int): Number of records
+    """
+
+    buffer: bytes
+    stride: int
+    offsets: list[int]
+    tokens: list[int]
+    count: int
+
+    def __init__(
+        self,
+        buffer: bytes,
+        stride: int,
+        offsets: list[int],
+        tokens: list[int],
+        count: int,
+    ) -> None:
+        self.buffer = buffer
+        self.stride = stride
+        self.offsets = offsets
+        self.tokens = tokens
+        self.count = count
+
+    def rows(self) -> list[tuple[Any, ...]]:
+        """Returns the values of every record"""
+
+        key: tuple[int, tuple[int, ...], tuple[int, ...]] = (
+            self.stride,
+            tuple(self.offsets),
+            tuple(self.tokens),
+        )
+        unpacker: struct.Struct | None = ROW_STRUCTS.get(key)
+
+        if unpacker is None:
+            # Skip the token bytes between the values
+            fmt: str = '<'
+            position: int = 0
+            for offset, token in zip(self.offsets, self.tokens):
+                fmt += 'x' * (offset - position) + TYPECODES[token]
+                position = offset + struct.calcsize(TYPECODES[token])
+            fmt += 'x' * (self.stride - position)
+
+            unpacker = struct.Struct(fmt)
+            ROW_STRUCTS[key] = unpacker
+
+        return list(unpacker.iter_unpack(self.buffer))
+
+    def gather(self, offset: int, size: int) -> bytes | bytearray:
+        """Collects size bytes at offset from every record into one buffer"""
+
+        if offset == 0 and size == self.stride:
+            return self.buffer
+        if size == 1:
+            return self.buffer[offset :: self.stride]
+
+        output: bytearray = bytearray(size * self.count)
+        for i in range(size):
+            output[i::size] = self.buffer[offset + i :: self.stride]
+        return output
+
+    def values(self, token: int, data: bytes | bytearray) -> array:
+        """Converts gathered bytes to an array of the token's type"""
+
+        values: array = array(TYPECODES[token])
+        values.frombytes(data)
+        if sys.byteorder == 'big' and values.itemsize > 1:
+            values.byteswap()
+        return values
+
+    def column(self, index: int) -> array:
+        """Returns one field of every record"""
+
+        token: int = self.tokens[index]
+        size: int = array(TYPECODES[token]).itemsize
+        return self.values(token, self.gather(self.offsets[index], size))
+
+    def group(self, first: int, width: int, typecode: str) -> array:
+        """Returns width neighbouring fields of every record, interleaved"""
+
+        token: int = self.tokens[first]
+        size: int = array(TYPECODES[token]).itemsize
+        offset: int = self.offsets[first]
+
+        # Fields of one type stored back to back can be copied as one span
+        if all(
+            self.tokens[first + i] == token
+            and self.offsets[first + i] == offset + i * size
+            for i in range(width)
+        ):
+            output: array = self.values(token, self.gather(offset, width * size))
+            return output if output.typecode == typecode else array(typecode, output)
+
+        output = array(typecode, bytes(width * self.count * array(typecode).itemsize))
+        for i in range(width):
+            column: array = self.column(first + i)
+            if column.typecode != typecode:
+                column = array(typecode, column)
+            output[i::width] = column
+        return output
@@ -0,0 +1,175 @@
+from typing import TYPE_CHECKING
+from collections import OrderedDict
+from collections.abc import Hashable
+import threading
+
+if TYPE_CHECKING:
+    from .LRFile import LRFile
+
+
+class LRResourceCache:
+    """
+    Least recently used cache of file handles, file data, and looked up files
+
+    Every LRFile reports here when it opens its data and whenever the data is
+    used again.  When the open handles or the bytes held by open data go over
+    their limits, the data of the least recently used files is released.
+    Files opened again after that simply reopen their data.  The cache is
+    shared by every thread, so each change happens while holding a lock.
+
+    Attributes:
+        max_handles (int): Operating system file handles to keep open at most
+        max_bytes (int): Bytes of file data to keep open at most
+        max_files (int): Looked up files to remember at most
+        handles (int): Open file handles
+        resident_bytes (int): Bytes held by open file data
+        hits (int): Uses of data or lookups that were already cached
+        misses (int): Data that had to be opened or lookups that were not cached
+        evictions (int): Data and lookups dropped to stay within the limits
+        open_files (OrderedDict[LRFile, tuple[int, int]]): Handles and bytes of each file with open data, least recently used first
+        files (OrderedDict[Hashable, LRFile]): Looked up files by key, least recently used first
+    """
+
+    max_handles: int
+    max_bytes: int
+    max_files: int
+    handles: int
+    resident_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+    open_files: 'OrderedDict[LRFile, tuple[int, int]]'
+    files: 'OrderedDict[Hashable, LRFile]'
+    _lock: threading.RLock
+
+    def __init__(
+        self,
+        max_handles: int = 64,
+        max_bytes: int = 0x4000000,
+        max_files: int = 4096,
+    ) -> None:
+        self.max_handles = max_handles
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+
+        self.handles = 0
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.open_files = OrderedDict()
+        self.files = OrderedDict()
+
+        # Releasing data reports back here, so the lock must be reentrant
+        self._lock = threading.RLock()
+
+    def configure(
+        self,
+        max_handles: int | None = None,
+        max_bytes: int | None = None,
+        max_files: int | None = None,
+    ) -> None:
+        """Change the limits, evicting whatever no longer fits"""
+
+        with self._lock:
+            if max_handles is not None:
+                self.max_handles = max_handles
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            if max_files is not None:
+                self.max_files = max_files
+
+            self.trim()
+
+    def opened(self, file: 'LRFile', handles: int, size: int) -> None:
+        """Record that a file opened its data"""
+
+        with self._lock:
+            self.misses += 1
+            self.closed(file)
+            self.open_files[file] = (handles, size)
+            self.handles += handles
+            self.resident_bytes += size
+
+            self.trim(file)
+
+    def used(self, file: 'LRFile') -> None:
+        """Record that a file's open data was used again"""
+
+        with self._lock:
+            if file in self.open_files:
+                self.hits += 1
+                self.open_files.move_to_end(file)
+
+    def closed(self, file: 'LRFile') -> None:
+        """Record that a file released its data"""
+
+        with self._lock:
+            handles, size = self.open_files.pop(file, (0, 0))
+            self.handles -= handles
+            self.resident_bytes -= size
+
+    def trim(self, keep: 'LRFile | None' = None) -> None:
+        """Release the least recently used data until the limits are met"""
+
+        with self._lock:
+            while (
+                self.handles > self.max_handles or self.resident_bytes > self.max_bytes
+            ) and self.open_files:
+                oldest: LRFile = next(iter(self.open_files))
+
+                # The file that was just opened is needed, even if it is too big
+                if oldest is keep:
+                    break
+
+                self.evictions += 1
+                oldest.release()
+
+                # Another thread may be releasing it too, and waiting to report
+                self.closed(oldest)
+
+            while len(self.files) > self.max_files:
+                self.evictions += 1
+                self.files.popitem(last=False)
+
+    def get_file(self, key: Hashable) -> 'LRFile | None':
+        """Returns a previously looked up file, or None"""
+
+        with self._lock:
+            file: LRFile | None = self.files.get(key)
+            if file is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.files.move_to_end(key)
+            return file
+
+    def add_file(self, key: Hashable, file: 'LRFile') -> None:
+        """Remember a looked up file"""
+
+        with self._lock:
+            self.files[key] = file
+            self.files.move_to_end(key)
+            self.trim()
+
+    def clear(self) -> None:
+        """Release all open data and forget all looked up files"""
+
+        with self._lock:
+            for file in list(self.open_files):
+                file.release()
+            self.files.clear()
+
+    def __str__(self) -> str:
+        return (
+            f'Handles: {self.handles}/{self.max_handles}, '
+            f'Bytes: {self.resident_bytes}/{self.max_bytes}, '
+            f'Files: {len(self.files)}/{self.max_files}, '
+            f'Hits: {self.hits}, Misses: {self.misses}, Evictions: {self.evictions}'
+        )
+
+
+# Shared by every LRFile
+resource_cache: LRResourceCache = LRResourceCache()
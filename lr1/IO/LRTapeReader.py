@@ -0,0 +1,200 @@
+from typing import Any
+from array import array
+
+from .LRBinaryReader import (
+    LRBinaryReader,
+    BLOCK_TOKENS,
+    COLUMN_TYPECODES,
+    FIELD_TOKENS,
+    FORMAT,
+    TYPED_INT_TOKENS,
+)
+from .LRRecordRun import LRRecordRun
+from .LRTokenTape import LRTokenTape, NO_MATCH
+from ..Utils.Token import Token
+
+# Marks that the last token read has no value left to read
+NO_VALUE: int = -1
+
+# The tokens each kind of record field accepts, for bytes.translate
+FIELD_BYTES: dict[str, bytes] = {
+    kind: bytes(sorted(tokens)) for kind, tokens in FIELD_TOKENS.items()
+}
+
+
+class LRTapeReader(LRBinaryReader):
+    """
+    Reads a token tape with the same interface as the binary readers
+
+    The position counts tokens instead of bytes.  Values are looked up in the
+    tape instead of being unpacked, groups are skipped by jumping to their
+    matching bracket, and runs of records are sliced out of the values of
+    the tape in one go.
+
+    Attributes:
+        tape (LRTokenTape): The tape being read
+    """
+
+    tape: LRTokenTape
+    _value: int
+
+    RECORD_RUNS: bool = False
+
+    def __init__(self, tape: LRTokenTape) -> None:
+        super().__init__(tape.tokens)
+        self.tape = tape
+        self._value = NO_VALUE
+
+    def read_token(self) -> int:
+        position: int = self._position
+        if position >= self._length:
+            raise IndexError(f'No tokens left, position: {hex(position)}')
+
+        token: int = self.data[position]
+        self._position = position + 1
+
+        # Remember the token whose value is read next
+        self._value = position if token in FORMAT or token == Token.String else NO_VALUE
+
+        return token
+
+    def take_value(self) -> int:
+        """Returns the position of the token whose value is read next"""
+
+        position: int = self._value
+        if position == NO_VALUE:
+            raise ValueError(
+                f'Expected a value, found a token. Position: {hex(self._position)}'
+            )
+
+        self._value = NO_VALUE
+        return position
+
+    def read_int(self, format: Token, header: bool = False) -> int:
+        if header:
+            self.expect(format)
+
+        # Without a header, a byte read between values is a token, not data
+        elif self._value == NO_VALUE and format == Token.Byte:
+            return self.read_token()
+
+        return int(self.tape.numbers[self.tape.starts[self.take_value()]])
+
+    def read_float(self, header: bool = False) -> float:
+        if header:
+            self.expect(Token.Float)
+
+        return self.tape.numbers[self.tape.starts[self.take_value()]]
+
+    def read_typed_int(self) -> int:
+        token: int = self.read_token()
+        if token not in TYPED_INT_TOKENS:
+            raise ValueError(
+                f'Invalid Token.  Expected {list(TYPED_INT_TOKENS)}.  Got {token}'
+            )
+
+        return int(self.tape.numbers[self.tape.starts[self.take_value()]])
+
+    def read_string(self, header: bool = False) -> str:
+        if header:
+            self.expect(Token.String)
+
+        return self.tape.strings[self.take_value()]
+
+    def skip_value(self, token: int) -> None:
+        self._value = NO_VALUE
+
+    def skip_block(self) -> None:
+        # Groups end at their matching bracket, so each one is a single jump
+        data: bytearray = self.data  # type: ignore[assignment]
+        matches: array = self.tape.matches
+        position: int = self._position
+        while position < self._length and data[position] in BLOCK_TOKENS:
+            match: int = matches[position]
+            position = position + 1 if match == NO_MATCH else match + 1
+
+        self._position = position
+        self._value = NO_VALUE
+
+    def record_values(self, fields: str, count: int) -> array | None:
+        """
+        Moves past count records, returning their values as one slice
+
+        Every field has exactly one value, so once each column of tokens is
+        checked, the values of all records are the values between the first
+        and the last token.  Returns None without moving if a token doesn't
+        fit its field.
+        """
+
+        start: int = self._position
+        stride: int = len(fields)
+        end: int = start + stride * count
+        if end > self._length:
+            return None
+
+        # Deleting the accepted tokens from each column must leave nothing
+        data: bytearray = self.data  # type: ignore[assignment]
+        for i, kind in enumerate(fields):
+            if data[start + i : end : stride].translate(None, FIELD_BYTES[kind]):
+                return None
+
+        self._position = end
+        self._value = NO_VALUE
+        return self.tape.values(start, end)
+
+    def checked_values(self, fields: str, count: int) -> array:
+        """Same as record_values, but raises if the records don't fit the fields"""
+
+        values: array | None = self.record_values(fields, count)
+        if values is None:
+            raise ValueError(
+                f'Invalid records: {fields!r}, position: {hex(self._position)}'
+            )
+        return values
+
+    def read_record(self, fields: str) -> tuple[Any, ...]:
+        values: array = self.checked_values(fields, 1)
+
+        return tuple(
+            value if kind == 'f' else int(value) for value, kind in zip(values, fields)
+        )
+
+    def read_records(self, fields: str, count: int) -> list[tuple[Any, ...]]:
+        values: array = self.checked_values(fields, count)
+
+        stride: int = len(fields)
+        columns: list[Any] = [
+            values[i::stride] if kind == 'f' else map(int, values[i::stride])
+            for i, kind in enumerate(fields)
+        ]
+        return list(zip(*columns))
+
+    def skip_records(self, fields: str, count: int) -> None:
+        self.checked_values(fields, count)
+
+    def read_record_run(self, fields: str, count: int) -> LRRecordRun | None:
+        # The values are already unpacked, so there are no bytes to share
+        return None
+
+    def read_columns(self, layout: tuple[str, ...], count: int) -> list[array]:
+        fields: str = ''.join(layout)
+        values: array = self.checked_values(fields, count)
+
+        # Interleave the fields of each group into one flat array
+        stride: int = len(fields)
+        columns: list[array] = []
+        first: int = 0
+        for group in layout:
+            typecode: str = COLUMN_TYPECODES[group[0]]
+            column: array = array(typecode, [0]) * (count * len(group))
+            for i in range(len(group)):
+                field: array = values[first + i :: stride]
+                column[i :: len(group)] = (
+                    array(typecode, field)
+                    if typecode == 'f'
+                    else array(typecode, map(int, field))
+                )
+            columns.append(column)
+            first += len(group)
+
+        return columns
@@ -0,0 +1,208 @@
+from typing import IO
+from collections.abc import Iterator
+from itertools import chain, repeat
+from array import array
+
+from .LRBinaryReader import LRBinaryReader, Buffer, STRUCTS
+from .LRRecordRun import LRRecordRun
+from ..Utils.Token import Token
+from ..Utils.StructTemplate import StructTable, StructTemplate, VALUE_SIZES
+
+# Marks tokens in matches that are not brackets
+NO_MATCH: int = -1
+
+
+class LRTokenTape:
+    """
+    A whole token stream, decompressed into flat arrays indexed by token
+
+    Every token, bracket, and raw ID byte takes one byte of tokens.  The
+    numeric values are kept in one array in stream order, and starts gives
+    the index of the value of each token, or of the next value for tokens
+    without one.  So numbers[starts[a] : starts[b]] holds every value
+    between tokens a and b, and brackets know where their match is, which
+    makes moving past any group a single jump.
+
+    Arrays of fixed width structs are added a whole array at a time, without
+    looking at each token.
+
+    Attributes:
+        tokens (bytearray): The token of each position, with arrays and structs expanded
+        numbers (array): Every Float and integer value, in stream order
+        starts (array): Index in numbers of the value at or after each token
+        matches (array): Position of the matching bracket for brackets, NO_MATCH for the rest
+        strings (dict[int, str]): The value of each String token, by position
+    """
+
+    tokens: bytearray
+    numbers: array
+    starts: array
+    matches: array
+    strings: dict[int, str]
+
+    def __init__(self, file: IO[bytes] | Buffer) -> None:
+        self.tokens = bytearray()
+        self.numbers = array('d')
+        self.starts = array('i')
+        self.matches = array('i')
+        self.strings = {}
+
+        self.build(LRBinaryReader(file))
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def build(self, reader: LRBinaryReader) -> None:
+        """Expands the compressed token stream onto the tape"""
+
+        data: Buffer = reader.data
+        length: int = len(data)
+        position: int = 0
+
+        structs: StructTable = StructTable()
+        definitions: dict[int, tuple[int, ...]] = structs.definitions
+        stack: list[Iterator[int]] = []
+        brackets: list[int] = []
+
+        tokens: bytearray = self.tokens
+        numbers: array = self.numbers
+        starts: array = self.starts
+        matches: array = self.matches
+
+        while True:
+            if stack:
+                token: int | None = next(stack[-1], None)
+                if token is None:
+                    stack.pop()
+                    continue
+
+            elif position < length:
+                token = data[position]
+                position += 1
+
+            else:
+                break
+
+            if token == Token.Array:
+                array_len: int = STRUCTS[Token.Short].unpack_from(data, position)[0]
+                array_type: int = data[position + 2]
+                position += 3
+
+                template: StructTemplate | None = (
+                    structs[array_type]
+                    if array_type in definitions
+                    else StructTemplate((array_type,), frozenset())
+                    if array_type in VALUE_SIZES
+                    else None
+                )
+                if template is not None and self.bulk(template):
+                    position = self.add_array(data, position, template, array_len)
+                elif array_type in definitions:
+                    stack.append(
+                        chain.from_iterable(
+                            repeat(structs[array_type].tokens, array_len)
+                        )
+                    )
+                else:
+                    stack.append(repeat(array_type, array_len))
+
+            elif token == Token.Struct:
+                struct_id: int = data[position]
+                struct_len: int = data[position + 1]
+                structs.define(
+                    struct_id, tuple(data[position + 2 : position + 2 + struct_len])
+                )
+                position += 2 + struct_len
+
+            elif token in definitions:
+                stack.append(iter(structs[token].tokens))
+
+            else:
+                index: int = len(tokens)
+                tokens.append(token)
+                starts.append(len(numbers))
+                matches.append(NO_MATCH)
+
+                if token == Token.String:
+                    end: int = reader.find_null(position)
+                    self.strings[index] = str(data[position:end], 'latin-1')
+                    position = end + 1
+
+                elif token in STRUCTS:
+                    unpacker = STRUCTS[token]
+                    numbers.append(unpacker.unpack_from(data, position)[0])
+                    position += unpacker.size
+
+                elif token == Token.LeftCurly or token == Token.LeftBracket:
+                    brackets.append(index)
+
+                elif token == Token.RightCurly or token == Token.RightBracket:
+                    if not brackets:
+                        raise ValueError(
+                            f'Unmatched bracket at position: {hex(position)}'
+                        )
+                    opening: int = brackets.pop()
+                    matches[opening] = index
+                    matches[index] = opening
+
+        if brackets:
+            raise ValueError(f'Unclosed bracket at token: {brackets[-1]}')
+
+    def bulk(self, template: StructTemplate) -> bool:
+        """Checks whether an array of the struct can be added in one go"""
+
+        return bool(template.tokens) and all(
+            token in VALUE_SIZES for token in template.tokens
+        )
+
+    def add_array(
+        self, data: Buffer, position: int, template: StructTemplate, array_len: int
+    ) -> int:
+        """Adds an array of structs that hold only values in one go"""
+
+        assert template.width is not None
+
+        array_len = max(array_len, 0)
+        end: int = position + template.width * array_len
+        if end > len(data):
+            raise ValueError(f'Array runs past the end of the data: {hex(position)}')
+
+        stride: int = len(template.tokens)
+        count: int = array_len * stride
+        base: int = len(self.numbers)
+
+        offsets: list[int] = []
+        offset: int = 0
+        for token in template.tokens:
+            offsets.append(offset)
+            offset += VALUE_SIZES[token]
+
+        # Copy the values a column at a time instead of unpacking each record
+        run: LRRecordRun = LRRecordRun(
+            bytes(data[position:end]),
+            template.width,
+            offsets,
+            list(template.tokens),
+            array_len,
+        )
+
+        self.tokens += bytes(template.tokens) * array_len
+        self.numbers.extend(run.group(0, stride, 'd'))
+        self.matches.extend(array('i', [NO_MATCH]) * count)
+
+        # Every token has a value, so the starts just count up
+        self.starts.extend(array('i', range(base, base + count)))
+
+        return end
+
+    def values(self, start: int, end: int) -> array:
+        """Every numeric value between two positions, as one slice"""
+
+        return self.numbers[self.value_index(start) : self.value_index(end)]
+
+    def value_index(self, position: int) -> int:
+        """Index in numbers of the first value at or after a position"""
+
+        if position < len(self.starts):
+            return self.starts[position]
+        return len(self.numbers)
@@ -1,64 +1,131 @@
-from typing import IO
-from io import BytesIO
+from typing import IO, overload
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from array import array
+import bisect
+import fnmatch
+import hashlib
+import mmap
 import os
 import struct
+import sys
+import threading
 import pathlib
+import types
 
-from .IO.LRFile import LRFile
+from .IO.LRFile import LRFile, file_extension, normalize_extension
+from .IO.LRBufferStream import LRBufferStream
+from .IO.LRResourceCache import resource_cache
+
+# Directory table records: 12 byte name, pointer, size for files
+FILE_ENTRY: struct.Struct = struct.Struct('<12sii')
+DIRECTORY_ENTRY: struct.Struct = struct.Struct('<12si')
+
+# Index of the root directory in the entry table
+ROOT: int = 0
+
+# Characters that make a path component a glob pattern
+GLOB_CHARACTERS: frozenset[str] = frozenset('*?[')
+
+# Files written by one extraction task, to keep the per-file overhead low
+EXTRACT_BATCH_FILES: int = 64
+
+# Sidecar index cache: magic, version, archive size, mtime, header hash, and
+# the number of entries, files, and directories
+INDEX_HEADER: struct.Struct = struct.Struct('<4sIQq16sIII')
+INDEX_MAGIC: bytes = b'LJIX'
+INDEX_VERSION: int = 1
+
+# How much of the archive is hashed to recognize it
+INDEX_HASHED_BYTES: int = 0x10000
+
+
+def valid_name(name: str) -> bool:
+    """Checks that an entry name is a single name that can't leave its directory"""
+
+    return name not in ('', '.', '..') and '/' not in name and '\\' not in name
 
 
 class JamItem(LRFile):
     """
     A file or directory in the JAM file.
 
+    Items are created on demand from the JAM's entry table, so most of the
+    archive never needs an object at all.
+
     Attributes:
-        path (pathlib.Path): The file path within the JAM file
-        data (BytesIO): The binary content of the file
+        path (pathlib.PurePosixPath): The virtual file path within the JAM file
+        data (LRBufferStream): The binary content of the file, shared with the JAM
         is_directory (bool): Whether this is a directory instead of a file
-        directory_contents (list[JamItem]): List of contained items, if a directory
+        directory_contents (JamItemList): The contained items, if a directory
         parent (JamItem): The parent directory
         jam (JAM): The containing JAM file
+        index (int): The position of the item in the JAM's entry table
         pointer(int): The index of the first byte of the file
         size (int): The size of the file in bytes
     """
 
     jam: 'JAM'
+    index: int
     pointer: int
     size: int
+    _path: pathlib.PurePosixPath | None
 
-    def __init__(
-        self, path: str, jam: 'JAM', pointer: int, size: int, directory: bool = False
-    ) -> None:
-        self.path = pathlib.Path(path).resolve()
-        self._data = None
+    def __init__(self, jam: 'JAM', index: int) -> None:
         self.jam = jam
-        self.pointer = pointer
-        self.size = size
-        self.is_directory = directory
-        self._directory_contents = []
+        self.index = index
+        self.pointer = jam.pointers[index]
+        self.size = jam.sizes[index]
+        self.is_directory = jam.children[index] is not None
+        self._path = None
+        self._data = None
+        self._parent = None
+        self._directory_contents = None
+
+    @property
+    def path(self) -> pathlib.PurePosixPath:
+        if self._path is None:
+            self._path = pathlib.PurePosixPath(self.jam.names[self.index])
+        return self._path
 
     @property
     def data(self) -> IO[bytes]:
         if self._data is None:
-            self._data = BytesIO(self.jam.data[self.pointer : self.pointer + self.size])
+            self._data = self.open()
+
+            # The stream pins the archive data it refers to
+            resource_cache.opened(self, 0, self.size)
+        else:
+            resource_cache.used(self)
 
         return self._data
 
     @property
     def parent(self) -> LRFile:
-        if self._parent is not None:
-            return self._parent
-        else:
-            raise FileNotFoundError(f'Parent directory not assigned for {self.path}')
+        if self._parent is None:
+            self._parent = self.jam.item(self.jam.parents[self.index])
+        return self._parent
+
+    @property
+    def directory_contents(self) -> 'JamItemList':
+        # The listing is only decoded from the archive the first time it is needed
+        if self._directory_contents is None:
+            self._directory_contents = self.jam.contents(self.index)
+        return self._directory_contents
+
+    def scan_directory(self) -> 'JamItemList':
+        return self.jam.contents(self.index)
+
+    def files_with_extension(self, extension: str) -> 'JamItemList':
+        return self.directory_contents.with_extension(extension)
 
-    @parent.setter
-    def parent(self, parent: LRFile) -> None:
-        self._parent = parent
+    def open(self) -> LRBufferStream:
+        return LRBufferStream(self.jam.view[self.pointer : self.pointer + self.size])
 
-    def scan_directory(self) -> list[LRFile]:
-        return []
+    def read_bytes(self) -> bytes:
+        return bytes(self.jam.view[self.pointer : self.pointer + self.size])
 
-    def get_file(self, path: pathlib.Path) -> LRFile:
+    def get_file(self, path: pathlib.PurePath) -> LRFile:
         return self.jam.extract_file(str(path))
 
     def __str__(self) -> str:
@@ -71,151 +138,673 @@ class JamItem(LRFile):
         )
 
 
+class JamItemList(Sequence[JamItem]):
+    """
+    The items for a list of entry table indices, created as they are accessed
+
+    Attributes:
+        jam (JAM): The containing JAM file
+        indices (array[int]): Entry table indices of the items
+    """
+
+    jam: 'JAM'
+    indices: array
+
+    def __init__(self, jam: 'JAM', indices: array) -> None:
+        self.jam = jam
+        self.indices = indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    @overload
+    def __getitem__(self, index: int) -> JamItem: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[JamItem]: ...
+
+    def __getitem__(self, index: int | slice) -> JamItem | list[JamItem]:
+        if isinstance(index, slice):
+            return [self.jam.item(i) for i in self.indices[index]]
+        return self.jam.item(self.indices[index])
+
+    def __iter__(self) -> Iterator[JamItem]:
+        return map(self.jam.item, self.indices)
+
+    def with_extension(self, extension: str) -> 'JamItemList':
+        """The files with an extension such as '.MDB', ignoring case"""
+
+        extension = normalize_extension(extension)
+        names: list[str] = self.jam.names
+        children: list[dict[str, int] | None] = self.jam.children
+        return JamItemList(
+            self.jam,
+            array(
+                'q',
+                (
+                    index
+                    for index in self.indices
+                    if children[index] is None
+                    and file_extension(names[index].rpartition('/')[2]) == extension
+                ),
+            ),
+        )
+
+
 class JAM:
     """
     A JAM file
 
+    The directory tables are read into a flat entry table of virtual paths,
+    pointers, and sizes.  Each directory has a dict of its children by name,
+    so paths are looked up without touching the real filesystem.  In lazy
+    mode a directory's table is only read when it is listed or a path is
+    resolved through it, and the entry table grows as directories are visited.
+
     Attributes:
         path (pathlib.Path): Filepath of the JAM
-        directories (list[JamItem]): List of directories within the JAM
-        files (list[JamItem]): List of files within the JAM
-        file_map (dict[str, JamItem]): Dictionary of contained files and directories for access by internal path strings
+        directories (JamItemList): List of directories within the JAM
+        files (JamItemList): List of files within the JAM
         root (JamItem): The internal root directory
-        JAM_file (bytes): The binary data of the file
+        data (bytes | mmap.mmap): The binary data of the file, or a read-only mapping of it
+        view (memoryview): The binary data, for slicing file contents without copying
+        memory_map (bool): Whether the file is memory mapped instead of read into memory
+        index_cache (pathlib.Path | None): Where the entry table is cached between runs
+        lazy (bool): Whether directories are only read when they are visited
+        names (list[str]): Virtual path of each entry
+        pointers (array[int]): Position of each entry's data or directory table
+        sizes (array[int]): Size of each entry in bytes, 0 for directories
+        parents (array[int]): Index of the directory holding each entry
+        children (list[dict[str, int] | None]): Entry indices by name for each directory, None for files
+        pending (set[int]): Directories whose tables have not been read yet
+
+    One JAM can be shared by many threads.  The archive data never changes,
+    each reader gets its own stream from JamItem.open, and the entry table
+    and its caches are only changed while holding a lock.
     """
 
     path: pathlib.Path
-    directories: list[JamItem]
-    files: list[JamItem]
-    file_map: dict[str, JamItem]
     root: JamItem
-    data: bytes
+    data: bytes | mmap.mmap
+    view: memoryview
+    memory_map: bool
+    index_cache: pathlib.Path | None
+    lazy: bool
+    names: list[str]
+    pointers: array
+    sizes: array
+    parents: array
+    children: list[dict[str, int] | None]
+    pending: set[int]
+    _items: dict[int, JamItem]
+    _files: JamItemList | None
+    _directories: JamItemList | None
+    _sorted_names: list[str] | None
+    _sorted_indices: array | None
+    _extensions: dict[str, array] | None
+    _lock: threading.RLock
 
-    def __init__(self, jam_file_name: str) -> None:
+    def __init__(
+        self,
+        jam_file_name: str,
+        memory_map: bool = False,
+        index_cache: bool | str | pathlib.Path = False,
+        lazy: bool = False,
+    ) -> None:
         self.path = pathlib.Path(jam_file_name)
-
-        self.directories = []
-        self.files = []
-        self.file_map = {}
+        self.memory_map = memory_map
+        self.lazy = lazy
+
+        # True keeps the cache next to the archive
+        if index_cache is True:
+            self.index_cache = self.path.with_name(self.path.name + '.index')
+        elif index_cache is False:
+            self.index_cache = None
+        else:
+            self.index_cache = pathlib.Path(index_cache)
+
+        self.names = []
+        self.pointers = array('q')
+        self.sizes = array('q')
+        self.parents = array('q')
+        self.children = []
+        self.pending = set()
+        self._items = {}
+        self._files = None
+        self._directories = None
+        self._sorted_names = None
+        self._sorted_indices = None
+        self._extensions = None
+        self._lock = threading.RLock()
 
         self.read_jam(self.path)
 
+    def __enter__(self) -> 'JAM':
+        return self
+
+    def __exit__(
+        self, exc_type: type, exc_value: Exception, traceback: types.TracebackType
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the file data, unmapping it if it is memory mapped"""
+
+        # Readers still holding file data keep the mapping open (BufferError)
+        for item in self._items.values():
+            item.release()
+
+        self.view.release()
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    @property
+    def files(self) -> JamItemList:
+        """List of files within the JAM"""
+
+        if self._files is None:
+            self.walk()
+        return self._files
+
+    @property
+    def directories(self) -> JamItemList:
+        """List of directories within the JAM"""
+
+        if self._directories is None:
+            self.walk()
+        return self._directories
+
+    def item(self, index: int) -> JamItem:
+        """Returns the item for an entry table index"""
+
+        item: JamItem | None = self._items.get(index)
+        if item is None:
+            # setdefault is atomic, so threads racing here agree on one item
+            item = self._items.setdefault(index, JamItem(self, index))
+        return item
+
+    def find(self, file_path: str) -> int | None:
+        """Returns the entry table index of an internal path, or None"""
+
+        index: int = ROOT
+        for name in file_path.replace('\\', '/').split('/'):
+            if name == '' or name == '.':
+                continue
+            if name == '..':
+                index = self.parents[index]
+                continue
+
+            self.expand(index)
+            children: dict[str, int] | None = self.children[index]
+            if children is None or name not in children:
+                return None
+            index = children[name]
+
+        return index
+
+    def glob(self, pattern: str) -> Iterator[JamItem]:
+        """
+        Yields the items matching a pattern such as /GAMEDATA/*/TRACK.GDB
+
+        '*', '?', and '[...]' match within one path component and '**' matches
+        any number of directories.  Only the directories the pattern can reach
+        are visited, and items are created as they are yielded.
+        """
+
+        parts: list[str] = [
+            part
+            for part in pattern.replace('\\', '/').split('/')
+            if part not in ('', '.')
+        ]
+        return map(self.item, self.glob_indices(ROOT, parts))
+
+    def glob_indices(self, directory: int, parts: list[str]) -> Iterator[int]:
+        """Yields the entry indices below a directory that match the path parts"""
+
+        if not parts:
+            yield directory
+            return
+
+        self.expand(directory)
+        children: dict[str, int] | None = self.children[directory]
+        if children is None:
+            return
+
+        part: str = parts[0]
+        if part == '**':
+            # Match no directories, then one more directory at a time
+            yield from self.glob_indices(directory, parts[1:])
+            for index in children.values():
+                if self.children[index] is not None:
+                    yield from self.glob_indices(index, parts)
+
+        elif GLOB_CHARACTERS.isdisjoint(part):
+            if part in children:
+                yield from self.glob_indices(children[part], parts[1:])
+
+        else:
+            for name, index in children.items():
+                if fnmatch.fnmatchcase(name, part):
+                    yield from self.glob_indices(index, parts[1:])
+
+    def sorted_index(self) -> tuple[list[str], array]:
+        """Returns every path in sorted order with the matching entry indices"""
+
+        with self._lock:
+            if self._sorted_names is None or self._sorted_indices is None:
+                self.walk()
+                self._sorted_indices = array(
+                    'q', sorted(range(len(self.names)), key=self.names.__getitem__)
+                )
+                self._sorted_names = [self.names[i] for i in self._sorted_indices]
+
+            return self._sorted_names, self._sorted_indices
+
+    def scan_prefix(self, prefix: str) -> JamItemList:
+        """Returns the files and directories whose paths start with prefix, sorted"""
+
+        names, indices = self.sorted_index()
+        prefix = prefix.replace('\\', '/')
+
+        start: int = bisect.bisect_left(names, prefix)
+        end: int = len(names)
+        if prefix:
+            # The first path past the prefix bumps its last character
+            end = bisect.bisect_left(names, prefix[:-1] + chr(ord(prefix[-1]) + 1))
+
+        return JamItemList(self, indices[start:end])
+
+    def files_with_extension(self, extension: str) -> JamItemList:
+        """Returns the files with an extension such as '.GDB', ignoring case"""
+
+        with self._lock:
+            if self._extensions is None:
+                extensions: dict[str, array] = {}
+                for index in self.files.indices:
+                    suffix: str = file_extension(self.names[index].rpartition('/')[2])
+                    extensions.setdefault(suffix, array('q')).append(index)
+                self._extensions = extensions
+
+        return JamItemList(
+            self, self._extensions.get(normalize_extension(extension), array('q'))
+        )
+
+    def contents(self, index: int) -> JamItemList:
+        """Returns the items in a directory, reading its table if needed"""
+
+        self.expand(index)
+        children: dict[str, int] | None = self.children[index]
+        if children is None:
+            raise NotADirectoryError(f'{self.names[index]} is not a directory')
+        return JamItemList(self, array('q', children.values()))
+
     def extract_file(self, file_path: str) -> JamItem:
         """Find and return the file or directory corresponding to the provided internal file path"""
 
         # Make sure the file exists
-        if file_path not in self.file_map:
+        index: int | None = self.find(file_path)
+        if index is None:
             raise FileNotFoundError(f'File: {file_path} not in {self.path}')
 
-        return self.file_map[file_path]
-
-    def generate_file_map(self) -> None:
-        """Make it easy to find a file pointer"""
-
-        for file in (*self.files, *self.directories):
-            self.file_map[str(file.path)] = file
+        return self.item(index)
 
-    def build_directory_tree(self) -> None:
-        """Organize the files into a navigable tree"""
-
-        for file in (*self.files, *self.directories):
-            file.parent = self.file_map[str(file.path.parent)]
-            file.parent.directory_contents.append(file)
-            if str(file.path) == '/':
-                self.root = file
+    @property
+    def file_map(self) -> dict[str, JamItem]:
+        """Dictionary of contained files and directories by internal path string"""
+
+        self.walk()
+        return {name: self.item(index) for index, name in enumerate(self.names)}
+
+    def extract_all(
+        self,
+        destination: str | pathlib.Path,
+        items: Iterable[JamItem] | None = None,
+        workers: int | None = None,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> int:
+        """
+        Writes files and directories into a directory tree under destination
+
+        Extracts every file unless items are given.  All directories are
+        created first, then the files are written in archive order by a pool
+        of threads, each file with a single write straight from the archive
+        data.  progress is called with the number of files written so far and
+        the total.  Returns the number of bytes written.
+        """
+
+        destination = pathlib.Path(destination)
+        selected: Iterable[JamItem] = self.files if items is None else items
+
+        files: list[tuple[int, int, pathlib.Path]] = []
+        directories: set[pathlib.Path] = {destination}
+        for item in selected:
+            target: pathlib.Path = destination.joinpath(
+                *self.names[item.index].split('/')[1:]
+            )
+            if item.is_directory:
+                directories.add(target)
+            else:
+                directories.add(target.parent)
+                files.append((item.pointer, item.size, target))
+
+        # Create the tree in one pass so the workers only write files
+        for directory in sorted(directories):
+            directory.mkdir(parents=True, exist_ok=True)
+
+        files.sort(key=lambda file: file[0])
+        batches: list[list[tuple[int, int, pathlib.Path]]] = [
+            files[i : i + EXTRACT_BATCH_FILES]
+            for i in range(0, len(files), EXTRACT_BATCH_FILES)
+        ]
+
+        written: int = 0
+        done: int = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.write_files, batch): len(batch)
+                for batch in batches
+            }
+            for future in as_completed(futures):
+                written += future.result()
+                done += futures[future]
+                if progress is not None:
+                    progress(done, len(files))
+
+        return written
+
+    def write_files(self, files: list[tuple[int, int, pathlib.Path]]) -> int:
+        """Writes (pointer, size, target) files from the archive data"""
+
+        written: int = 0
+        for pointer, size, target in files:
+            with open(target, 'wb') as file:
+                written += file.write(self.view[pointer : pointer + size])
+        return written
 
     def read_uint32(self, offset: int) -> int:
         """Pull an integer out of the jam"""
 
-        return int(struct.unpack('<i', self.data[offset : offset + 4])[0])
+        return int(struct.unpack_from('<i', self.view, offset)[0])
 
     def read_string(self, offset: int) -> str:
         """Read 12 bytes and remove the trailing null characters"""
 
-        data: bytes = self.data[offset : offset + 12]
+        data: bytes = bytes(self.view[offset : offset + 12])
         return data.decode().strip('\x00')
 
-    def list_directories(
-        self, offset: int, number: int, directory_path: str
-    ) -> list[JamItem]:
-        directory_list: list[JamItem] = []
+    def add_entry(
+        self, name: bytes, parent: int, pointer: int, size: int, directory: bool
+    ) -> int:
+        """Append an entry to the entry table and its parent directory"""
 
-        for _ in range(number):
-            # Read in the directory name
-            name: str = directory_path
-            name += self.read_string(offset)
+        index: int = len(self.names)
+        name_str: str = name.decode().strip('\x00')
+        parent_path: str = self.names[parent] if index != ROOT else ''
 
-            position: int = self.read_uint32(offset + 12)
+        # Names are joined onto paths on disk, so they must stay in their directory
+        if index != ROOT and not valid_name(name_str):
+            raise ValueError(f'Invalid name in a JAM: {name_str!r} in {parent_path}')
 
-            directory_list.append(JamItem(name, self, position, 0, directory=True))
-            offset += 16
+        self.names.append(
+            f'{parent_path}/{name_str}' if parent_path != '/' else f'/{name_str}'
+        )
+        self.pointers.append(pointer)
+        self.sizes.append(size)
+        self.parents.append(parent)
+        self.children.append({} if directory else None)
+        if directory:
+            self.pending.add(index)
 
-        return directory_list
+        siblings: dict[str, int] | None = self.children[parent]
+        if siblings is not None and index != ROOT:
+            siblings[name_str] = index
 
-    def list_files(
-        self, offset: int, number: int, directory_path: str
-    ) -> list[JamItem]:
-        file_list: list[JamItem] = []
+        return index
 
-        for _ in range(number):
-            # Read in the file name
-            name: str = directory_path + os.sep
-            name += self.read_string(offset)
+    def list_directories(self, offset: int, number: int, parent: int) -> list[int]:
+        directory_list: list[int] = []
+
+        for name, position in DIRECTORY_ENTRY.iter_unpack(
+            self.view[offset : offset + number * DIRECTORY_ENTRY.size]
+        ):
+            directory_list.append(self.add_entry(name, parent, position, 0, True))
+
+        return directory_list
 
-            position: int = self.read_uint32(offset + 12)
-            size: int = self.read_uint32(offset + 16)
+    def list_files(self, offset: int, number: int, parent: int) -> list[int]:
+        file_list: list[int] = []
 
-            file_list.append(JamItem(name, self, position, size))
-            offset += 20
+        for name, position, size in FILE_ENTRY.iter_unpack(
+            self.view[offset : offset + number * FILE_ENTRY.size]
+        ):
+            file_list.append(self.add_entry(name, parent, position, size, False))
 
         return file_list
 
-    def recurse(self, directories_list: list[JamItem]) -> None:
-        self.directories.extend(directories_list)
+    def expand(self, directory: int) -> None:
+        """Read a directory's table into the entry table, if it hasn't been yet"""
 
-        for f in directories_list:
-            total_files = self.read_uint32(f.pointer)
+        if directory not in self.pending:
+            return
+
+        with self._lock:
+            # Another thread may have read it while this one waited
+            if directory not in self.pending:
+                return
+
+            pointer: int = self.pointers[directory]
+            total_files = self.read_uint32(pointer)
 
             if total_files == 0:  # Only contains directories
-                self.recurse(
-                    self.list_directories(
-                        f.pointer + 8,
-                        self.read_uint32(f.pointer + 4),
-                        str(f.path) + os.sep,
-                    )
+                self.list_directories(
+                    pointer + 8, self.read_uint32(pointer + 4), directory
                 )
 
             else:
-                # Add files to the list
-                self.files.extend(
-                    self.list_files(
-                        f.pointer + 4, self.read_uint32(f.pointer), str(f.path)
-                    )
-                )
+                self.list_files(pointer + 4, total_files, directory)
 
                 # Check for subdirectories
-                directory_count_position: int = total_files * 20 + f.pointer + 4
+                directory_count_position: int = total_files * 20 + pointer + 4
                 directory_count: int = self.read_uint32(directory_count_position)
                 if directory_count > 0:
-                    self.recurse(
-                        self.list_directories(
-                            directory_count_position + 4,
-                            directory_count,
-                            str(f.path) + os.sep,
-                        )
+                    self.list_directories(
+                        directory_count_position + 4, directory_count, directory
                     )
 
+            # Only now is the directory complete for readers without the lock
+            self.pending.discard(directory)
+
+    def recurse(
+        self, directories_list: list[int], files: array, directories: array
+    ) -> None:
+        directories.extend(directories_list)
+
+        for directory in directories_list:
+            self.expand(directory)
+
+            # Files come before subdirectories in each directory table
+            subdirectories: list[int] = []
+            for index in self.children[directory].values():
+                if self.children[index] is None:
+                    files.append(index)
+                else:
+                    subdirectories.append(index)
+
+            if subdirectories:
+                self.recurse(subdirectories, files, directories)
+
+    def walk(self) -> None:
+        """Read every directory table and list the files and directories"""
+
+        if self._files is not None and not self.pending:
+            return
+
+        with self._lock:
+            if self._files is not None and not self.pending:
+                return
+
+            files: array = array('q')
+            directories: array = array('q')
+            self.recurse([ROOT], files, directories)
+
+            self._directories = JamItemList(self, directories)
+            self._files = JamItemList(self, files)
+
+    def index_key(self, stat: os.stat_result) -> tuple[int, int, bytes]:
+        """Identifies this version of the archive for the index cache"""
+
+        digest: bytes = hashlib.blake2b(
+            self.view[:INDEX_HASHED_BYTES], digest_size=16
+        ).digest()
+        return stat.st_size, stat.st_mtime_ns, digest
+
+    def load_index(self, key: tuple[int, int, bytes]) -> bool:
+        """Fill the entry table from the index cache, if it matches the archive"""
+
+        if self.index_cache is None:
+            return False
+
+        try:
+            with open(self.index_cache, 'rb') as file:
+                cache: bytes = file.read()
+            (
+                magic,
+                version,
+                size,
+                mtime,
+                digest,
+                entry_count,
+                file_count,
+                directory_count,
+            ) = INDEX_HEADER.unpack_from(cache)
+        except (OSError, struct.error):
+            return False
+
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            return False
+        if (size, mtime, digest) != key:
+            return False
+
+        tables: list[array] = []
+        position: int = INDEX_HEADER.size
+        for count in (entry_count, entry_count, entry_count, file_count):
+            table: array = array('q')
+            table.frombytes(cache[position : position + count * table.itemsize])
+            position += count * table.itemsize
+            tables.append(table)
+
+        directories: array = array('q')
+        directories.frombytes(
+            cache[position : position + directory_count * directories.itemsize]
+        )
+        position += directory_count * directories.itemsize
+        tables.append(directories)
+
+        names: list[str] = cache[position:].decode().split('\0')
+        if len(names) != entry_count or any(
+            len(table) != count
+            for table, count in zip(
+                tables,
+                (entry_count, entry_count, entry_count, file_count, directory_count),
+            )
+        ):
+            return False
+
+        if sys.byteorder == 'big':
+            for table in tables:
+                table.byteswap()
+
+        self.names = names
+        self.pointers, self.sizes, self.parents, files, directories = tables
+        self._files = JamItemList(self, files)
+        self._directories = JamItemList(self, directories)
+        self.pending = set()
+
+        # Rebuild the child dicts in entry order, like the directory walk does
+        children: list[dict[str, int] | None] = [None] * entry_count
+        for index in directories:
+            children[index] = {}
+        for index in range(1, entry_count):
+            name: str = names[index].rpartition('/')[2]
+            if not valid_name(name):
+                return False
+            siblings: dict[str, int] | None = children[self.parents[index]]
+            if siblings is not None:
+                siblings[name] = index
+        self.children = children
+
+        return True
+
+    def save_index(self, key: tuple[int, int, bytes]) -> None:
+        """Write the entry table to the index cache"""
+
+        if self.index_cache is None:
+            return
+
+        tables: list[array] = [
+            self.pointers,
+            self.sizes,
+            self.parents,
+            self.files.indices,
+            self.directories.indices,
+        ]
+        if sys.byteorder == 'big':
+            tables = [array('q', table) for table in tables]
+            for table in tables:
+                table.byteswap()
+
+        size, mtime, digest = key
+        header: bytes = INDEX_HEADER.pack(
+            INDEX_MAGIC,
+            INDEX_VERSION,
+            size,
+            mtime,
+            digest,
+            len(self.names),
+            len(self.files),
+            len(self.directories),
+        )
+
+        # Write a temporary file first so other processes never see half an index
+        temporary: pathlib.Path = self.index_cache.with_name(
+            f'{self.index_cache.name}.{os.getpid()}.tmp'
+        )
+        try:
+            with open(temporary, 'wb') as file:
+                file.write(header)
+                for table in tables:
+                    file.write(table.tobytes())
+                file.write('\0'.join(self.names).encode())
+            os.replace(temporary, self.index_cache)
+        except OSError:
+            # The cache is only an optimization, so a read-only location is fine
+            temporary.unlink(missing_ok=True)
+
     def read_jam(self, jam_file_path: pathlib.Path) -> None:
         with open(jam_file_path, 'rb') as file:
-            self.data = file.read()
+            stat: os.stat_result = os.fstat(file.fileno())
+            if self.memory_map and stat.st_size > 0:
+                # Pages are only read when touched and are shared between processes
+                self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self.data = file.read()
+        self.view = memoryview(self.data)
 
         # Make sure this is really a JAM file
         if len(self.data) < 4 or self.data[0:4] != b'LJAM':
             raise AssertionError(f'Not a JAM file: {jam_file_path}')
 
-        # Recursively create a list of all files
-        self.recurse([JamItem(os.sep, self, pointer=4, size=0, directory=True)])
+        key: tuple[int, int, bytes] | None = None
+        if self.index_cache is not None:
+            key = self.index_key(stat)
+
+        if key is None or not self.load_index(key):
+            self.add_entry(b'', ROOT, 4, 0, True)
+
+            # Lazy mode reads the other directories as they are visited
+            if not self.lazy:
+                self.walk()
+                if key is not None:
+                    self.save_index(key)
 
-        # Build structures for file access
-        self.generate_file_map()
-        self.build_directory_tree()
+        self.root = self.item(ROOT)
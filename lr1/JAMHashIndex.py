@@ -0,0 +1,276 @@
+from typing import Any, TypeVar
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import hashlib
+import os
+import pathlib
+
+from .JAM import JAM
+from .GDB import GDB
+from .MDB import MDB
+from .IO.LRFile import LRFile
+
+# First line of a stored index: magic, version, and the archive it belongs to
+HASH_INDEX_MAGIC: str = 'LJAMHASH'
+HASH_INDEX_VERSION: int = 1
+
+# Size of the content hashes in bytes
+DIGEST_SIZE: int = 16
+
+# Files hashed by one task, to keep the per-file overhead low
+HASH_BATCH_FILES: int = 64
+
+# Parsers whose results depend on the directory of the file, like MDB textures
+DIRECTORY_PARSERS: frozenset[Callable[[LRFile], Any]] = frozenset({MDB})
+
+T = TypeVar('T')
+
+
+def content_digest(data: bytes | memoryview) -> bytes:
+    """The content hash used for every index"""
+
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).digest()
+
+
+class JAMDiff:
+    """
+    The differences between two archives, as lists of internal paths
+
+    Attributes:
+        added (list[str]): Files only in the new archive
+        removed (list[str]): Files only in the old archive
+        changed (list[str]): Files in both with different contents
+        unchanged (list[str]): Files in both with the same contents
+    """
+
+    added: list[str]
+    removed: list[str]
+    changed: list[str]
+    unchanged: list[str]
+
+    def __init__(self, old: dict[str, bytes], new: dict[str, bytes]) -> None:
+        self.added = [path for path in new if path not in old]
+        self.removed = [path for path in old if path not in new]
+        self.changed = []
+        self.unchanged = []
+        for path, digest in old.items():
+            if path in new:
+                (self.unchanged if new[path] == digest else self.changed).append(path)
+
+    def __str__(self) -> str:
+        return (
+            f'Added: {len(self.added)}, Removed: {len(self.removed)}, '
+            f'Changed: {len(self.changed)}, Unchanged: {len(self.unchanged)}'
+        )
+
+
+class JAMHashIndex:
+    """
+    Content hashes of every file in a JAM
+
+    The hashes are computed in parallel the first time and stored next to the
+    archive.  Later runs load them as long as the archive has not changed,
+    using the same size, mtime, and header hash check as the JAM index cache.
+
+    Attributes:
+        jam (JAM): The hashed archive
+        path (pathlib.Path): Where the index is stored
+        digests (dict[str, bytes]): Content hash of each file, by internal path
+    """
+
+    jam: JAM
+    path: pathlib.Path
+    digests: dict[str, bytes]
+
+    def __init__(
+        self,
+        jam: JAM,
+        path: str | pathlib.Path | None = None,
+        workers: int | None = None,
+    ) -> None:
+        self.jam = jam
+        self.path = (
+            jam.path.with_name(jam.path.name + '.hashes')
+            if path is None
+            else pathlib.Path(path)
+        )
+        self.digests = {}
+
+        if not self.load():
+            self.build(workers)
+            self.save()
+
+    def archive_key(self) -> str:
+        """Identifies this version of the archive"""
+
+        size, mtime, digest = self.jam.index_key(os.stat(self.jam.path))
+        return f'{HASH_INDEX_MAGIC} {HASH_INDEX_VERSION} {size} {mtime} {digest.hex()}'
+
+    def build(self, workers: int | None = None) -> None:
+        """Hash every file of the archive with a pool of threads"""
+
+        # hashlib releases the GIL while hashing, so threads run in parallel
+        files: list[tuple[str, int, int]] = [
+            (self.jam.names[item.index], item.pointer, item.size)
+            for item in self.jam.files
+        ]
+        batches: list[list[tuple[str, int, int]]] = [
+            files[i : i + HASH_BATCH_FILES]
+            for i in range(0, len(files), HASH_BATCH_FILES)
+        ]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for batch in executor.map(self.hash_files, batches):
+                self.digests.update(batch)
+
+    def hash_files(
+        self, files: list[tuple[str, int, int]]
+    ) -> list[tuple[str, bytes]]:
+        """Hash (path, pointer, size) files from the archive data"""
+
+        view: memoryview = self.jam.view
+        return [
+            (path, content_digest(view[pointer : pointer + size]))
+            for path, pointer, size in files
+        ]
+
+    def load(self) -> bool:
+        """Read the stored index, if it belongs to this version of the archive"""
+
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                if file.readline().rstrip('\n') != self.archive_key():
+                    return False
+
+                digests: dict[str, bytes] = {}
+                for line in file:
+                    digest, _, path = line.rstrip('\n').partition(' ')
+                    digests[path] = bytes.fromhex(digest)
+        except (OSError, ValueError):
+            return False
+
+        self.digests = digests
+        return True
+
+    def save(self) -> None:
+        """Store the index next to the archive"""
+
+        temporary: pathlib.Path = self.path.with_name(
+            f'{self.path.name}.{os.getpid()}.tmp'
+        )
+        try:
+            with open(temporary, 'w', encoding='utf-8') as file:
+                file.write(self.archive_key() + '\n')
+                for path, digest in self.digests.items():
+                    file.write(f'{digest.hex()} {path}\n')
+            os.replace(temporary, self.path)
+        except OSError:
+            # The index can always be computed again
+            temporary.unlink(missing_ok=True)
+
+    def digest(self, path: str) -> bytes:
+        """The content hash of a file"""
+
+        digest: bytes | None = self.digests.get(path)
+        if digest is None:
+            raise FileNotFoundError(f'File: {path} not in {self.jam.path}')
+        return digest
+
+    def diff(self, other: 'JAMHashIndex') -> JAMDiff:
+        """Compare with a newer version of the archive"""
+
+        return JAMDiff(self.digests, other.digests)
+
+    def dedupe(self, store: str | pathlib.Path) -> int:
+        """
+        Copy each distinct file into a content-addressed store
+
+        Files are stored as <store>/<first two hex digits>/<hex digest>, so
+        identical files from any number of archives are kept once.  Returns
+        the number of files added to the store.
+        """
+
+        store = pathlib.Path(store)
+        seen: set[bytes] = set()
+        added: int = 0
+        for item in self.jam.files:
+            digest: bytes = self.digests[self.jam.names[item.index]]
+            if digest in seen:
+                continue
+            seen.add(digest)
+
+            target: pathlib.Path = store / digest.hex()[:2] / digest.hex()
+            if target.exists():
+                continue
+
+            # Interrupted copies never end up under their content hash
+            target.parent.mkdir(parents=True, exist_ok=True)
+            temporary: pathlib.Path = target.with_name(
+                f'{target.name}.{os.getpid()}.tmp'
+            )
+            try:
+                with open(temporary, 'wb') as file:
+                    file.write(self.jam.view[item.pointer : item.pointer + item.size])
+                os.replace(temporary, target)
+            except BaseException:
+                temporary.unlink(missing_ok=True)
+                raise
+            added += 1
+
+        return added
+
+
+class ContentCache:
+    """
+    Parsed files by content hash, so identical files are only parsed once
+
+    Results that depend on where the file is are only shared within one
+    directory, see DIRECTORY_PARSERS, and a shared GDB is handed out as a
+    copy that refers to the requested file.
+
+    Attributes:
+        results (dict[tuple[bytes, str, str], Any]): Parse results by content hash, parser name, and directory if it matters
+        hits (int): Files that were already parsed
+        misses (int): Files that had to be parsed
+    """
+
+    results: dict[tuple[bytes, str, str], Any]
+    hits: int
+    misses: int
+
+    def __init__(self) -> None:
+        self.results = {}
+        self.hits = 0
+        self.misses = 0
+
+    def parse(
+        self, index: JAMHashIndex, path: str, parser: Callable[[LRFile], T]
+    ) -> T:
+        """Returns parser(file), reusing the result for files with the same content"""
+
+        directory: str = (
+            str(pathlib.PurePosixPath(path).parent).upper()
+            if parser in DIRECTORY_PARSERS
+            else ''
+        )
+        key: tuple[bytes, str, str] = (
+            index.digest(path),
+            parser.__qualname__,
+            directory,
+        )
+        file: LRFile = index.jam.extract_file(path)
+
+        result: T | None = self.results.get(key)
+        if result is None:
+            self.misses += 1
+            result = parser(file)
+            self.results[key] = result
+            return result
+
+        self.hits += 1
+        if isinstance(result, GDB) and result.file is not file:
+            shared: GDB = copy.copy(result)
+            shared.file = file
+            return shared  # type: ignore[return-value]
+        return result
@@ -0,0 +1,234 @@
+from typing import BinaryIO
+from collections.abc import Iterator
+import os
+import struct
+import pathlib
+
+from .JAM import JAM, FILE_ENTRY, DIRECTORY_ENTRY
+
+# Where a file's data comes from: a loose file, bytes, or an entry of a JAM
+FileSource = pathlib.Path | bytes | tuple[JAM, int]
+
+# Chunk size for copying loose files into the archive
+COPY_CHUNK: int = 0x100000
+
+# Offsets and sizes are read as signed 32 bit integers
+MAX_ARCHIVE_SIZE: int = 0x7FFFFFFF
+
+
+class JAMDirectory:
+    """
+    A directory of the archive being written
+
+    Attributes:
+        files (dict[str, FileSource]): Where the data of each file comes from, by name
+        directories (dict[str, JAMDirectory]): Subdirectories by name
+        pointer (int): Position of the directory table in the archive
+    """
+
+    files: dict[str, FileSource]
+    directories: dict[str, 'JAMDirectory']
+    pointer: int
+
+    def __init__(self) -> None:
+        self.files = {}
+        self.directories = {}
+        self.pointer = 0
+
+    def table_size(self) -> int:
+        """Size of the directory table in bytes"""
+
+        return 8 + len(self.files) * FILE_ENTRY.size + (
+            len(self.directories) * DIRECTORY_ENTRY.size
+        )
+
+    def walk(self) -> Iterator['JAMDirectory']:
+        """Yields this directory and every directory below it, parents first"""
+
+        stack: list[JAMDirectory] = [self]
+        while stack:
+            directory: JAMDirectory = stack.pop()
+            yield directory
+            stack.extend(reversed(directory.directories.values()))
+
+
+class JAMWriter:
+    """
+    Builds an LJAM archive from loose files, bytes, and the entries of other JAMs
+
+    The directory tables are laid out first, followed by the file data in
+    table order.  The archive is written in one streaming pass: loose files
+    are copied in chunks and entries of a source JAM are written straight
+    from its data, so the archive is never assembled in memory.
+
+    Attributes:
+        root (JAMDirectory): The root directory
+    """
+
+    root: JAMDirectory
+
+    def __init__(self, jam: JAM | None = None) -> None:
+        self.root = JAMDirectory()
+
+        # Start from the contents of an existing archive
+        if jam is not None:
+            self.add_jam(jam)
+
+    def split(self, path: str) -> list[str]:
+        """Splits an internal path into validated names"""
+
+        names: list[str] = [
+            name
+            for name in path.replace('\\', '/').split('/')
+            if name not in ('', '.')
+        ]
+        for name in names:
+            if name == '..' or len(name.encode()) > 12:
+                raise ValueError(f'Invalid name in a JAM: {name!r} in {path}')
+        return names
+
+    def directory(self, names: list[str]) -> JAMDirectory:
+        """Finds or creates the directory at the path names"""
+
+        directory: JAMDirectory = self.root
+        for name in names:
+            if name in directory.files:
+                raise NotADirectoryError(f'{name} is a file')
+            directory = directory.directories.setdefault(name, JAMDirectory())
+        return directory
+
+    def add_directory(self, path: str) -> None:
+        """Adds a directory, even if it stays empty"""
+
+        self.directory(self.split(path))
+
+    def add_file(self, path: str, source: str | FileSource) -> None:
+        """Adds or replaces a file with the contents of source"""
+
+        names: list[str] = self.split(path)
+        if not names:
+            raise IsADirectoryError(f'{path} is the root directory')
+
+        directory: JAMDirectory = self.directory(names[:-1])
+        if names[-1] in directory.directories:
+            raise IsADirectoryError(f'{path} is a directory')
+
+        directory.files[names[-1]] = (
+            pathlib.Path(source) if isinstance(source, str) else source
+        )
+
+    def remove(self, path: str) -> None:
+        """Removes a file or directory"""
+
+        names: list[str] = self.split(path)
+        directory: JAMDirectory = self.directory(names[:-1])
+        if directory.files.pop(names[-1], None) is None:
+            if directory.directories.pop(names[-1], None) is None:
+                raise FileNotFoundError(f'{path} is not in the archive')
+
+    def add_jam(self, jam: JAM, prefix: str = '/') -> None:
+        """Adds every file and directory of a JAM, keeping its order"""
+
+        for item in jam.directories:
+            self.add_directory(f'{prefix}/{item.path}')
+        for item in jam.files:
+            self.add_file(f'{prefix}/{item.path}', (jam, item.index))
+
+    def add_tree(self, directory: str | pathlib.Path, prefix: str = '/') -> None:
+        """
+        Adds the files and directories under a directory on disk
+
+        Names are upper cased like the names in the game's archives, since
+        the game ignores case.  Two names that only differ in case are an
+        error instead of one silently replacing the other.
+        """
+
+        directory = pathlib.Path(directory)
+        added: dict[str, pathlib.Path] = {}
+        for path, subdirectories, files in os.walk(directory):
+            subdirectories.sort()
+            relative: str = pathlib.Path(path).relative_to(directory).as_posix()
+            for name in subdirectories + sorted(files):
+                key: str = f'{relative}/{name}'.upper()
+                if key in added:
+                    raise ValueError(
+                        f'{added[key]} and {name} in {path} differ in case only'
+                    )
+                added[key] = pathlib.Path(path, name)
+
+            target: str = f'{prefix}/{relative.upper()}'
+            self.add_directory(target)
+            for name in sorted(files):
+                self.add_file(f'{target}/{name.upper()}', pathlib.Path(path, name))
+
+    def source_size(self, source: FileSource) -> int:
+        if isinstance(source, bytes):
+            return len(source)
+        if isinstance(source, tuple):
+            jam, index = source
+            return jam.sizes[index]
+        return source.stat().st_size
+
+    def write(self, path: str | pathlib.Path) -> int:
+        """Writes the archive and returns its size in bytes"""
+
+        path = pathlib.Path(path)
+        directories: list[JAMDirectory] = list(self.root.walk())
+
+        # Place the tables, then the data of each file in table order
+        position: int = 4
+        for directory in directories:
+            directory.pointer = position
+            position += directory.table_size()
+
+        files: list[tuple[FileSource, int]] = []
+        tables: bytearray = bytearray(b'LJAM')
+        for directory in directories:
+            tables += struct.pack('<i', len(directory.files))
+            for name, source in directory.files.items():
+                size: int = self.source_size(source)
+                tables += FILE_ENTRY.pack(name.encode(), position, size)
+                files.append((source, size))
+                position += size
+
+            tables += struct.pack('<i', len(directory.directories))
+            for name, subdirectory in directory.directories.items():
+                tables += DIRECTORY_ENTRY.pack(name.encode(), subdirectory.pointer)
+
+        if position > MAX_ARCHIVE_SIZE:
+            raise ValueError(f'Archive too large for a JAM: {position} bytes')
+
+        # Write next to the target so a source JAM at the same path stays readable
+        temporary: pathlib.Path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        try:
+            with open(temporary, 'wb') as archive:
+                archive.write(tables)
+                for source, size in files:
+                    self.copy(source, size, archive)
+            os.replace(temporary, path)
+        except BaseException:
+            temporary.unlink(missing_ok=True)
+            raise
+
+        return position
+
+    def copy(self, source: FileSource, size: int, archive: BinaryIO) -> None:
+        """Streams the data of one file into the archive"""
+
+        if isinstance(source, bytes):
+            archive.write(source)
+
+        elif isinstance(source, tuple):
+            jam, index = source
+            pointer: int = jam.pointers[index]
+            archive.write(jam.view[pointer : pointer + size])
+
+        else:
+            copied: int = 0
+            with open(source, 'rb') as file:
+                while chunk := file.read(min(COPY_CHUNK, size - copied)):
+                    archive.write(chunk)
+                    copied += len(chunk)
+
+            if copied != size:
+                raise OSError(f'{source} changed size while writing the archive')
@@ -1,9 +1,11 @@
+from collections.abc import Callable
 import pathlib
 
 from .Utils.BinaryFileHelper import BinaryFileHelper
 from .IO.LRBinaryReader import LRBinaryReader
 from .Utils.Token import Token
 from .IO.LRFile import LRFile
+from .IO.LRAssetFile import LRAssetFile
 from .BMP import BMP
 from .Utils.MDB_Material import MDB_Material
 
@@ -13,16 +15,26 @@ ID_MATERIALS: int = 0x27
 class MDB:
     materials: dict[str, MDB_Material]
 
-    def __init__(self, file: LRFile) -> None:
+    def __init__(
+        self,
+        file: LRFile,
+        blocks: set[int] | None = None,
+        tape: bool = False,
+        load_bmp: Callable[[LRFile], BMP] = BMP,
+    ) -> None:
         helper: BinaryFileHelper = BinaryFileHelper()
-        reader: LRBinaryReader = helper.decompress(file.data)
+        with file.open() as stream:
+            reader: LRBinaryReader = helper.decompress(stream, tape)
 
         self.materials = dict()
 
         # Read each material
-        while reader.position < len(reader):
+        while not reader.at_end():
             block_id: int = reader.read_int(Token.Byte)
-            if block_id == ID_MATERIALS:
+            if blocks is not None and block_id not in blocks:
+                reader.skip_block()
+
+            elif block_id == ID_MATERIALS:
                 self.materials = reader.read_dict_block(MDB_Material.read, ID_MATERIALS)
 
             else:
@@ -30,7 +42,13 @@ class MDB:
                     f'Invalid block_id: {block_id}, position: {reader.position - 1}'
                 )
 
-        # Add the texture to the material
+        self.load_textures(file, load_bmp)
+
+    def load_textures(
+        self, file: LRFile, load_bmp: Callable[[LRFile], BMP] = BMP
+    ) -> None:
+        """Adds the texture to each material, from the directory of the MDB"""
+
         for material in self.materials.values():
             # Only some materials have textures
             if material.texture_name != '':
@@ -38,11 +56,36 @@ class MDB:
                     f'{file.path.parent}/{material.texture_name.upper()}.BMP'
                 )
                 try:
-                    material.texture = BMP(file.get_file(bmp_file_path))
+                    material.texture = load_bmp(file.resolve(bmp_file_path))
                 except FileNotFoundError:
                     # Set a fallback texture
                     material.texture = BMP.checker_fallback(None)
 
+    def to_asset(self, asset: LRAssetFile) -> None:
+        """Stores the materials without their textures, see AssetCache"""
+
+        asset.info = {
+            'materials': {
+                name: material.to_values() for name, material in self.materials.items()
+            }
+        }
+
+    def from_asset(
+        self: 'MDB | None',
+        asset: LRAssetFile,
+        file: LRFile,
+        load_bmp: Callable[[LRFile], BMP] = BMP,
+    ) -> 'MDB':
+        """An MDB with the materials of a stored asset, see AssetCache"""
+
+        val: MDB = MDB.__new__(MDB)
+        val.materials = {
+            name: MDB_Material.from_values(None, values)
+            for name, values in asset.info['materials'].items()
+        }
+        val.load_textures(file, load_bmp)
+        return val
+
     def list_materials(self) -> None:
         """Lists each material with its name"""
 
@@ -32,16 +32,33 @@ class RRB:
     milliseconds: int
     unknown_2D: int
 
-    def __init__(self, file: LRFile) -> None:
+    def __init__(
+        self, file: LRFile, blocks: set[int] | None = None, tape: bool = False
+    ) -> None:
         helper: BinaryFileHelper = BinaryFileHelper()
-        reader: LRBinaryReader = helper.decompress(file.data)
-
-        while reader.position < len(reader):
+        with file.open() as stream:
+            reader: LRBinaryReader = helper.decompress(stream, tape)
+
+        self.nodes = []
+        self.start_rotation = LRQuaternion()
+        self.start_position = LRVector3()
+        self.end_rotation = LRQuaternion()
+        self.end_position = LRVector3()
+        self.milliseconds = 0
+        self.unknown_2D = 0
+
+        while not reader.at_end():
             blockId: int = reader.read_int(Token.Byte)
 
+            if blocks is not None and blockId not in blocks:
+                reader.skip_block()
+                continue
+
             match blockId:
                 case ID.NODES:
-                    self.nodes = reader.read_array_block(RRB_Node.read)
+                    self.nodes = reader.read_record_array_block(
+                        RRB_Node.FIELDS, RRB_Node.from_record
+                    )
 
                 case ID.START_ROTATION:
                     self.start_rotation = LRQuaternion().read(reader)
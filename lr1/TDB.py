@@ -2,6 +2,7 @@ from .Utils.BinaryFileHelper import BinaryFileHelper
 from .IO.LRBinaryReader import LRBinaryReader
 from .Utils.Token import Token
 from .IO.LRFile import LRFile
+from .IO.LRAssetFile import LRAssetFile
 
 from .Utils.TDB_Texture import TDB_Texture
 
@@ -11,13 +12,20 @@ ID_TEXTURES: int = 0x27
 class TDB:
     textures: dict[str, TDB_Texture]
 
-    def __init__(self, file: LRFile) -> None:
+    def __init__(
+        self, file: LRFile, blocks: set[int] | None = None, tape: bool = False
+    ) -> None:
         helper: BinaryFileHelper = BinaryFileHelper()
-        reader: LRBinaryReader = helper.decompress(file.data)
+        with file.open() as stream:
+            reader: LRBinaryReader = helper.decompress(stream, tape)
 
         self.textures = dict()
-        while reader.position < len(reader):
+        while not reader.at_end():
             block_id: int = reader.read_int(Token.Byte)
+            if blocks is not None and block_id not in blocks:
+                reader.skip_block()
+                continue
+
             match block_id:
                 case int(ID_TEXTURES):
                     self.textures = reader.read_dict_block(
@@ -28,3 +36,22 @@ class TDB:
                     raise ValueError(
                         f'Invalid block_id: {block_id}, position: {reader.position - 1}'
                     )
+
+    def to_asset(self, asset: LRAssetFile) -> None:
+        """Stores the textures, see AssetCache"""
+
+        asset.info = {
+            'textures': {
+                name: texture.to_values() for name, texture in self.textures.items()
+            }
+        }
+
+    def from_asset(self: 'TDB | None', asset: LRAssetFile, file: LRFile) -> 'TDB':
+        """A TDB with the textures of a stored asset, see AssetCache"""
+
+        val: TDB = TDB.__new__(TDB)
+        val.textures = {
+            name: TDB_Texture.from_values(None, values)
+            for name, values in asset.info['textures'].items()
+        }
+        return val
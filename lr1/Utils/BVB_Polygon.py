@@ -13,20 +13,24 @@ class BVB_Polygon:
     vertices: tuple[int, int, int]
     material: int
 
-    def read(self: 'BVB_Polygon | None', reader: LRBinaryReader) -> 'BVB_Polygon':
-        """Read the polygon data from a file"""
+    # v0, v1, v2, material, see LRBinaryReader.compile_record
+    FIELDS: str = 'iiii'
+
+    def from_record(
+        self: 'BVB_Polygon | None', record: tuple[int, ...]
+    ) -> 'BVB_Polygon':
+        """Make a polygon from the values of a record"""
 
         val: BVB_Polygon = BVB_Polygon()
+        val.vertices = (record[0], record[1], record[2])
+        val.material = record[3]
 
-        val.vertices = (
-            reader.read_typed_int(),
-            reader.read_typed_int(),
-            reader.read_typed_int(),
-        )
+        return val
 
-        val.material = reader.read_typed_int()
+    def read(self: 'BVB_Polygon | None', reader: LRBinaryReader) -> 'BVB_Polygon':
+        """Read the polygon data from a file"""
 
-        return val
+        return BVB_Polygon.from_record(None, reader.read_record(BVB_Polygon.FIELDS))
 
     def __str__(self) -> str:
         return (
@@ -12,18 +12,23 @@ class BVB_PolygonRange:
     first_poly: int
     num_polys: int
 
-    def read(
-        self: 'BVB_PolygonRange | None', reader: LRBinaryReader
+    # left, right, x, y, z, first_poly, num_polys, see LRBinaryReader.compile_record
+    FIELDS: str = 'iiiiiii'
+
+    def from_record(
+        self: 'BVB_PolygonRange | None', record: tuple[int, ...]
     ) -> 'BVB_PolygonRange':
         val: BVB_PolygonRange = BVB_PolygonRange()
 
-        val.index_left = reader.read_typed_int()
-        val.index_right = reader.read_typed_int()
-        val.x = reader.read_typed_int()
-        val.y = reader.read_typed_int()
-        val.z = reader.read_typed_int()
-        val.first_poly = reader.read_typed_int()
-        val.num_polys = reader.read_typed_int()
+        (
+            val.index_left,
+            val.index_right,
+            val.x,
+            val.y,
+            val.z,
+            val.first_poly,
+            val.num_polys,
+        ) = record
 
         # Tree nodes
         val.node_left = None
@@ -31,6 +36,13 @@ class BVB_PolygonRange:
 
         return val
 
+    def read(
+        self: 'BVB_PolygonRange | None', reader: LRBinaryReader
+    ) -> 'BVB_PolygonRange':
+        return BVB_PolygonRange.from_record(
+            None, reader.read_record(BVB_PolygonRange.FIELDS)
+        )
+
     def __str__(self) -> str:
         return (
             'BVB_PolygonRange: {'
@@ -1,78 +1,130 @@
 from typing import IO
-from io import BytesIO
+from collections.abc import Iterator
+from itertools import chain, repeat
 
-from ..IO.LRBinaryReader import LRBinaryReader
-from ..IO.LRBinaryWriter import LRBinaryWriter
+from ..IO.LRBinaryReader import LRBinaryReader, Buffer, STRUCTS
+from ..IO.LRCompressedReader import LRCompressedReader
+from ..IO.LRTapeReader import LRTapeReader
+from ..IO.LRTokenTape import LRTokenTape
 from ..Utils.Token import Token
+from ..Utils.StructTemplate import StructTable, StructTemplate, VALUE_SIZES
+
+# Arrays shorter than this are cheaper to expand one struct at a time
+BULK_ARRAY_MIN: int = 16
 
 
 class BinaryFileHelper:
-    def decompress(self, file: IO[bytes]) -> LRBinaryReader:
+    def decompress(self, file: IO[bytes], tape: bool = False) -> LRBinaryReader:
+        """
+        Returns a reader that expands the compressed token stream as it is parsed
+
+        With tape, the whole stream is decompressed into a token tape first,
+        which costs a full pass up front but makes skipping any group a
+        single jump and reads runs of records as slices of its values.
+        """
+
+        if tape:
+            return LRTapeReader(LRTokenTape(file))
+
+        return LRCompressedReader(file)
+
+    def expand(self, file: IO[bytes] | Buffer) -> bytearray:
+        """Expands the whole compressed token stream into the decompressed bytes"""
+
         reader: LRBinaryReader = LRBinaryReader(file)
+        data: Buffer = reader.data
+        length: int = len(data)
+        position: int = 0
 
-        structs: dict[int, list[int]] = {}
-        stream: BytesIO = BytesIO()
+        output: bytearray = bytearray()
+        structs: StructTable = StructTable()
+        definitions: dict[int, tuple[int, ...]] = structs.definitions
+        stack: list[Iterator[int]] = []
 
-        writer: LRBinaryWriter = LRBinaryWriter(stream)
-        while reader.position < len(reader):
-            block_id: int = reader.read_int(Token.Byte)
-            self.recursive_decompress(block_id, reader, writer, structs)
+        while True:
+            if stack:
+                token: int | None = next(stack[-1], None)
+                if token is None:
+                    stack.pop()
+                    continue
 
-        stream.seek(0)
+            elif position < length:
+                token = data[position]
+                position += 1
 
-        return LRBinaryReader(stream)
+            else:
+                return output
 
-    def recursive_decompress(
-        self,
-        block_id: int,
-        reader: LRBinaryReader,
-        writer: LRBinaryWriter,
-        structs: dict[int, list[int]],
-    ) -> None:
-        match block_id:
-            case (
-                Token.LeftCurly
-                | Token.RightCurly
-                | Token.LeftBracket
-                | Token.RightBracket
-            ):
-                writer.write_token(block_id)
-
-            case Token.Byte | Token.SByte:
-                writer.write_token(block_id)
-                writer.write_bytes(reader.read_bytes(1))
-
-            case Token.Short | Token.UShort:
-                writer.write_token(block_id)
-                writer.write_bytes(reader.read_bytes(2))
-
-            case Token.Int32 | Token.Float:
-                writer.write_token(block_id)
-                writer.write_bytes(reader.read_bytes(4))
-
-            case Token.String:
-                writer.write_token(block_id)
-                writer.write_string(reader.read_string())
-
-            case Token.Array:
-                array_len: int = reader.read_int(Token.Short)
-                array_type: int = reader.read_int(Token.Byte)
-                for i in range(array_len):
-                    self.recursive_decompress(array_type, reader, writer, structs)
-
-            case Token.Struct:
-                struct_id: int = reader.read_int(Token.Byte)
-                struct_len: int = reader.read_int(Token.Byte)
-                struct_def: list[int] = []
-                for i in range(struct_len):
-                    struct_def.append(reader.read_int(Token.Byte))
-                structs[struct_id] = struct_def
-
-            case _:
-                if block_id in structs:
-                    for i in range(len(structs[block_id])):
-                        self.recursive_decompress(
-                            structs[block_id][i], reader, writer, structs
-                        )
+            if token == Token.Array:
+                array_len: int = STRUCTS[Token.Short].unpack_from(data, position)[0]
+                array_type: int = data[position + 2]
+                position += 3
+
+                if array_type not in definitions:
+                    stack.append(repeat(array_type, array_len))
+                    continue
+
+                template: StructTemplate = structs[array_type]
+                if template.width is not None and array_len >= BULK_ARRAY_MIN:
+                    position = self.expand_array(
+                        data, position, template, array_len, output
+                    )
                 else:
-                    writer.write_bytes(bytes([block_id]))
+                    stack.append(
+                        chain.from_iterable(repeat(template.tokens, array_len))
+                    )
+
+            elif token == Token.Struct:
+                struct_id: int = data[position]
+                struct_len: int = data[position + 1]
+                structs.define(
+                    struct_id, tuple(data[position + 2 : position + 2 + struct_len])
+                )
+                position += 2 + struct_len
+
+            elif token in definitions:
+                stack.append(iter(structs[token].tokens))
+
+            elif token == Token.String:
+                end: int = reader.find_null(position) + 1
+                output.append(token)
+                output += data[position:end]
+                position = end
+
+            else:
+                size: int = VALUE_SIZES.get(token, 0)
+                output.append(token)
+                output += data[position : position + size]
+                position += size
+
+    def expand_array(
+        self,
+        data: Buffer,
+        position: int,
+        template: StructTemplate,
+        array_len: int,
+        output: bytearray,
+    ) -> int:
+        """Expands an array of fixed width structs with one strided copy per byte column"""
+
+        width: int = template.width or 0
+        stride: int = width + len(template.tokens)
+
+        values: bytes = bytes(data[position : position + width * array_len])
+        if len(values) != width * array_len:
+            raise ValueError(f'Array runs past the end of the data: {hex(position)}')
+
+        block: bytearray = bytearray(stride * array_len)
+        column: int = 0
+        source: int = 0
+        for token in template.tokens:
+            block[column::stride] = bytes([token]) * array_len
+            column += 1
+
+            for _ in range(VALUE_SIZES.get(token, 0)):
+                block[column::stride] = values[source::width]
+                column += 1
+                source += 1
+
+        output += block
+        return position + width * array_len
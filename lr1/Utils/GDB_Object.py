@@ -1,3 +1,5 @@
+from collections.abc import Sequence
+
 from ..Utils.GDB_Vertex import GDB_Vertex
 from ..Utils.GDB_Polygon import GDB_Polygon
 from ..Utils.GDB_Meta import GDB_Meta_Faces, GDB_Meta_Vertices, GDB_Meta_Bone
@@ -7,14 +9,14 @@ class GDB_Object:
     """A submodel of a GDB file, containing vertices, polygons, and a material.
 
     Attributes:
-        vertices (list[GDB_Vertex_Color]): List of vertices with color and UV data.
-        polygons (list[GDB_Polygon]): List of polygons (triangles).
+        vertices (Sequence[GDB_Vertex]): Vertices with color or normal and UV data, a GDB_VertexArray in columnar mode, usually a view of the GDB's columns.
+        polygons (Sequence[GDB_Polygon]): Polygons (triangles), a GDB_PolygonArray in columnar mode.
         material_id (int): ID of the material used by this object.
         bone (int): Bone ID associated with this object.
     """
 
-    vertices: list[GDB_Vertex]
-    polygons: list[GDB_Polygon]
+    vertices: Sequence[GDB_Vertex]
+    polygons: Sequence[GDB_Polygon]
     vertex_format: str
     material_id: int
     bone: int
@@ -25,8 +27,8 @@ class GDB_Object:
 
     def __init__(
         self,
-        vertices: list[GDB_Vertex] | None = None,
-        polygons: list[GDB_Polygon] | None = None,
+        vertices: Sequence[GDB_Vertex] | None = None,
+        polygons: Sequence[GDB_Polygon] | None = None,
         vertex_format: str = 'color',
         material_id: int = 0,
         meta_vertices: GDB_Meta_Vertices = GDB_Meta_Vertices(),
@@ -0,0 +1,21 @@
+class GDB_ObjectPlan:
+    """
+    How to build one object of a GDB from its vertex and face ranges
+
+    Attributes:
+        material_id (int): ID of the material used by the object
+        steps (list[tuple[list[int], list[int], list[int] | None, int]]): Vertex selector, previous vertex selector, face selector, and bone of each step, in order.  A step without a face selector adds the selector's vertices.
+        vertex_ranges (list[tuple[int, int]]): Start and end of each range of GDB vertices the object uses
+        face_ranges (list[tuple[int, int]]): Start and end of each range of GDB polygons the object uses
+    """
+
+    material_id: int
+    steps: list[tuple[list[int], list[int], list[int] | None, int]]
+    vertex_ranges: list[tuple[int, int]]
+    face_ranges: list[tuple[int, int]]
+
+    def __init__(self, material_id: int = 0) -> None:
+        self.material_id = material_id
+        self.steps = []
+        self.vertex_ranges = []
+        self.face_ranges = []
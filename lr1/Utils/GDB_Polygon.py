@@ -12,6 +12,9 @@ class GDB_Polygon:
 
     bone: int
 
+    # v0, v1, v2, see LRBinaryReader.compile_record
+    FIELDS: str = 'iii'
+
     def __init__(
         self, v0: int, v1: int, v2: int, uv: list[int] | None = None, bone: int = 0
     ) -> None:
@@ -23,14 +26,15 @@ class GDB_Polygon:
 
         self.bone = bone
 
-    def read(self: 'GDB_Polygon | None', reader: LRBinaryReader) -> 'GDB_Polygon':
-        val: GDB_Polygon = GDB_Polygon(0, 0, 0)
+    def from_record(
+        self: 'GDB_Polygon | None', record: tuple[int, ...]
+    ) -> 'GDB_Polygon':
+        """Make a polygon from the values of a record"""
 
-        val.v0 = reader.read_typed_int()
-        val.v1 = reader.read_typed_int()
-        val.v2 = reader.read_typed_int()
+        return GDB_Polygon(record[0], record[1], record[2])
 
-        return val
+    def read(self: 'GDB_Polygon | None', reader: LRBinaryReader) -> 'GDB_Polygon':
+        return GDB_Polygon.from_record(None, reader.read_record(GDB_Polygon.FIELDS))
 
     def __str__(self) -> str:
         return (
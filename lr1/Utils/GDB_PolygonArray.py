@@ -0,0 +1,74 @@
+from array import array
+from collections.abc import Iterable, Sequence
+from typing import overload
+
+from ..IO.LRBinaryReader import LRBinaryReader
+from ..IO.LRAssetFile import writable
+
+from ..Utils.GDB_Polygon import GDB_Polygon
+
+
+class GDB_PolygonArray(Sequence[GDB_Polygon]):
+    """
+    Triangles stored as one flat array of vertex indices
+
+    Polygon objects are only created when an item is accessed.  The polygons
+    of an object also have a bone each, and list their vertices as uv like
+    the polygons built one at a time.  Columns loaded from a stored asset are
+    read-only views of it, which are copied into arrays the first time the
+    polygons grow.
+
+    Attributes:
+        indices (array): v0, v1, and v2 of every triangle
+        bones (array): Bone of every triangle, empty for the polygons of a GDB
+    """
+
+    indices: array
+    bones: array
+
+    def __init__(
+        self, indices: array | None = None, bones: array | None = None
+    ) -> None:
+        self.indices = indices if indices is not None else array('i')
+        self.bones = bones if bones is not None else array('i')
+
+    def read_block(
+        self: 'GDB_PolygonArray | None', reader: LRBinaryReader
+    ) -> 'GDB_PolygonArray':
+        """Reads a polygon array block, decoding runs of polygons in bulk"""
+
+        return GDB_PolygonArray(reader.read_columns_block((GDB_Polygon.FIELDS,))[0])
+
+    def extend(self, indices: Iterable[int], bone: int) -> None:
+        """Adds triangles of an object, all with the same bone"""
+
+        self.indices = writable(self.indices)
+        self.bones = writable(self.bones)
+
+        count: int = len(self.indices)
+        self.indices.extend(indices)
+        self.bones.extend(array('i', (bone,)) * ((len(self.indices) - count) // 3))
+
+    def __len__(self) -> int:
+        return len(self.indices) // 3
+
+    @overload
+    def __getitem__(self, i: int) -> GDB_Polygon: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> list[GDB_Polygon]: ...
+
+    def __getitem__(self, i: int | slice) -> GDB_Polygon | list[GDB_Polygon]:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+
+        if i < 0:
+            i += len(self)
+        if i < 0 or i >= len(self):
+            raise IndexError(f'Index out of range: {i}')
+
+        v0, v1, v2 = self.indices[i * 3 : i * 3 + 3]
+        if not self.bones:
+            return GDB_Polygon(v0, v1, v2)
+
+        return GDB_Polygon(v0, v1, v2, [v0, v1, v2], self.bones[i])
@@ -0,0 +1,159 @@
+from array import array
+from collections.abc import Sequence
+from typing import overload
+
+from ..IO.LRBinaryReader import LRBinaryReader
+from ..IO.LRAssetFile import AssetArray, typecode, writable
+
+from ..Utils.LRVector3 import LRVector3
+from ..Utils.LRVector2 import LRVector2
+from ..Utils.LRColor import LRColor
+from ..Utils.GDB_Vertex import GDB_Vertex
+from ..Utils.GDB_Vertex_Color import GDB_Vertex_Color
+from ..Utils.GDB_Vertex_Normal import GDB_Vertex_Normal
+
+# Record layout of each vertex format: position, tex coords, color or normal
+LAYOUTS: dict[str, tuple[str, ...]] = {
+    'color': ('fff', 'ff', 'iiii'),
+    'normal': ('fff', 'ff', 'fff'),
+}
+
+
+class GDB_VertexArray(Sequence[GDB_Vertex]):
+    """
+    The vertices of a GDB, stored as one flat array per attribute
+
+    Vertex objects are only created when an item is accessed.  Columns
+    loaded from a stored asset, or shared with a larger array through view,
+    are memoryviews, which are copied into arrays the first time the
+    vertices grow.  An array can't grow itself while views of it exist.
+
+    Attributes:
+        vertex_format (str): 'color' or 'normal'
+        positions (array): X, Y, and Z of every vertex
+        tex_coords (array): U and V of every vertex
+        colors (array): R, G, B, and A of every vertex, if the format is 'color'
+        normals (array): X, Y, and Z of every vertex normal, if the format is 'normal'
+    """
+
+    vertex_format: str
+    positions: array
+    tex_coords: array
+    colors: array
+    normals: array
+
+    def __init__(
+        self,
+        vertex_format: str = 'color',
+        positions: array | None = None,
+        tex_coords: array | None = None,
+        extra: array | None = None,
+    ) -> None:
+        self.vertex_format = vertex_format
+        self.positions = positions if positions is not None else array('f')
+        self.tex_coords = tex_coords if tex_coords is not None else array('f')
+
+        if vertex_format == 'color':
+            self.colors = extra if extra is not None else array('i')
+            self.normals = array('f')
+        else:
+            self.colors = array('i')
+            self.normals = extra if extra is not None else array('f')
+
+    def read_block(
+        self: 'GDB_VertexArray | None', reader: LRBinaryReader, vertex_format: str
+    ) -> 'GDB_VertexArray':
+        """Reads a vertex array block, decoding runs of vertices in bulk"""
+
+        return GDB_VertexArray(
+            vertex_format, *reader.read_columns_block(LAYOUTS[vertex_format])
+        )
+
+    def empty_like(self) -> 'GDB_VertexArray':
+        """A new empty array with the same format and column types"""
+
+        return GDB_VertexArray(
+            self.vertex_format,
+            array(typecode(self.positions)),
+            array(typecode(self.tex_coords)),
+            array(
+                typecode(self.colors)
+                if self.vertex_format == 'color'
+                else typecode(self.normals)
+            ),
+        )
+
+    def view(self, start: int, count: int) -> 'GDB_VertexArray':
+        """Count vertices starting at start, sharing the columns of this array"""
+
+        end: int = start + count
+        extra: AssetArray = self.normals
+        width: int = 3
+        if self.vertex_format == 'color':
+            extra, width = self.colors, 4
+        return GDB_VertexArray(
+            self.vertex_format,
+            memoryview(self.positions)[start * 3 : end * 3],
+            memoryview(self.tex_coords)[start * 2 : end * 2],
+            memoryview(extra)[start * width : end * width],
+        )
+
+    def extend_range(self, other: 'GDB_VertexArray', start: int, count: int) -> None:
+        """Appends count vertices of another array, starting at start"""
+
+        self.make_writable()
+
+        end: int = start + count
+        self.positions.extend(other.positions[start * 3 : end * 3])
+        self.tex_coords.extend(other.tex_coords[start * 2 : end * 2])
+        if self.vertex_format == 'color':
+            self.colors.extend(other.colors[start * 4 : end * 4])
+        else:
+            self.normals.extend(other.normals[start * 3 : end * 3])
+
+    def make_writable(self) -> None:
+        """Copies columns that are views of a stored asset into arrays"""
+
+        self.positions = writable(self.positions)
+        self.tex_coords = writable(self.tex_coords)
+        self.colors = writable(self.colors)
+        self.normals = writable(self.normals)
+
+    def compact(self) -> None:
+        """Stores the colors as one byte each, if they all fit"""
+
+        if typecode(self.colors) != 'B':
+            try:
+                self.colors = array('B', self.colors)
+            except OverflowError:
+                pass
+
+    def __len__(self) -> int:
+        return len(self.positions) // 3
+
+    @overload
+    def __getitem__(self, i: int) -> GDB_Vertex: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> list[GDB_Vertex]: ...
+
+    def __getitem__(self, i: int | slice) -> GDB_Vertex | list[GDB_Vertex]:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+
+        if i < 0:
+            i += len(self)
+        if i < 0 or i >= len(self):
+            raise IndexError(f'Index out of range: {i}')
+
+        position: LRVector3 = LRVector3(*self.positions[i * 3 : i * 3 + 3])
+        tex_coords: LRVector2 = LRVector2(*self.tex_coords[i * 2 : i * 2 + 2])
+
+        if self.vertex_format == 'color':
+            return GDB_Vertex_Color(
+                position, tex_coords, LRColor(*self.colors[i * 4 : i * 4 + 4])
+            )
+
+        return GDB_Vertex_Normal(
+            position, tex_coords, LRVector3(*self.normals[i * 3 : i * 3 + 3])
+        )
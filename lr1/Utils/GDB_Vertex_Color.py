@@ -13,6 +13,9 @@ class GDB_Vertex_Color(GDB_Vertex):
     tex_coords: LRVector2
     color: LRColor
 
+    # Position, tex coords, and color, see LRBinaryReader.compile_record
+    FIELDS: str = 'fffffiiii'
+
     def __init__(
         self,
         position: LRVector3 = LRVector3(),
@@ -24,11 +27,10 @@ class GDB_Vertex_Color(GDB_Vertex):
         self.color = color
 
     def read(self, reader: LRBinaryReader) -> 'GDB_Vertex':
-        val: GDB_Vertex_Color = GDB_Vertex_Color()
-        val.position = LRVector3().read(reader)
-        val.tex_coords = LRVector2().read(reader)
-        val.color = LRColor().read(reader)
-        return val
+        x, y, z, u, v, r, g, b, a = reader.read_record(GDB_Vertex_Color.FIELDS)
+        return GDB_Vertex_Color(
+            LRVector3(x, y, z), LRVector2(u, v), LRColor(r, g, b, a)
+        )
 
     def __iter__(self) -> Iterator[float]:
         return iter(self.position.to_tuple())
@@ -12,6 +12,9 @@ class GDB_Vertex_Normal(GDB_Vertex):
     tex_coords: LRVector2
     normal: LRVector3
 
+    # Position, tex coords, and normal, see LRBinaryReader.compile_record
+    FIELDS: str = 'ffffffff'
+
     def __init__(
         self,
         position: LRVector3 = LRVector3(),
@@ -23,11 +26,10 @@ class GDB_Vertex_Normal(GDB_Vertex):
         self.normal = normal
 
     def read(self, reader: LRBinaryReader) -> 'GDB_Vertex':
-        val: GDB_Vertex_Normal = GDB_Vertex_Normal()
-        val.position = LRVector3().read(reader)
-        val.tex_coords = LRVector2().read(reader)
-        val.normal = LRVector3().read(reader)
-        return val
+        x, y, z, u, v, nx, ny, nz = reader.read_record(GDB_Vertex_Normal.FIELDS)
+        return GDB_Vertex_Normal(
+            LRVector3(x, y, z), LRVector2(u, v), LRVector3(nx, ny, nz)
+        )
 
     def __iter__(self) -> Iterator[float]:
         return iter(self.position.to_tuple())
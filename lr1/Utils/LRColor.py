@@ -10,6 +10,10 @@ class LRColor:
     b: int
     a: int
 
+    # Record layouts with and without alpha, see LRBinaryReader.compile_record
+    FIELDS: str = 'iiii'
+    FIELDS_NO_ALPHA: str = 'iii'
+
     def __init__(self, r: int = 0, g: int = 0, b: int = 0, a: int = 255) -> None:
         self.r = r
         self.g = g
@@ -20,12 +24,11 @@ class LRColor:
         self: 'LRColor', reader: 'LRBinaryReader', alpha: bool = True
     ) -> 'LRColor':
         val: LRColor = LRColor()
-        val.r = reader.read_typed_int()
-        val.g = reader.read_typed_int()
-        val.b = reader.read_typed_int()
 
         if alpha:
-            val.a = reader.read_typed_int()
+            val.r, val.g, val.b, val.a = reader.read_record(LRColor.FIELDS)
+        else:
+            val.r, val.g, val.b = reader.read_record(LRColor.FIELDS_NO_ALPHA)
 
         return val
 
@@ -11,6 +11,9 @@ class LRQuaternion:
     y: float
     z: float
 
+    # Record layout, see LRBinaryReader.compile_record
+    FIELDS: str = 'ffff'
+
     def __init__(self, q: tuple[float, float, float, float] = (1, 0, 0, 0)) -> None:
         self.w = q[0]
         self.x = q[1]
@@ -18,11 +21,8 @@ class LRQuaternion:
         self.z = q[3]
 
     def read(self, reader: 'LRBinaryReader') -> 'LRQuaternion':
-        val: LRQuaternion = LRQuaternion()
-        val.w = reader.read_float(True) / 127.0
-        val.x = reader.read_float(True) / 127.0
-        val.y = reader.read_float(True) / 127.0
-        val.z = reader.read_float(True) / 127.0
+        w, x, y, z = reader.read_record(LRQuaternion.FIELDS)
+        val: LRQuaternion = LRQuaternion((w / 127.0, x / 127.0, y / 127.0, z / 127.0))
 
         return val
 
@@ -9,14 +9,16 @@ class LRVector2:
     x: float
     y: float
 
+    # Record layout, see LRBinaryReader.compile_record
+    FIELDS: str = 'ff'
+
     def __init__(self, x: float = 0, y: float = 0) -> None:
         self.x = x
         self.y = y
 
     def read(self, reader: 'LRBinaryReader') -> 'LRVector2':
         val: LRVector2 = LRVector2()
-        val.x = reader.read_float(True)
-        val.y = reader.read_float(True)
+        val.x, val.y = reader.read_record(LRVector2.FIELDS)
 
         return val
 
@@ -10,6 +10,9 @@ class LRVector3:
     y: float
     z: float
 
+    # Record layout, see LRBinaryReader.compile_record
+    FIELDS: str = 'fff'
+
     def __init__(self, x: float = 0, y: float = 0, z: float = 0) -> None:
         self.x = x
         self.y = y
@@ -18,9 +21,7 @@ class LRVector3:
     def read(self, reader: 'LRBinaryReader') -> 'LRVector3':
         """Reads the vector components from a file"""
         val: LRVector3 = LRVector3()
-        val.x = reader.read_float(True)
-        val.y = reader.read_float(True)
-        val.z = reader.read_float(True)
+        val.x, val.y, val.z = reader.read_record(LRVector3.FIELDS)
 
         return val
 
@@ -0,0 +1,39 @@
+from array import array
+from collections.abc import Sequence
+from typing import overload
+
+from .LRVector3 import LRVector3
+
+
+class LRVector3Array(Sequence[LRVector3]):
+    """
+    A list of LRVector3 stored as one flat array of floats
+
+    Attributes:
+        coords (array): X, Y, and Z of every vector, one after another
+    """
+
+    coords: array
+
+    def __init__(self, coords: array | None = None) -> None:
+        self.coords = coords if coords is not None else array('f')
+
+    def __len__(self) -> int:
+        return len(self.coords) // 3
+
+    @overload
+    def __getitem__(self, i: int) -> LRVector3: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> list[LRVector3]: ...
+
+    def __getitem__(self, i: int | slice) -> LRVector3 | list[LRVector3]:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+
+        if i < 0:
+            i += len(self)
+        if i < 0 or i >= len(self):
+            raise IndexError(f'Index out of range: {i}')
+
+        return LRVector3(*self.coords[i * 3 : i * 3 + 3])
@@ -1,3 +1,4 @@
+from typing import Any
 from enum import IntEnum
 
 from .LRColor import LRColor
@@ -111,6 +112,32 @@ class MDB_Material:
                     raise ValueError(property_id, reader.position - 1)
         return val
 
+    def to_values(self) -> dict[str, Any]:
+        """The properties as JSON values, without the texture"""
+
+        values: dict[str, Any] = {
+            name: value for name, value in vars(self).items() if name != 'texture'
+        }
+        values['ambient_color'] = (
+            None if self.ambient_color is None else list(self.ambient_color)
+        )
+        values['diffuse_color'] = list(self.diffuse_color)
+        return values
+
+    def from_values(
+        self: 'MDB_Material | None', values: dict[str, Any]
+    ) -> 'MDB_Material':
+        """A material with the properties from to_values"""
+
+        val: MDB_Material = MDB_Material()
+        vars(val).update(values)
+        if values['ambient_color'] is not None:
+            val.ambient_color = LRColor(*values['ambient_color'])
+        val.diffuse_color = LRColor(*values['diffuse_color'])
+        if val.texture_name != '':
+            val.texture = BMP()
+        return val
+
     def bool_str(self, value: bool | None) -> str:
         """Make a bool easier to read in debug output"""
 
@@ -11,6 +11,9 @@ class RRB_Node:
     f2: float
     timing: int
 
+    # Position, rotation, f1, f2, and timing, see LRBinaryReader.compile_record
+    FIELDS: str = 'iiiiiiibbB'
+
     def __init__(self, f1: float = 0, f2: float = 0, timing: int = 0) -> None:
         self.position = LRVector3()
         self.rotation = LRQuaternion()
@@ -18,28 +21,28 @@ class RRB_Node:
         self.f2 = f2
         self.timing = timing
 
-    def read(self, reader: LRBinaryReader) -> 'RRB_Node':
-        val: RRB_Node = RRB_Node()
+    def from_record(self: 'RRB_Node | None', record: tuple[int, ...]) -> 'RRB_Node':
+        """Make a node from the values of a record"""
+
+        val: RRB_Node = RRB_Node(record[7], record[8], record[9])
 
         # Don't use LRVector3.Read() here because we are not reading floats
-        val.position.x = reader.read_typed_int()
-        val.position.y = reader.read_typed_int()
-        val.position.z = reader.read_typed_int()
+        val.position.x = record[0]
+        val.position.y = record[1]
+        val.position.z = record[2]
         val.position.scale(1.0 / 256, 1.0 / 256, 1.0 / 16)
 
         # ZWXY?
-        val.rotation.z = reader.read_typed_int() / 127.0
-        val.rotation.w = reader.read_typed_int() / 127.0
-        val.rotation.x = reader.read_typed_int() / 127.0
-        val.rotation.y = reader.read_typed_int() / 127.0
-
-        val.f1 = reader.read_int(Token.SByte, True)
-        val.f2 = reader.read_int(Token.SByte, True)
-
-        val.timing = reader.read_int(Token.Byte, True)
+        val.rotation.z = record[3] / 127.0
+        val.rotation.w = record[4] / 127.0
+        val.rotation.x = record[5] / 127.0
+        val.rotation.y = record[6] / 127.0
 
         return val
 
+    def read(self: 'RRB_Node | None', reader: LRBinaryReader) -> 'RRB_Node':
+        return RRB_Node.from_record(None, reader.read_record(RRB_Node.FIELDS))
+
     def __str__(self) -> str:
         return (
             'RRB_Node: {'
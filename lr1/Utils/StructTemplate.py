@@ -0,0 +1,153 @@
+import struct
+
+from .Token import Token
+from ..IO.LRBinaryReader import FORMAT, STRUCTS
+
+# Size of the value following each fixed width token
+VALUE_SIZES: dict[int, int] = {
+    token: unpacker.size for token, unpacker in STRUCTS.items()
+}
+
+# Tokens that read something other than a fixed width value from the data
+VARIABLE_TOKENS: frozenset[int] = frozenset(
+    {Token.String, Token.Array, Token.Struct}
+)
+
+# Tokens that always mean the same thing and can't be used as struct ids
+RESERVED_TOKENS: frozenset[int] = frozenset(Token)
+
+
+class StructTemplate:
+    """
+    A struct definition with every nested struct already expanded
+
+    Attributes:
+        tokens (tuple[int, ...]): The flat list of tokens the struct stands for
+        refs (frozenset[int]): Every non-token byte seen while expanding
+        width (int | None): Size of the values of one struct, or None if it varies
+        unpacker (struct.Struct | None): Unpacks the values of one struct, if the width is fixed
+        balanced (bool): Whether every bracket the struct opens is closed in it too
+    """
+
+    tokens: tuple[int, ...]
+    refs: frozenset[int]
+    width: int | None
+    unpacker: struct.Struct | None
+    balanced: bool
+
+    def __init__(self, tokens: tuple[int, ...], refs: frozenset[int]) -> None:
+        self.tokens = tokens
+        self.refs = refs
+
+        depth: int = 0
+        for token in tokens:
+            if token == Token.LeftCurly or token == Token.LeftBracket:
+                depth += 1
+            elif token == Token.RightCurly or token == Token.RightBracket:
+                depth -= 1
+        self.balanced = depth == 0
+
+        if VARIABLE_TOKENS.isdisjoint(tokens):
+            fmt: str = ''.join(FORMAT.get(token, '') for token in tokens)
+            self.unpacker = struct.Struct(f'<{fmt}')
+            self.width = self.unpacker.size
+        else:
+            self.unpacker = None
+            self.width = None
+
+
+class StructTable:
+    """
+    The struct definitions declared so far in a compressed token stream
+
+    Each definition is flattened into a StructTemplate as soon as it is
+    declared.  Templates that refer to a struct id are compiled again when
+    that id is (re)declared, so expanding a template always gives the same
+    tokens as walking the definitions at the time of use.
+
+    Attributes:
+        definitions (dict[int, tuple[int, ...]]): The raw definitions by id
+        templates (dict[int, StructTemplate]): The flattened definitions by id
+    """
+
+    definitions: dict[int, tuple[int, ...]]
+    templates: dict[int, StructTemplate]
+
+    def __init__(self) -> None:
+        self.definitions = {}
+        self.templates = {}
+
+    def __contains__(self, struct_id: int) -> bool:
+        return struct_id in self.definitions
+
+    def __getitem__(self, struct_id: int) -> StructTemplate:
+        template: StructTemplate | None = self.templates.get(struct_id)
+        if template is None:
+            raise ValueError(f'Struct {hex(struct_id)} is defined in terms of itself')
+        return template
+
+    def copy(self) -> 'StructTable':
+        """A table of its own with the same definitions"""
+
+        table: StructTable = StructTable()
+        table.definitions = dict(self.definitions)
+        table.templates = dict(self.templates)
+        return table
+
+    def define(self, struct_id: int, definition: tuple[int, ...]) -> None:
+        """Adds or replaces a struct definition"""
+
+        # These ids are always read as tokens, so the struct could never be used
+        if struct_id in RESERVED_TOKENS:
+            return
+
+        self.definitions[struct_id] = definition
+
+        stale: list[int] = [
+            other_id
+            for other_id in self.definitions
+            if other_id != struct_id
+            and (
+                other_id not in self.templates
+                or struct_id in self.templates[other_id].refs
+            )
+        ]
+        self.compile(struct_id)
+        for other_id in stale:
+            self.compile(other_id)
+
+    def compile(self, struct_id: int) -> None:
+        """Flattens a struct definition into a template"""
+
+        tokens: list[int] = []
+        refs: set[int] = set()
+
+        # Walk the definitions without recursion
+        stack: list[tuple[tuple[int, ...], int]] = [(self.definitions[struct_id], 0)]
+        expanding: list[int] = [struct_id]
+
+        while stack:
+            definition, index = stack[-1]
+            if index == len(definition):
+                stack.pop()
+                expanding.pop()
+                continue
+            stack[-1] = (definition, index + 1)
+
+            token: int = definition[index]
+            if token in RESERVED_TOKENS:
+                tokens.append(token)
+                continue
+
+            refs.add(token)
+            if token not in self.definitions:
+                tokens.append(token)
+            elif token in expanding:
+                # Recursive definitions can never be expanded
+                self.templates.pop(struct_id, None)
+                return
+            else:
+                stack.append((self.definitions[token], 0))
+                expanding.append(token)
+
+        self.templates[struct_id] = StructTemplate(tuple(tokens), frozenset(refs))
@@ -1,3 +1,4 @@
+from typing import Any
 from enum import IntEnum
 
 from ..IO.LRBinaryReader import LRBinaryReader
@@ -66,6 +67,23 @@ class TDB_Texture:
 
         return val
 
+    def to_values(self) -> dict[str, Any]:
+        """The properties as JSON values"""
+
+        values: dict[str, Any] = dict(vars(self))
+        values['color'] = list(self.color)
+        return values
+
+    def from_values(
+        self: 'TDB_Texture | None', values: dict[str, Any]
+    ) -> 'TDB_Texture':
+        """A texture with the properties from to_values"""
+
+        val: TDB_Texture = TDB_Texture()
+        vars(val).update(values)
+        val.color = LRColor(*values['color'])
+        return val
+
     def bool_str(self, value: bool | None) -> str:
         """Make a bool easier to read in debug output"""
 
@@ -0,0 +1,165 @@
+"""Command line tools for Lego Racers files
+
+Extract files from a JAM archive:
+
+    python -m lr1 extract LEGO.JAM OUTPUT [--pattern /GAMEDATA/**] [--workers N]
+
+Build a JAM archive from directories, on top of an existing archive if given:
+
+    python -m lr1 pack OUTPUT.JAM DIRECTORY [DIRECTORY ...] [--base LEGO.JAM]
+
+Compare two archives, or copy their distinct files into a shared store:
+
+    python -m lr1 diff OLD.JAM NEW.JAM
+    python -m lr1 dedupe STORE LEGO.JAM [LEGO.JAM ...]
+
+Expand the Array/Struct compression of a file, on disk or in an archive:
+
+    python -m lr1 expand FILE OUTPUT [--jam LEGO.JAM]
+"""
+
+import argparse
+import pathlib
+import sys
+import time
+
+from .JAM import JAM, JamItem
+from .JAMWriter import JAMWriter
+from .JAMHashIndex import JAMHashIndex
+from .IO.LRFile import LRFileItem
+from .Utils.BinaryFileHelper import BinaryFileHelper
+
+
+def print_progress(done: int, total: int) -> None:
+    print(f'\r{done}/{total} files', end='', file=sys.stderr, flush=True)
+
+
+def extract(args: argparse.Namespace) -> None:
+    with JAM(args.jam, memory_map=True, lazy=bool(args.pattern)) as jam:
+        items: list[JamItem] | None = None
+        if args.pattern:
+            # Expand '/DIR' to everything under it, like '/DIR/**'
+            items = []
+            for pattern in args.pattern:
+                for item in jam.glob(pattern):
+                    items.append(item)
+                    if item.is_directory:
+                        items.extend(jam.glob(f'{item.path}/**/*'))
+
+        start: float = time.perf_counter()
+        written: int = jam.extract_all(
+            args.output,
+            items,
+            workers=args.workers,
+            progress=None if args.quiet else print_progress,
+        )
+        seconds: float = time.perf_counter() - start
+
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(f'{written:,} bytes in {seconds:.2f} s')
+
+
+def pack(args: argparse.Namespace) -> None:
+    base: JAM | None = None
+    if args.base:
+        base = JAM(args.base, memory_map=True)
+
+    # Later directories override earlier ones and the base archive
+    writer: JAMWriter = JAMWriter(base)
+    for directory in args.directories:
+        writer.add_tree(directory)
+
+    start: float = time.perf_counter()
+    written: int = writer.write(args.output)
+    seconds: float = time.perf_counter() - start
+
+    if base is not None:
+        base.close()
+    print(f'{written:,} bytes in {seconds:.2f} s')
+
+
+def diff(args: argparse.Namespace) -> None:
+    old: JAMHashIndex = JAMHashIndex(JAM(args.old, memory_map=True))
+    new: JAMHashIndex = JAMHashIndex(JAM(args.new, memory_map=True))
+    changes = old.diff(new)
+
+    for marker, paths in (
+        ('+', changes.added),
+        ('-', changes.removed),
+        ('M', changes.changed),
+    ):
+        for path in paths:
+            print(f'{marker} {path}')
+    print(changes)
+
+
+def dedupe(args: argparse.Namespace) -> None:
+    for name in args.jams:
+        added: int = JAMHashIndex(JAM(name, memory_map=True)).dedupe(args.store)
+        print(f'{name}: {added} new files in {args.store}')
+
+
+def expand(args: argparse.Namespace) -> None:
+    data: bytes
+    if args.jam:
+        with JAM(args.jam, memory_map=True) as jam:
+            data = jam.extract_file(args.file).read_bytes()
+    else:
+        data = LRFileItem(args.file).read_bytes()
+
+    expanded: bytearray = BinaryFileHelper().expand(data)
+    pathlib.Path(args.output).write_bytes(expanded)
+    print(f'{len(data):,} bytes expanded to {len(expanded):,} bytes')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog='python -m lr1', description=__doc__.splitlines()[0]
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    extract_parser = commands.add_parser('extract', help='extract files from a JAM')
+    extract_parser.add_argument('jam', help='the JAM archive')
+    extract_parser.add_argument('output', help='directory to extract into')
+    extract_parser.add_argument(
+        '--pattern',
+        action='append',
+        help='glob of the entries to extract, may be repeated (default: all)',
+    )
+    extract_parser.add_argument('--workers', type=int, default=None)
+    extract_parser.add_argument('--quiet', action='store_true')
+    extract_parser.set_defaults(func=extract)
+
+    pack_parser = commands.add_parser('pack', help='build a JAM from directories')
+    pack_parser.add_argument('output', help='the JAM archive to write')
+    pack_parser.add_argument('directories', nargs='*', help='directories to add')
+    pack_parser.add_argument('--base', help='JAM archive to start from')
+    pack_parser.set_defaults(func=pack)
+
+    diff_parser = commands.add_parser('diff', help='compare two JAMs by content')
+    diff_parser.add_argument('old')
+    diff_parser.add_argument('new')
+    diff_parser.set_defaults(func=diff)
+
+    dedupe_parser = commands.add_parser(
+        'dedupe', help='copy distinct files into a content-addressed store'
+    )
+    dedupe_parser.add_argument('store')
+    dedupe_parser.add_argument('jams', nargs='+')
+    dedupe_parser.set_defaults(func=dedupe)
+
+    expand_parser = commands.add_parser(
+        'expand', help='write a file with its arrays and structs expanded'
+    )
+    expand_parser.add_argument('file', help='the file, inside the JAM if given')
+    expand_parser.add_argument('output', help='the expanded file to write')
+    expand_parser.add_argument('--jam', help='JAM archive to read the file from')
+    expand_parser.set_defaults(func=expand)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+import pathlib
+
+from lr1.JAM import JAM
+from lr1.AssetCache import AssetCache, ASSET_SUFFIX
+from lr1.BMP import BMP
+from lr1.BVB import BVB
+from lr1.GDB import GDB
+from lr1.MDB import MDB
+from lr1.IO.LRAssetFile import LRAssetFile
+from lr1.Utils.GDB_VertexArray import GDB_VertexArray
+
+filename_jam: str = 'tests/LEGO.JAM'
+filename_gdb: str = '/GAMEDATA/RACEC0R1/TRACK.GDB'
+filename_bvb: str = '/GAMEDATA/RACEC0R1/IGCOLLID.BVB'
+filename_mdb: str = '/GAMEDATA/RACEC0R1/COMBINED.MDB'
+
+
+def test_asset_cache(tmp_path: pathlib.Path) -> None:
+    jam: JAM = JAM(filename_jam)
+    cache: AssetCache = AssetCache(tmp_path)
+
+    # The first load parses and stores each file
+    gdb: GDB = cache.load(GDB, jam.extract_file(filename_gdb))
+    bvb: BVB = cache.load(BVB, jam.extract_file(filename_bvb))
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert len(list(tmp_path.glob(f'*{ASSET_SUFFIX}'))) == 2
+
+    # Later loads map the stored arrays
+    stored_gdb: GDB = cache.load(GDB, jam.extract_file(filename_gdb))
+    stored_bvb: BVB = cache.load(BVB, jam.extract_file(filename_bvb))
+    assert (cache.hits, cache.misses) == (2, 2)
+
+    assert stored_gdb.materials == gdb.materials
+    assert stored_gdb.vertex_format == gdb.vertex_format
+    assert list(stored_gdb.vertices.positions) == list(gdb.vertices.positions)
+    assert list(stored_gdb.polygons.indices) == list(gdb.polygons.indices)
+    assert len(stored_gdb.objects) == len(gdb.objects)
+    for stored, parsed in zip(stored_gdb.objects, gdb.objects):
+        assert stored.material_id == parsed.material_id
+        assert list(stored.vertices.positions) == list(parsed.vertices.positions)
+        assert list(stored.polygons.indices) == list(parsed.polygons.indices)
+
+    assert list(stored_bvb.vertices.coords) == list(bvb.vertices.coords)
+    assert [vars(p) for p in stored_bvb.polygons] == [vars(p) for p in bvb.polygons]
+    assert len(stored_bvb.polygon_ranges) == len(bvb.polygon_ranges)
+
+    # Textures of materials are stored as well
+    mdb: MDB = cache.load(MDB, jam.extract_file(filename_mdb))
+    stored_mdb: MDB = cache.load(MDB, jam.extract_file(filename_mdb))
+    assert str(stored_mdb.materials['caveroad']) == str(mdb.materials['caveroad'])
+    texture: BMP = mdb.materials['caveroad'].texture
+    stored_texture: BMP = stored_mdb.materials['caveroad'].texture
+    assert [vars(pixel) for pixel in stored_texture.image] == [
+        vars(pixel) for pixel in texture.image
+    ]
+
+    # A stored asset for another version of the file is not used
+    other: AssetCache = AssetCache(tmp_path)
+    for path in tmp_path.glob(f'*.GDB{ASSET_SUFFIX}'):
+        path.write_bytes(b'broken')
+    other.load(GDB, jam.extract_file(filename_gdb))
+    assert (other.hits, other.misses) == (0, 1)
+
+
+def test_asset_gdb_objects(tmp_path: pathlib.Path) -> None:
+    file = JAM(filename_jam).extract_file(filename_gdb)
+    gdb: GDB = GDB(file, columnar=True)
+    asset: LRAssetFile = LRAssetFile('GDB', 'key')
+    gdb.to_asset(asset)
+    asset.write(tmp_path / 'TRACK.GDB.lrasset')
+
+    stored_asset: LRAssetFile | None = LRAssetFile.read(
+        None, tmp_path / 'TRACK.GDB.lrasset', 'GDB', 'key'
+    )
+    assert stored_asset is not None
+    stored: GDB = GDB.from_asset(None, stored_asset, file)
+
+    # The mapped columns can be built on and stored again
+    vertices: GDB_VertexArray = stored.vertices.empty_like()
+    vertices.extend_range(stored.vertices, 0, 3)
+    assert list(vertices.positions) == list(gdb.vertices.positions[:9])
+
+    stored.generate_objects()
+    assert [len(object.polygons) for object in stored.objects] == [
+        len(object.polygons) for object in gdb.objects
+    ]
+    stored.objects[0].polygons.extend([0, 1, 2], 1)
+    assert len(stored.objects[0].polygons) == len(gdb.objects[0].polygons) + 1
+
+    stored.to_asset(LRAssetFile('GDB', 'key'))
@@ -0,0 +1,38 @@
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+
+from lr1.AsyncLoader import AsyncLoader, load_many, load_mdb
+from lr1.JAM import JAM
+from lr1.MDB import MDB
+from lr1.TDB import TDB
+
+filename_jam: str = 'tests/LEGO.JAM'
+filename_mdb: str = '/GAMEDATA/RACEC0R1/COMBINED.MDB'
+filename_tdb: str = '/GAMEDATA/RACEC0R1/COMBINED.TDB'
+
+
+def test_load_mdb() -> None:
+    jam: JAM = JAM(filename_jam)
+    file = jam.extract_file(filename_mdb)
+
+    mdb: MDB = asyncio.run(load_mdb(file))
+    expected: MDB = MDB(file)
+    assert mdb.materials.keys() == expected.materials.keys()
+    assert str(mdb.materials['caveroad']) == str(expected.materials['caveroad'])
+
+
+def test_load_many() -> None:
+    jam: JAM = JAM(filename_jam)
+    files = [jam.extract_file(filename_tdb)] * 8
+
+    async def load_all() -> tuple[list[TDB], list[TDB]]:
+        with ThreadPoolExecutor(4) as executor:
+            loader: AsyncLoader = AsyncLoader(executor, concurrency=2)
+            shared: list[TDB] = await loader.load_many(TDB, files)
+        return shared, await load_many(TDB, files[:2])
+
+    # The same file is parsed by several tasks at once
+    shared, separate = asyncio.run(load_all())
+    assert len(shared) == 8 and len(separate) == 2
+    for tdb in shared + separate:
+        assert tdb.textures.keys() == TDB(files[0]).textures.keys()
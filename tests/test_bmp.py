@@ -1,5 +1,12 @@
+import pathlib
+import struct
+
+import pytest
+
 from lr1.BMP import BMP
 from lr1.JAM import JAM
+from lr1.IO.LRFile import LRFileItem
+from lr1.Utils.BMP_BitmapColor import BitmapColor
 
 filename_jam: str = 'tests/LEGO.JAM'
 jam: JAM = JAM(filename_jam)
@@ -16,3 +23,49 @@ def test_BMP() -> None:
     assert bmp.height == 16
     assert bmp.image[20].as_float() == (0.0, 1.0, 0.0, 1.0)
     assert bmp.image[238].as_float() == (1.0, 1.0, 0.0, 1.0)
+
+
+def test_BMP_rgba() -> None:
+    bmp: BMP = BMP(jam.extract_file(filename_bmp))
+
+    # The RGBA pixels are expanded on demand
+    rgba: bytes = bmp.rgba()
+    assert len(rgba) == 256 * 4
+    assert rgba[20 * 4 : 21 * 4] == bytes((0, 255, 0, 255))
+    assert bmp.flat_pixels()[20 * 4 : 21 * 4] == [0.0, 1.0, 0.0, 1.0]
+    assert bmp.get_pixel(4, 1).as_float() == (0.0, 1.0, 0.0, 1.0)
+
+
+def test_BMP_palette() -> None:
+    bmp: BMP = BMP.checker_fallback(None)
+
+    # One palette index per pixel
+    assert bmp.indices is not None
+    assert len(bmp.indices) == 64
+    assert bmp.rgba()[:4] == bytes((248, 0, 248, 255))
+    image: list[BitmapColor] = bmp.image
+    assert image[4] is image[32]
+
+    # Changing a palette color changes every pixel using it
+    bmp.make_transparent((0.0, 0.0, 0.0, 1.0))
+    assert bmp.get_pixel(4, 0).as_float() == (0.0, 0.0, 0.0, 0.0)
+    assert bmp.rgba()[4 * 4 : 5 * 4] == bytes((0, 0, 0, 0))
+    assert bmp.rgba()[:4] == bytes((248, 0, 248, 255))
+
+
+def test_BMP_bad_indices(tmp_path: pathlib.Path) -> None:
+    # Four 4-bit pixels with a two color palette, two of them past it
+    (tmp_path / 'FONT.BMP').write_bytes(
+        bytes([0x04, 0x01])
+        + struct.pack('<hh', 4, 1)
+        + bytes([0x00, 0x00, 0xFF, 0x00, 0xFF, 0x00])
+        + struct.pack('<hh', 2, 2)
+        + bytes([0x0F, 0x1F])
+    )
+
+    # One warning for the whole image, and the bad pixels are red
+    with pytest.warns(UserWarning, match='2 pixels') as record:
+        bmp: BMP = BMP(LRFileItem(tmp_path / 'FONT.BMP'))
+    assert len(record) == 1
+    assert bmp.get_pixel(1, 0).as_float() == (1.0, 0.0, 0.0, 1.0)
+    assert bmp.get_pixel(2, 0).as_float() == (0.0, 1.0, 0.0, 1.0)
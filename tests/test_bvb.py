@@ -1,4 +1,4 @@
-from lr1.BVB import BVB
+from lr1.BVB import BVB, ID
 from lr1.JAM import JAM
 
 filename_bvb: str = '/GAMEDATA/RACEC0R1/IGCOLLID.BVB'
@@ -30,3 +30,34 @@ def test_BVB() -> None:
         )
         == test_bvb_tree
     )
+
+
+def test_BVB_blocks() -> None:
+    file = JAM(filename_jam).extract_file(filename_bvb)
+    bvb: BVB = BVB(file)
+    materials: BVB = BVB(file, blocks={ID.MATERIALS})
+
+    # The other blocks are skipped without being decoded
+    assert materials.materials == bvb.materials
+    assert len(materials.vertices) == 0
+    assert materials.polygons == []
+    assert materials.polygon_ranges == []
+
+    ranges: BVB = BVB(file, blocks={ID.POLYGON_RANGES})
+    assert ranges.materials == []
+    assert [str(r) for r in ranges.polygon_ranges] == [
+        str(r) for r in bvb.polygon_ranges
+    ]
+
+
+def test_BVB_tape() -> None:
+    file = JAM(filename_jam).extract_file(filename_bvb)
+    bvb: BVB = BVB(file)
+    tape: BVB = BVB(file, tape=True)
+
+    assert tape.materials == bvb.materials
+    assert [str(v) for v in tape.vertices] == [str(v) for v in bvb.vertices]
+    assert [str(p) for p in tape.polygons] == [str(p) for p in bvb.polygons]
+    assert [str(r) for r in tape.polygon_ranges] == [
+        str(r) for r in bvb.polygon_ranges
+    ]
@@ -0,0 +1,173 @@
+import pathlib
+import struct
+import sys
+
+import pytest
+
+from lr1.__main__ import main
+from lr1.IO.LRColumnCursor import LRColumnCursor
+from lr1.IO.LRCompressedReader import LRCompressedReader
+from lr1.Utils.BinaryFileHelper import BinaryFileHelper, BULK_ARRAY_MIN
+from lr1.Utils.Token import Token
+
+
+def int32(value: int) -> bytes:
+    return struct.pack('<i', value)
+
+
+def float32(value: float) -> bytes:
+    return struct.pack('<f', value)
+
+
+def array_header(count: int, array_type: int) -> bytes:
+    return bytes([Token.Array]) + struct.pack('<h', count) + bytes([array_type])
+
+
+def define(struct_id: int, tokens: list[int]) -> bytes:
+    return bytes([Token.Struct, struct_id, len(tokens), *tokens])
+
+
+def test_struct_redefinition() -> None:
+    reader: LRCompressedReader = LRCompressedReader(
+        define(0x30, [Token.Int32, Token.Int32])
+        + bytes([0x30])
+        + int32(1)
+        + int32(2)
+        + define(0x30, [Token.Float])
+        + bytes([0x30])
+        + float32(0.5)
+    )
+
+    # The values use the tokens of the definition in effect when they are read
+    assert reader.read_int(Token.Int32, True) == 1
+    assert reader.read_int(Token.Int32, True) == 2
+    assert reader.read_float(True) == 0.5
+    assert reader.at_end()
+
+
+def test_nested_structs() -> None:
+    reader: LRCompressedReader = LRCompressedReader(
+        define(0x30, [Token.Byte, Token.Short])
+        + define(0x31, [Token.LeftCurly, 0x30, Token.RightCurly])
+        + bytes([0x31, 0x07])
+        + struct.pack('<h', -3)
+    )
+
+    # A struct inside a struct expands to the tokens of both
+    reader.expect(Token.LeftCurly)
+    assert reader.read_int(Token.Byte, True) == 7
+    assert reader.read_int(Token.Short, True) == -3
+    reader.expect(Token.RightCurly)
+    assert reader.at_end()
+
+
+def test_array_of_structs() -> None:
+    records: list[tuple[int, float]] = [(i, i / 4) for i in range(40)]
+    reader: LRCompressedReader = LRCompressedReader(
+        define(0x30, [Token.Byte, Token.Float])
+        + array_header(len(records), 0x30)
+        + b''.join(bytes([i]) + float32(value) for i, value in records)
+        + bytes([Token.Byte, 0x63])
+    )
+
+    for i, value in records:
+        assert reader.read_int(Token.Byte, True) == i
+        assert reader.read_float(True) == value
+    assert reader.read_int(Token.Byte, True) == 0x63
+    assert reader.at_end()
+
+
+def test_array_of_strings() -> None:
+    names: list[str] = ['road', '', 'checker']
+    reader: LRCompressedReader = LRCompressedReader(
+        array_header(len(names), Token.String)
+        + b''.join(name.encode() + b'\x00' for name in names)
+        + bytes([Token.Int32])
+        + int32(-1)
+    )
+
+    assert [reader.read_string(True) for _ in names] == names
+    assert reader.read_int(Token.Int32, True) == -1
+    assert reader.at_end()
+
+
+def test_empty_arrays() -> None:
+    reader: LRCompressedReader = LRCompressedReader(
+        array_header(0, Token.Int32)
+        + define(0x30, [Token.Float])
+        + array_header(0, 0x30)
+        + bytes([Token.LeftBracket, Token.RightBracket])
+    )
+
+    # Empty arrays add no tokens at all
+    assert reader.peek_token() == Token.LeftBracket
+    reader.expect(Token.LeftBracket)
+    reader.expect(Token.RightBracket)
+    assert reader.at_end()
+
+
+def test_column_cursor() -> None:
+    # Records wrapped in arrays of one value can't be sliced out as a run
+    records: bytes = b''.join(
+        (array_header(1, Token.Byte) if 10 <= i < 20 else bytes([Token.Byte]))
+        + bytes([i, Token.Float])
+        + float32(i / 2)
+        for i in range(30)
+    )
+    reader: LRCompressedReader = LRCompressedReader(
+        bytes([Token.LeftBracket, Token.Int32])
+        + int32(30)
+        + bytes([Token.RightBracket, Token.LeftCurly])
+        + records
+        + bytes([Token.RightCurly])
+    )
+    cursor: LRColumnCursor = LRColumnCursor.read_block(None, reader, ('i', 'f'))
+    assert reader.at_end()
+    assert [(first, end) for first, end, _ in cursor.segments] == [
+        (0, 10),
+        (10, 20),
+        (20, 30),
+    ]
+
+    # Each range is decoded on its own, without the records in front of it
+    cursor.decode_range(15, 17)
+    assert cursor.decoded == 2
+    assert not cursor.is_decoded(0, 15)
+    cursor.decode_range(12, 25)
+    assert cursor.decoded == 13
+    assert list(cursor.columns[0][12:25]) == list(range(12, 25))
+
+    cursor.decode_range(0, 30)
+    assert list(cursor.columns[0]) == list(range(30))
+    assert list(cursor.columns[1]) == [i / 2 for i in range(30)]
+    assert cursor.segments == []
+
+
+def test_expand(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    records: list[tuple[int, float]] = [(i, i / 4) for i in range(BULK_ARRAY_MIN + 4)]
+    stream: bytes = (
+        define(0x30, [Token.Byte, Token.Float])
+        + array_header(2, 0x30)
+        + b''.join(bytes([i]) + float32(value) for i, value in records[:2])
+        + array_header(len(records), 0x30)
+        + b''.join(bytes([i]) + float32(value) for i, value in records)
+        + array_header(2, Token.String)
+        + b'a\x00bc\x00'
+    )
+
+    # Short and bulk arrays expand to the same tokens the reader walks through
+    expected: bytes = b''.join(
+        bytes([Token.Byte, i, Token.Float]) + float32(value)
+        for i, value in records[:2] + records
+    ) + bytes([Token.String]) + b'a\x00' + bytes([Token.String]) + b'bc\x00'
+    assert BinaryFileHelper().expand(stream) == expected
+
+    # The same from the command line
+    (tmp_path / 'A.GDB').write_bytes(stream)
+    monkeypatch.setattr(
+        sys,
+        'argv',
+        ['lr1', 'expand', str(tmp_path / 'A.GDB'), str(tmp_path / 'A.OUT')],
+    )
+    main()
+    assert (tmp_path / 'A.OUT').read_bytes() == expected
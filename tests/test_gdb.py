@@ -1,6 +1,14 @@
+import random
+
 from lr1.JAM import JAM
-from lr1.GDB import GDB
+from lr1.GDB import GDB, ID
+from lr1.IO.LRColumnCursor import LRColumnCursor
 from lr1.MDB import MDB, MDB_Material
+from lr1.Utils.GDB_Object import GDB_Object
+from lr1.Utils.GDB_ObjectPlan import GDB_ObjectPlan
+from lr1.Utils.GDB_Polygon import GDB_Polygon
+from lr1.Utils.GDB_PolygonArray import GDB_PolygonArray
+from lr1.Utils.GDB_VertexArray import GDB_VertexArray
 from lr1.Utils.GDB_Vertex_Color import GDB_Vertex_Color
 
 filename_jam: str = 'tests/LEGO.JAM'
@@ -49,4 +57,158 @@ def test_GDB() -> None:
 
     # Test a file with spooky errors
     file = jam.extract_file(filenames[2])
-    gdb: GDB = GDB(file)
\ No newline at end of file
+    gdb: GDB = GDB(file)
+
+
+def test_GDB_columnar() -> None:
+    jam: JAM = JAM(filename_jam)
+
+    for filename in filenames:
+        file = jam.extract_file(filename)
+        gdb: GDB = GDB(file)
+        columnar: GDB = GDB(file, columnar=True)
+
+        # The same objects, stored as flat arrays
+        assert isinstance(columnar.polygons, GDB_PolygonArray)
+        assert len(columnar.objects) == len(gdb.objects)
+        for expected, object in zip(gdb.objects, columnar.objects):
+            assert isinstance(object.vertices, GDB_VertexArray)
+            assert object.material_id == expected.material_id
+            assert [str(v) for v in object.vertices] == [
+                str(v) for v in expected.vertices
+            ]
+            assert [(p.v0, p.v1, p.v2, p.uv, p.bone) for p in object.polygons] == [
+                (p.v0, p.v1, p.v2, p.uv, p.bone) for p in expected.polygons
+            ]
+
+        # Objects with consecutive vertex ranges share the columns of the GDB
+        for plan, object in zip(columnar.plan_objects(), columnar.objects):
+            ranges: list[tuple[int, int]] = plan.vertex_ranges
+            assert isinstance(object.vertices, GDB_VertexArray)
+            if ranges and all(b == c for (_, b), (c, _) in zip(ranges, ranges[1:])):
+                positions = object.vertices.positions
+                assert isinstance(positions, memoryview)
+                assert positions.obj is columnar.vertices.positions
+
+
+def test_GDB_face_indices() -> None:
+    gdb: GDB = GDB(JAM(filename_jam).extract_file(filenames[0]))
+    rng: random.Random = random.Random(1)
+
+    # Whole face ranges remap exactly like one face at a time
+    for _ in range(200):
+        previous: list[int] = [rng.randrange(8), rng.randrange(64), rng.randrange(64)]
+        current: list[int] = [rng.randrange(8), rng.randrange(64), rng.randrange(1, 64)]
+        offset: int = previous[2] + rng.randrange(16)
+        highest: int = max(current[0] + current[2], previous[0] + previous[2])
+        relative: list[int] = [rng.randrange(highest) for _ in range(3 * 16)]
+
+        expected: list[int] = []
+        for i in range(0, len(relative), 3):
+            face: list[int] = [0, 0, 0]
+            gdb.get_absolute_face_vertices(
+                GDB_Polygon(*relative[i : i + 3]),
+                face,
+                current,
+                previous,
+                offset,
+                offset - previous[2],
+            )
+            expected.extend(face)
+
+        assert list(
+            gdb.get_absolute_face_indices(
+                relative, current, previous, offset, offset - previous[2]
+            )
+        ) == expected
+
+
+def test_GDB_lazy() -> None:
+    jam: JAM = JAM(filename_jam)
+    file = jam.extract_file(filenames[0])
+    gdb: GDB = GDB(file)
+    lazy: GDB = GDB(file, lazy=True)
+
+    # The materials and the object count need no vertex data
+    assert lazy.materials == gdb.materials
+    assert len(lazy.objects) == len(gdb.objects)
+
+    # Objects decode what they need when accessed, in any order
+    for i in reversed(range(len(gdb.objects))):
+        object, expected = lazy.objects[i], gdb.objects[i]
+        assert object.material_id == expected.material_id
+        assert [str(v) for v in object.vertices] == [str(v) for v in expected.vertices]
+        assert [(p.v0, p.v1, p.v2, p.uv, p.bone) for p in object.polygons] == [
+            (p.v0, p.v1, p.v2, p.uv, p.bone) for p in expected.polygons
+        ]
+
+    assert [str(v) for v in lazy.vertices] == [str(v) for v in gdb.vertices]
+    assert [str(p) for p in lazy.polygons] == [str(p) for p in gdb.polygons]
+
+
+def test_GDB_lazy_ranges() -> None:
+    jam: JAM = JAM(filename_jam)
+    file = jam.extract_file(filenames[0])
+    gdb: GDB = GDB(file)
+
+    for tape in (False, True):
+        lazy: GDB = GDB(file, lazy=True, tape=tape)
+        plan: GDB_ObjectPlan = lazy.objects.plans[-1]
+        object: GDB_Object = lazy.objects[len(lazy.objects) - 1]
+        assert [str(v) for v in object.vertices] == [
+            str(v) for v in gdb.objects[-1].vertices
+        ]
+
+        # Only the ranges of the object are decoded, not the records before them
+        vertex_cursor: LRColumnCursor | None = lazy._vertex_cursor
+        polygon_cursor: LRColumnCursor | None = lazy._polygon_cursor
+        assert vertex_cursor is not None and polygon_cursor is not None
+        assert vertex_cursor.decoded == len(
+            set().union(*(range(start, end) for start, end in plan.vertex_ranges))
+        )
+        assert polygon_cursor.decoded == len(
+            set().union(*(range(start, end) for start, end in plan.face_ranges))
+        )
+        assert not vertex_cursor.is_decoded(0, 1)
+        assert not polygon_cursor.is_decoded(0, 1)
+
+
+def test_GDB_blocks() -> None:
+    jam: JAM = JAM(filename_jam)
+    for filename in filenames:
+        file = jam.extract_file(filename)
+        gdb: GDB = GDB(file)
+
+        # Skipped blocks leave their defaults, and no objects are built
+        materials: GDB = GDB(file, blocks={ID.MATERIALS})
+        assert materials.materials == gdb.materials
+        assert len(materials.vertices) == 0
+        assert materials.objects == []
+
+        # Objects bring in every block they are built from
+        objects: GDB = GDB(file, blocks={ID.INDICES_META})
+        assert objects.materials == gdb.materials
+        assert [str(o.vertices[0]) for o in objects.objects] == [
+            str(o.vertices[0]) for o in gdb.objects
+        ]
+
+
+def test_GDB_tape() -> None:
+    jam: JAM = JAM(filename_jam)
+    for filename in filenames:
+        file = jam.extract_file(filename)
+        gdb: GDB = GDB(file)
+        tape: GDB = GDB(file, tape=True)
+
+        assert tape.materials == gdb.materials
+        assert tape.scale == gdb.scale
+        assert [str(v) for v in tape.vertices] == [str(v) for v in gdb.vertices]
+        assert [str(p) for p in tape.polygons] == [str(p) for p in gdb.polygons]
+        assert [len(o.polygons) for o in tape.objects] == [
+            len(o.polygons) for o in gdb.objects
+        ]
+
+        # Skipping blocks jumps over them on the tape
+        materials: GDB = GDB(file, blocks={ID.MATERIALS}, tape=True)
+        assert materials.materials == gdb.materials
+        assert len(materials.vertices) == 0
@@ -1,4 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
+import fnmatch
+import pathlib
+import struct
+
+import pytest
+
 from lr1.JAM import JAM
+from lr1.MDB import MDB
 
 filename_jam: str = 'tests/LEGO.JAM'
 
@@ -29,3 +37,133 @@ def test_JAM() -> None:
 
         case _:
             raise AssertionError('Unknown JAM file')
+
+
+def test_JAM_memory_map() -> None:
+    jam: JAM = JAM(filename_jam)
+
+    with JAM(filename_jam, memory_map=True) as mapped:
+        assert len(mapped.files) == len(jam.files)
+
+        file = jam.files[69]
+        mapped_file = mapped.extract_file(str(file.path))
+        assert mapped_file.data.read() == file.data.read()
+
+
+def test_JAM_extract_file() -> None:
+    jam: JAM = JAM(filename_jam)
+
+    file = jam.extract_file('/GAMEDATA/COMMON/WNDSUS1.PCM')
+    assert jam.extract_file('GAMEDATA\\COMMON\\WNDSUS1.PCM') is file
+    assert jam.extract_file('/GAMEDATA/COMMON/../COMMON/WNDSUS1.PCM') is file
+    assert file.parent is jam.extract_file('/GAMEDATA/COMMON')
+    assert file in file.parent.directory_contents
+    assert jam.extract_file('/') is jam.root
+
+
+def test_JAM_index_cache(tmp_path: pathlib.Path) -> None:
+    index_cache: pathlib.Path = tmp_path / 'LEGO.JAM.index'
+
+    walked: JAM = JAM(filename_jam, index_cache=index_cache)
+    assert index_cache.exists()
+
+    cached: JAM = JAM(filename_jam, index_cache=index_cache)
+    assert cached.names == walked.names
+    assert list(cached.files.indices) == list(walked.files.indices)
+    assert str(cached.files[69]) == str(walked.files[69])
+
+    # A cache for a different archive is ignored
+    assert not cached.load_index((0, 0, b''))
+
+
+def test_JAM_lazy() -> None:
+    jam: JAM = JAM(filename_jam)
+    lazy: JAM = JAM(filename_jam, lazy=True)
+
+    # Only the directories on the way to the file are read
+    file = lazy.extract_file('/GAMEDATA/COMMON/WNDSUS1.PCM')
+    assert len(lazy.names) < len(jam.names)
+    assert len(file.parent.directory_contents) == len(
+        jam.extract_file('/GAMEDATA/COMMON').directory_contents
+    )
+
+    # Listing everything reads the rest in the usual order
+    assert [str(item) for item in lazy.files] == [str(item) for item in jam.files]
+    assert not lazy.pending
+
+
+def test_JAM_query() -> None:
+    jam: JAM = JAM(filename_jam)
+    paths: list[str] = [str(file.path) for file in jam.files]
+
+    pattern: str = '/GAMEDATA/*/*.GDB'
+    assert sorted(str(item.path) for item in jam.glob(pattern)) == sorted(
+        path for path in paths if fnmatch.fnmatchcase(path, pattern)
+    )
+
+    assert [str(item.path) for item in jam.files_with_extension('gdb')] == [
+        path for path in paths if path.endswith('.GDB')
+    ]
+
+    prefix: str = '/GAMEDATA/COMMON/'
+    assert [str(item.path) for item in jam.scan_prefix(prefix)] == sorted(
+        path for path in jam.names if path.startswith(prefix)
+    )
+
+
+def test_JAM_extract_all(tmp_path: pathlib.Path) -> None:
+    jam: JAM = JAM(filename_jam)
+    items = [item for item in jam.glob('/GAMEDATA/COMMON/*') if not item.is_directory]
+    reported: list[tuple[int, int]] = []
+
+    written: int = jam.extract_all(
+        tmp_path, items, progress=lambda done, total: reported.append((done, total))
+    )
+
+    assert written == sum(item.size for item in items)
+    assert reported[-1] == (len(items), len(items))
+    for item in items:
+        assert (tmp_path / 'GAMEDATA' / 'COMMON' / item.path.name).read_bytes() == (
+            item.data.read()
+        )
+
+
+def test_JAM_hostile_names(tmp_path: pathlib.Path) -> None:
+    # The root holds a directory named '..' with one file in it
+    archive: bytes = (
+        b'LJAM'
+        + struct.pack('<II', 0, 1)
+        + struct.pack('<12si', b'..', 28)
+        + struct.pack('<I', 1)
+        + struct.pack('<12sii', b'EVIL.TXT', 56, 4)
+        + struct.pack('<I', 0)
+        + b'evil'
+    )
+    (tmp_path / 'EVIL.JAM').write_bytes(archive)
+    destination: pathlib.Path = tmp_path / 'out' / 'inner'
+
+    with pytest.raises(ValueError):
+        JAM(tmp_path / 'EVIL.JAM')
+
+    # Lazy archives only read the entry once it is visited
+    jam: JAM = JAM(tmp_path / 'EVIL.JAM', lazy=True)
+    with pytest.raises(ValueError):
+        jam.extract_all(destination)
+    assert not (tmp_path / 'out' / 'EVIL.TXT').exists()
+
+
+def test_JAM_threads() -> None:
+    jam: JAM = JAM(filename_jam, memory_map=True, lazy=True)
+    paths: list[str] = [str(item.path) for item in JAM(filename_jam).files]
+
+    def materials(path: str) -> list[str]:
+        return sorted(MDB(jam.extract_file(path)).materials)
+
+    # Every thread reads the same archive, and some of them the same entries
+    mdb_paths: list[str] = [path for path in paths if path.endswith('.MDB')] * 4
+    with ThreadPoolExecutor(8) as executor:
+        found: list[int | None] = list(executor.map(jam.find, paths))
+        parsed: list[list[str]] = list(executor.map(materials, mdb_paths))
+
+    assert [jam.names[index] for index in found if index is not None] == paths
+    assert parsed == [materials(path) for path in mdb_paths]
@@ -0,0 +1,72 @@
+import pathlib
+
+from lr1.JAM import JAM
+from lr1.JAMWriter import JAMWriter
+from lr1.JAMHashIndex import JAMHashIndex, ContentCache
+from lr1.GDB import GDB
+from lr1.MDB import MDB
+
+filename_jam: str = 'tests/LEGO.JAM'
+filename_mdb: str = '/GAMEDATA/RACEC0R1/COMBINED.MDB'
+filename_gdb: str = '/GAMEDATA/RACEC0R1/TRACK.GDB'
+filename_changed: str = '/GAMEDATA/COMMON/WNDSUS1.PCM'
+
+
+def test_JAMHashIndex(tmp_path: pathlib.Path) -> None:
+    jam: JAM = JAM(filename_jam)
+    index: JAMHashIndex = JAMHashIndex(jam, tmp_path / 'LEGO.JAM.hashes')
+    assert len(index.digests) == len(jam.files)
+
+    # The stored index is loaded instead of hashing again
+    assert JAMHashIndex(jam, tmp_path / 'LEGO.JAM.hashes').digests == index.digests
+
+    # A copy of one file under a new name and one changed file
+    writer: JAMWriter = JAMWriter(jam)
+    writer.add_file('/COPY/COMBINED.MDB', jam.extract_file(filename_mdb).data.read())
+    writer.add_file(filename_changed, b'changed')
+    writer.write(tmp_path / 'NEW.JAM')
+    new: JAMHashIndex = JAMHashIndex(JAM(str(tmp_path / 'NEW.JAM')))
+
+    changes = index.diff(new)
+    assert changes.added == ['/COPY/COMBINED.MDB']
+    assert changes.changed == [filename_changed]
+    assert not changes.removed
+
+    # Identical files are stored and parsed once
+    store: pathlib.Path = tmp_path / 'store'
+    assert index.dedupe(store) == len(set(index.digests.values()))
+    assert new.dedupe(store) == 1
+    assert not list(store.rglob('*.tmp'))
+
+    cache: ContentCache = ContentCache()
+    cache.parse(index, filename_mdb, MDB)
+    cache.parse(new, filename_mdb, MDB)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_ContentCache_locations(tmp_path: pathlib.Path) -> None:
+    jam: JAM = JAM(filename_jam)
+    data: bytes = jam.extract_file(filename_mdb).data.read()
+    gdb_data: bytes = jam.extract_file(filename_gdb).data.read()
+
+    writer: JAMWriter = JAMWriter(jam)
+    writer.add_file('/GAMEDATA/RACEC0R1/COPY.MDB', data)
+    writer.add_file('/COPY/COMBINED.MDB', data)
+    writer.add_file('/COPY/TRACK.GDB', gdb_data)
+    writer.write(tmp_path / 'NEW.JAM')
+    index: JAMHashIndex = JAMHashIndex(JAM(str(tmp_path / 'NEW.JAM')))
+
+    # MDB textures depend on the directory, so only copies next to each other share
+    cache: ContentCache = ContentCache()
+    mdb: MDB = cache.parse(index, filename_mdb, MDB)
+    assert cache.parse(index, '/GAMEDATA/RACEC0R1/COPY.MDB', MDB) is mdb
+    assert cache.parse(index, '/COPY/COMBINED.MDB', MDB) is not mdb
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    # A shared GDB refers to the file it was asked for
+    gdb: GDB = cache.parse(index, filename_gdb, GDB)
+    copy: GDB = cache.parse(index, '/COPY/TRACK.GDB', GDB)
+    assert copy.file.path == pathlib.PurePosixPath('/COPY/TRACK.GDB')
+    assert gdb.file.path != copy.file.path
+    assert copy.materials == gdb.materials
+    assert (cache.hits, cache.misses) == (2, 3)
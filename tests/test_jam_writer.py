@@ -0,0 +1,55 @@
+import pathlib
+
+import pytest
+
+from lr1.JAM import JAM
+from lr1.JAMWriter import JAMWriter
+
+filename_jam: str = 'tests/LEGO.JAM'
+filename_override: str = '/GAMEDATA/COMMON/WNDSUS1.PCM'
+
+
+def test_JAMWriter(tmp_path: pathlib.Path) -> None:
+    jam: JAM = JAM(filename_jam, memory_map=True)
+
+    # Unchanged archives keep every entry
+    writer: JAMWriter = JAMWriter(jam)
+    writer.write(tmp_path / 'REPACKED.JAM')
+
+    repacked: JAM = JAM(str(tmp_path / 'REPACKED.JAM'))
+    assert [str(item.path) for item in repacked.files] == [
+        str(item.path) for item in jam.files
+    ]
+    for item in jam.files[:100]:
+        assert repacked.extract_file(str(item.path)).data.read() == item.data.read()
+
+    # Overrides replace entries and add new ones
+    writer.add_file(filename_override, b'override')
+    writer.add_file('/MOD/README.TXT', b'new file')
+    writer.write(tmp_path / 'MODDED.JAM')
+
+    modded: JAM = JAM(str(tmp_path / 'MODDED.JAM'))
+    assert modded.extract_file(filename_override).data.read() == b'override'
+    assert modded.extract_file('/MOD/README.TXT').data.read() == b'new file'
+    assert len(modded.files) == len(jam.files) + 1
+
+
+def test_JAMWriter_add_tree(tmp_path: pathlib.Path) -> None:
+    mod: pathlib.Path = tmp_path / 'mod'
+    (mod / 'gamedata' / 'common').mkdir(parents=True)
+    (mod / 'gamedata' / 'common' / 'wndsus1.pcm').write_bytes(b'override')
+
+    # Names are upper cased, so they replace the entries of the game
+    writer: JAMWriter = JAMWriter()
+    writer.add_file(filename_override, b'original')
+    writer.add_tree(mod)
+    writer.write(tmp_path / 'MODDED.JAM')
+
+    modded: JAM = JAM(str(tmp_path / 'MODDED.JAM'))
+    assert [str(item.path) for item in modded.files] == [filename_override]
+    assert modded.extract_file(filename_override).data.read() == b'override'
+
+    # Names that only differ in case can't both be added
+    (mod / 'gamedata' / 'common' / 'WNDSUS1.PCM').write_bytes(b'other')
+    with pytest.raises(ValueError):
+        JAMWriter().add_tree(mod)
@@ -0,0 +1,140 @@
+import pathlib
+import struct
+
+from lr1.BMP import BMP
+from lr1.JAM import JAM
+from lr1.JAMWriter import JAMWriter
+from lr1.MDB import MDB
+from lr1.IO.LRFile import LRFileItem
+from lr1.IO.LROverlay import LROverlay, LROverlayFile
+
+filename_jam: str = 'tests/LEGO.JAM'
+filename_mdb: str = '/GAMEDATA/RACEC0R1/COMBINED.MDB'
+filename_override: str = '/GAMEDATA/COMMON/WNDSUS1.PCM'
+
+
+def test_overlay(tmp_path: pathlib.Path) -> None:
+    override: pathlib.Path = tmp_path / 'gamedata' / 'common' / 'wndsus1.pcm'
+    override.parent.mkdir(parents=True)
+    override.write_bytes(b'override')
+    (tmp_path / 'gamedata' / 'common' / 'extra.pcm').write_bytes(b'extra')
+
+    jam: JAM = JAM(filename_jam)
+    overlay: LROverlay = LROverlay([jam, tmp_path])
+
+    # Later sources win, without regard to case
+    file = overlay.get_file(filename_override)
+    assert isinstance(file, LROverlayFile)
+    assert isinstance(file.source, LRFileItem)
+    assert file.data.read() == b'override'
+    assert overlay.get_file('/GAMEDATA/COMMON/EXTRA.PCM').data.read() == b'extra'
+
+    # Directories list the files of every source once
+    listing = overlay.list_directory('/GAMEDATA/COMMON')
+    common = jam.extract_file('/GAMEDATA/COMMON')
+    assert len(listing) == len(common.directory_contents) + 1
+
+    # Dependencies resolve through the overlay
+    mdb_file = overlay.get_file(filename_mdb)
+    assert mdb_file.overlay is overlay
+    mdb: MDB = MDB(mdb_file)
+    assert len(mdb.materials) == len(MDB(jam.extract_file(filename_mdb)).materials)
+
+
+# One material with the texture 'a', and a two pixel 8 bit texture
+mod_mdb: bytes = (
+    bytes([0x27, 0x07, 0x04])
+    + struct.pack('<i', 1)
+    + bytes([0x08, 0x05, 0x27, 0x02])
+    + b'MAT\x00'
+    + bytes([0x05, 0x2C, 0x02])
+    + b'a\x00'
+    + bytes([0x06, 0x06])
+)
+mod_bmp: bytes = (
+    bytes([0x08, 0x01])
+    + struct.pack('<hh', 2, 1)
+    + bytes([0x00, 0x00, 0xFF, 0x00, 0xFF, 0x00])
+    + struct.pack('<hh', 2, 2)
+    + bytes([0x00, 0x01])
+)
+
+
+def test_overlay_dependencies(tmp_path: pathlib.Path) -> None:
+    mod: pathlib.Path = tmp_path / 'mod' / 'gamedata' / 'race'
+    mod.mkdir(parents=True)
+    (mod / 'a.mdb').write_bytes(mod_mdb)
+    (mod / 'a.bmp').write_bytes(mod_bmp)
+
+    # Loose files have their path in the overlay, so siblings resolve
+    overlay: LROverlay = LROverlay([tmp_path / 'mod'])
+    file = overlay.get_file('/GAMEDATA/RACE/A.MDB')
+    assert str(file.path) == '/GAMEDATA/RACE/A.MDB'
+    mdb: MDB = MDB(file)
+    texture: BMP = mdb.materials['MAT'].texture
+    assert texture.rgba() == bytes((255, 0, 0, 255, 0, 255, 0, 255))
+    assert [bmp.path.name for bmp in file.parent.files_with_extension('.BMP')] == [
+        'A.BMP'
+    ]
+
+    # Mounting a JAM leaves its own items alone
+    writer: JAMWriter = JAMWriter()
+    writer.add_file('/GAMEDATA/RACE/A.BMP', mod_bmp)
+    writer.write(tmp_path / 'BASE.JAM')
+    jam: JAM = JAM(str(tmp_path / 'BASE.JAM'))
+
+    first: LROverlay = LROverlay([jam])
+    second: LROverlay = LROverlay([jam, tmp_path / 'mod'])
+    assert first.get_file('/GAMEDATA/RACE/A.BMP').overlay is first
+    assert second.get_file('/GAMEDATA/RACE/A.BMP').overlay is second
+    assert jam.extract_file('/GAMEDATA/RACE/A.BMP').overlay is None
+
+
+def test_overlay_top_level(tmp_path: pathlib.Path) -> None:
+    (tmp_path / 'a.mdb').write_bytes(mod_mdb)
+    (tmp_path / 'a.bmp').write_bytes(mod_bmp)
+    overlay: LROverlay = LROverlay([tmp_path])
+
+    # Top level files have the overlay root as their parent, not themselves
+    file = overlay.get_file('/A.MDB')
+    root = file.parent
+    assert isinstance(root, LROverlayFile)
+    assert root is not file and root.is_directory
+    assert str(root.path) == '/'
+    assert root.parent is root
+    assert [bmp.path.name for bmp in root.files_with_extension('.BMP')] == ['A.BMP']
+
+    # So their siblings resolve from the root
+    texture: BMP = MDB(file).materials['MAT'].texture
+    assert texture.rgba() == bytes((255, 0, 0, 255, 0, 255, 0, 255))
+
+
+def test_files_with_extension(tmp_path: pathlib.Path) -> None:
+    (tmp_path / 'A.MDB').write_bytes(b'a')
+    (tmp_path / 'b.mdb').write_bytes(b'b')
+    (tmp_path / 'C.TDB').write_bytes(b'c')
+    (tmp_path / 'D.MDB').mkdir()
+
+    # Loose directories are listed once and indexed by extension
+    directory: LRFileItem = LRFileItem(tmp_path)
+    listing = directory.directory_contents
+    assert len(listing) == 4
+    mdb_files = directory.files_with_extension('mdb')
+    assert sorted(file.path.name for file in mdb_files) == ['A.MDB', 'b.mdb']
+    assert all(file.parent is directory for file in mdb_files)
+
+    # JAM directories and overlays answer the same question
+    jam: JAM = JAM(filename_jam)
+    race = jam.extract_file('/GAMEDATA/RACEC0R1')
+    expected = [
+        file.path.name
+        for file in race.directory_contents
+        if not file.is_directory and file.path.suffix.upper() == '.MDB'
+    ]
+    assert [file.path.name for file in race.files_with_extension('.MDB')] == expected
+
+    overlay: LROverlay = LROverlay([jam])
+    assert [
+        file.path.name
+        for file in overlay.files_with_extension('/GAMEDATA/RACEC0R1', '.mdb')
+    ] == expected
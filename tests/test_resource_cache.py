@@ -0,0 +1,48 @@
+import pathlib
+
+from lr1.JAM import JAM
+from lr1.IO.LRFile import LRFileItem
+from lr1.IO.LRResourceCache import resource_cache
+
+filename_jam: str = 'tests/LEGO.JAM'
+
+
+def test_resource_cache(tmp_path: pathlib.Path) -> None:
+    limits = (resource_cache.max_handles, resource_cache.max_bytes)
+    resource_cache.clear()
+    resource_cache.configure(max_handles=2, max_bytes=0x10000)
+
+    try:
+        # Open handles stay within the limit
+        paths: list[pathlib.Path] = []
+        for i in range(5):
+            paths.append(tmp_path / f'{i}.BIN')
+            paths[-1].write_bytes(bytes([i]) * 16)
+
+        evictions: int = resource_cache.evictions
+        files = [LRFileItem(path) for path in paths]
+        for i, file in enumerate(files):
+            assert file.data.read() == bytes([i]) * 16
+        assert resource_cache.handles == 2
+        assert resource_cache.evictions - evictions == 3
+
+        # Evicted files open their data again when used
+        files[0].reset()
+        assert files[0].data.read() == bytes([0]) * 16
+
+        # Lookups are cached
+        hits: int = resource_cache.hits
+        assert files[0].get_file(paths[1]) is files[0].get_file(paths[1])
+        assert resource_cache.hits == hits + 1
+
+        # Archive data counts towards the byte limit
+        jam: JAM = JAM(filename_jam)
+        for file in jam.files[:50]:
+            file.data.read()
+        assert resource_cache.resident_bytes <= max(
+            0x10000, max(file.size for file in jam.files[:50])
+        )
+
+    finally:
+        resource_cache.clear()
+        resource_cache.configure(*limits)
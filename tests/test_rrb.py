@@ -1,4 +1,4 @@
-from lr1.RRB import RRB
+from lr1.RRB import RRB, ID
 from lr1.JAM import JAM
 
 filename_rrb: str = '/GAMEDATA/RACEC1R3/R1_F_0.RRB'
@@ -12,3 +12,16 @@ def test_RRB() -> None:
 
     assert str(rrb.nodes[1]) == test_rrb
     assert rrb.milliseconds == 87712
+
+
+def test_RRB_blocks() -> None:
+    rrb: RRB = RRB(
+        JAM(filename_jam).extract_file(filename_rrb), blocks={ID.TIMING}
+    )
+
+    assert rrb.milliseconds == 87712
+
+    # Skipped blocks keep their defaults
+    assert rrb.nodes == []
+    assert rrb.unknown_2D == 0
+    assert rrb.start_position.x == 0